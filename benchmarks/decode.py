@@ -0,0 +1,107 @@
+"""Compare decoding `:many` results through the generated queries and through `remindme.db.decoding`.
+
+    python -m benchmarks.decode [--rows 100000] [--dsn postgres://...]
+
+Only decoding is measured: rows are fetched once up front and handed out by a fake connection. Without
+`--dsn`, tuples stand in for `asyncpg.Record`, which index and unpack the same way.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import gc
+import time
+import tracemalloc
+import typing
+
+import asyncpg
+
+from remindme.db import decoding
+from remindme.db import queries
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+REMINDER_ROWS_SQL = """
+SELECT i::BIGINT,
+       (i % 5000)::BIGINT,
+       'reminder ' || i,
+       NOW() + i * INTERVAL '1 second',
+       NULL::BIGINT,
+       NULL::BIGINT,
+       NULL::BIGINT,
+       FALSE,
+       'bench',
+       NOW(),
+       1,
+       NULL::TIMESTAMPTZ
+FROM generate_series(1, $1) i
+"""
+SECOND = datetime.timedelta(seconds=1)
+
+
+class _FakeConnection:
+    def __init__(self, rows: collections.abc.Sequence[typing.Any]) -> None:
+        self._rows = rows
+
+    async def fetch(self, *_: object) -> collections.abc.Sequence[typing.Any]:
+        return self._rows
+
+
+def make_rows(count: int) -> list[tuple[typing.Any, ...]]:
+    now = datetime.datetime.now(tz=datetime.UTC)
+    return [
+        (i, i % 5000, f"reminder {i}", now + i * SECOND, None, None, None, False, "bench", now, 1, None)
+        for i in range(1, count + 1)
+    ]
+
+
+async def fetch_rows(dsn: str, count: int) -> list[asyncpg.Record]:
+    conn = await asyncpg.connect(dsn)
+    try:
+        return await conn.fetch(REMINDER_ROWS_SQL, count)
+    finally:
+        await conn.close()
+
+
+async def _decode(queries_type: type[queries.Queries], rows: collections.abc.Sequence[typing.Any]) -> int:
+    query = queries_type(_FakeConnection(rows))  # type: ignore[arg-type]
+    return len(await query.claim_due_reminders(leased_by=None, lease_expires_at=None, max_count=len(rows)))
+
+
+def measure(queries_type: type[queries.Queries], rows: collections.abc.Sequence[typing.Any], repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        asyncio.run(_decode(queries_type, rows))
+        best = min(best, time.perf_counter() - started)
+
+    # Measured separately, as tracing allocations slows everything down
+    gc.collect()
+    tracemalloc.start()
+    asyncio.run(_decode(queries_type, rows))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    name = f"{queries_type.__module__}.{queries_type.__qualname__}"
+    print(f"{name:<32} {len(rows) / best:>14,.0f} rows/s {peak / 2**20:>10.1f} MiB peak")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.decode")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dsn", help="decode real records fetched from this database instead of tuples")
+    args = parser.parse_args()
+
+    rows = asyncio.run(fetch_rows(args.dsn, args.rows)) if args.dsn else make_rows(args.rows)
+
+    for queries_type in (queries.Queries, decoding.PostgresQueries):
+        measure(queries_type, rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
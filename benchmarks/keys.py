@@ -0,0 +1,113 @@
+"""Compare packing and unpacking custom ids through `remindme.utils.keys` and through plain splitting.
+
+    python -m benchmarks.keys [--number 100000] [--repeat 5]
+
+The split path is what handlers did before arguments were declared: `str` every value when building
+the id, then split it and convert every argument by hand once an interaction comes in.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import timeit
+import typing
+
+from remindme.utils import keys
+from remindme.utils import pagination
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+SNOWFLAKE = 1_300_000_000_000_000_000
+REMINDER_ID = 12_345_678
+GROUP_IDS = [REMINDER_ID + i for i in range(6)]
+CURSOR = pagination.Cursor(datetime.datetime(2030, 1, 1, tzinfo=datetime.UTC), REMINDER_ID, before=True)
+
+
+def _make_key(master_key: str, *args: object) -> str:
+    return f"{master_key}:" + ":".join(str(arg) for arg in args)
+
+
+def _split_cursor(cursor: pagination.Cursor) -> tuple[str, int, int]:
+    return (
+        "b" if cursor.before else "a",
+        (cursor.expire_at - pagination.EPOCH) // pagination.MICROSECOND,
+        cursor.reminder_id,
+    )
+
+
+# Key, the values it carries, and how the split path built and read them back
+CASES: collections.abc.Sequence[
+    tuple[
+        keys.Key,
+        tuple[typing.Any, ...],
+        collections.abc.Callable[[], str],
+        collections.abc.Callable[[list[str]], object],
+    ]
+] = (
+    (
+        keys.REMINDER_SNOOZE_SELECT,
+        (REMINDER_ID, GROUP_IDS),
+        lambda: _make_key(keys.REMINDER_SNOOZE_SELECT.name, REMINDER_ID, *GROUP_IDS),
+        lambda arguments: (int(arguments[0]), [int(arg) for arg in arguments[1:]]),
+    ),
+    (
+        keys.REMINDER_CREATE_FROM_MESSAGE_MODAL,
+        (SNOWFLAKE, SNOWFLAKE + 1, SNOWFLAKE + 2),
+        lambda: _make_key(keys.REMINDER_CREATE_FROM_MESSAGE_MODAL.name, SNOWFLAKE, SNOWFLAKE + 1, SNOWFLAKE + 2),
+        lambda arguments: (int(arguments[0]), int(arguments[1]), int(arguments[2])),
+    ),
+    (
+        keys.REMINDER_LIST_MOVE,
+        (CURSOR,),
+        lambda: _make_key(keys.REMINDER_LIST_MOVE.name, *_split_cursor(CURSOR)),
+        lambda arguments: pagination.Cursor.from_arguments(arguments),
+    ),
+    (
+        keys.REMINDER_VIEW,
+        (REMINDER_ID, CURSOR),
+        lambda: _make_key(keys.REMINDER_VIEW.name, REMINDER_ID, *_split_cursor(CURSOR)),
+        lambda arguments: (int(arguments[0]), pagination.Cursor.from_arguments(arguments[1:])),
+    ),
+)
+
+
+def _best(call: collections.abc.Callable[[], object], number: int, repeat: int) -> float:
+    return min(timeit.repeat(call, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.keys")
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'key':<36} {'length':>13} {'pack (ns)':>15} {'unpack (ns)':>15}")  # noqa: T201
+    for key, values, split_make, split_unpack in CASES:
+        packed_id = key.make(*values)
+        split_id = split_make()
+        assert key.unpack(packed_id.partition(keys.SEPARATOR)[2]) == key.unpack_legacy(split_id.partition(":")[2])
+
+        split_pack_time = _best(split_make, args.number, args.repeat)
+        pack_time = _best(lambda key=key, values=values: key.make(*values), args.number, args.repeat)
+        split_unpack_time = _best(
+            lambda split_id=split_id, split_unpack=split_unpack: split_unpack(split_id.split(":")[1:]),
+            args.number,
+            args.repeat,
+        )
+        unpack_time = _best(
+            lambda key=key, packed_id=packed_id: key.unpack(packed_id.partition(keys.SEPARATOR)[2]),
+            args.number,
+            args.repeat,
+        )
+
+        print(  # noqa: T201
+            f"{key.name:<36} {len(split_id):>5} -> {len(packed_id):>5}"
+            f" {split_pack_time * 1e9:>6.0f} -> {pack_time * 1e9:>5.0f}"
+            f" {split_unpack_time * 1e9:>6.0f} -> {unpack_time * 1e9:>5.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
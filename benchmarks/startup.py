@@ -0,0 +1,113 @@
+"""Measure how long a cold start of the bot spends importing, in fresh interpreters.
+
+    python -m benchmarks.startup [--runs 10] [--budget 1.5] [--breakdown]
+
+Imports everything `python -OO -m remindme` does before it can serve anything: the modules imported
+by `remindme.__main__` and every extension. Connecting, syncing commands and the like need the real
+services and are left out, run the bot with `REMINDME_PROFILE_STARTUP=1` to see those.
+
+Exits with 1 when the median goes over `--budget`, or when a module kept out of the start-up is imported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import os
+import pathlib
+import pkgutil
+import statistics
+import subprocess
+import sys
+import typing
+
+from remindme import extensions
+from remindme import startup
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+ENTRY_POINT = pathlib.Path(__file__).parent.parent / "remindme" / "__main__.py"
+# Only ever needed away from the bot's own process
+LAZY_MODULES: collections.abc.Sequence[str] = ("dateparser",)
+
+_SCRIPT = """
+import sys
+import time
+
+started_at = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - started_at
+
+from remindme import startup
+
+startup.mark("imports")
+startup.finish()
+print(elapsed, *(name for name in {lazy_modules!r} if name in sys.modules))
+"""
+
+
+def entry_point_modules() -> list[str]:
+    # Imported first by `python -m remindme`, which also installs the startup profiler
+    modules = ["remindme"]
+    for node in ast.parse(ENTRY_POINT.read_text()).body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.module != "__future__":
+            modules.extend(f"{node.module}.{alias.name}" for alias in node.names)
+
+    extension_modules = pkgutil.walk_packages(extensions.__path__, f"{extensions.__name__}.")
+    return modules + [module.name for module in extension_modules]
+
+
+def run(modules: collections.abc.Sequence[str], *, breakdown: bool) -> tuple[float, list[str]]:
+    # `from x import y` works for both submodules and names, unlike `import x.y`
+    imports = "\n".join(
+        f"from {parent} import {name}" if parent else f"import {name}"
+        for parent, _, name in (module.rpartition(".") for module in modules)
+    )
+    environment = {**os.environ, startup.ENVIRONMENT_VARIABLE: "1"} if breakdown else os.environ
+    output = subprocess.run(  # noqa: S603 - Runs this same interpreter
+        [sys.executable, "-OO", "-c", _SCRIPT.format(imports=imports, lazy_modules=tuple(LAZY_MODULES))],
+        stdout=subprocess.PIPE,
+        check=True,
+        env=environment,
+        text=True,
+    ).stdout.split()
+    return float(output[0]), output[1:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, help="fail when the median takes longer, in seconds")
+    parser.add_argument("--breakdown", action="store_true", help="print the startup profiler's report of a run")
+    args = parser.parse_args()
+
+    modules = entry_point_modules()
+    if args.breakdown:
+        run(modules, breakdown=True)
+
+    timings: list[float] = []
+    imported: set[str] = set()
+    for _ in range(args.runs):
+        elapsed, lazy_imported = run(modules, breakdown=False)
+        timings.append(elapsed)
+        imported.update(lazy_imported)
+
+    median = statistics.median(timings)
+    print(f"{len(modules)} modules, best {min(timings):.3f}s, median {median:.3f}s over {args.runs} runs")  # noqa: T201
+
+    failed = False
+    if imported:
+        print(f"imported at start-up even though they are kept out of it: {', '.join(sorted(imported))}")  # noqa: T201
+        failed = True
+    if args.budget is not None and median > args.budget:
+        print(f"over the budget of {args.budget:.3f}s")  # noqa: T201
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
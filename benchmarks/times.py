@@ -0,0 +1,94 @@
+"""Compare parsing reminder times through `remindme.utils.times` and through dateparser alone.
+
+    python -m benchmarks.times [--repeat 5]
+
+The corpus is weighted like real traffic, where most phrases come from the snooze select and
+the rest are typed by hand. Phrases the fast path does not cover still go through dateparser.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import time
+import typing
+
+from remindme.utils import times
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+# Phrase and how often it shows up
+CORPUS: collections.abc.Sequence[tuple[str, int]] = (
+    # Snooze select
+    ("10 minutes", 30),
+    ("30 minutes", 12),
+    ("1 hour", 25),
+    ("6 hours", 6),
+    ("1 day", 15),
+    # Typed by hand
+    ("in 5 minutes", 6),
+    ("in 2 hours", 5),
+    ("2h", 4),
+    ("15m", 4),
+    ("1h30m", 2),
+    ("1 hour and 30 minutes", 2),
+    ("in 3 days", 3),
+    ("2 weeks", 2),
+    ("tomorrow at 9:00", 4),
+    ("tomorrow at 18:30", 2),
+    ("18:00", 3),
+    ("9:30", 2),
+    ("2030-12-24 18:00", 1),
+    ("2030-01-01T00:00:00Z", 1),
+    # Left to dateparser
+    ("next friday", 2),
+    ("in 3 months", 1),
+    ("in an hour", 2),
+    ("friday at 5pm", 1),
+    ("december 24th", 1),
+)
+
+
+def _expand(corpus: collections.abc.Sequence[tuple[str, int]]) -> list[str]:
+    return [phrase for phrase, count in corpus for _ in range(count)]
+
+
+def measure(
+    name: str, parse: collections.abc.Callable[..., datetime.datetime | None], phrases: list[str], repeat: int
+) -> float:
+    now = datetime.datetime.now(tz=datetime.UTC)
+    # Warms up dateparser's own caches (and the fast path's) first
+    for phrase in phrases:
+        parse(phrase, now=now)
+
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for phrase in phrases:
+            parse(phrase, now=now)
+        best = min(best, time.perf_counter() - started)
+
+    print(f"{name:<24} {best / len(phrases) * 1e6:>10.1f} us/phrase")  # noqa: T201
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.times")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    phrases = _expand(CORPUS)
+    covered = [phrase for phrase in phrases if times.covers(phrase)]
+    print(f"{len(phrases)} phrases, {len(covered) / len(phrases):.0%} covered by the fast path")  # noqa: T201
+
+    baseline = measure("dateparser", times.parse_with_dateparser, phrases, args.repeat)
+    fast_path = measure("times.parse", times.parse, phrases, args.repeat)
+    print(f"{baseline / fast_path:.1f}x faster overall")  # noqa: T201
+
+    # What the phrases from the snooze select and the like cost now
+    measure("times.parse (covered)", times.parse, covered, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,32 +3,67 @@ SELECT *
 FROM reminders
 WHERE id = $1;
 
--- name: GetExpiredReminders :many
-SELECT *
-FROM reminders
-WHERE expire_at < NOW()
-  AND handled = FALSE;
+-- name: ClaimDueReminders :many
+UPDATE reminders
+SET leased_by        = sqlc.arg(leased_by),
+    lease_expires_at = sqlc.arg(lease_expires_at),
+    attempts         = attempts + 1
+WHERE id IN (SELECT id
+             FROM reminders
+             WHERE expire_at < NOW()
+               AND handled = FALSE
+               AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+               AND (next_attempt_at IS NULL OR next_attempt_at < NOW())
+             ORDER BY expire_at
+             LIMIT sqlc.arg(max_count) FOR UPDATE SKIP LOCKED)
+RETURNING *;
 
--- name: GetHandledReminders :many
-SELECT *
+-- name: CountDueReminders :one
+SELECT COUNT(*)
 FROM reminders
-WHERE handled = TRUE
-  AND expire_at < $1;
-;
+WHERE expire_at < NOW()
+  AND handled = FALSE
+  AND (next_attempt_at IS NULL OR next_attempt_at < NOW());
 
--- name: GetRemindersCountFor :one
-SELECT COUNT(*)
+-- name: GetPendingRemindersBefore :many
+SELECT id, GREATEST(expire_at, lease_expires_at, next_attempt_at)::TIMESTAMP WITH TIME ZONE AS due_at
 FROM reminders
-WHERE user_id = $1
+WHERE expire_at < $1
   AND handled = FALSE;
 
--- name: GetRemindersFor :many
-SELECT *
-FROM reminders
-WHERE user_id = $1
-  AND handled = FALSE
-ORDER BY expire_at
-OFFSET $2 ROWS FETCH NEXT $3 ROWS ONLY;
+-- name: GetRemindersPageFrom :many
+(SELECT *
+ FROM reminders
+ WHERE user_id = sqlc.arg(user_id)
+   AND handled = FALSE
+   AND (expire_at, id) < (sqlc.arg(cursor_expire_at)::TIMESTAMP WITH TIME ZONE, sqlc.arg(cursor_id)::BIGINT)
+ ORDER BY expire_at DESC, id DESC
+ LIMIT 1)
+UNION ALL
+(SELECT *
+ FROM reminders
+ WHERE user_id = sqlc.arg(user_id)
+   AND handled = FALSE
+   AND (expire_at, id) >= (sqlc.arg(cursor_expire_at)::TIMESTAMP WITH TIME ZONE, sqlc.arg(cursor_id)::BIGINT)
+ ORDER BY expire_at, id
+ LIMIT sqlc.arg(limit));
+
+-- name: GetRemindersPageBefore :many
+(SELECT *
+ FROM reminders
+ WHERE user_id = sqlc.arg(user_id)
+   AND handled = FALSE
+   AND (expire_at, id) < (sqlc.arg(cursor_expire_at)::TIMESTAMP WITH TIME ZONE, sqlc.arg(cursor_id)::BIGINT)
+ ORDER BY expire_at DESC, id DESC
+ LIMIT sqlc.arg(limit))
+UNION ALL
+(SELECT *
+ FROM reminders
+ WHERE user_id = sqlc.arg(user_id)
+   AND handled = FALSE
+   AND (expire_at, id) >= (sqlc.arg(cursor_expire_at)::TIMESTAMP WITH TIME ZONE, sqlc.arg(cursor_id)::BIGINT)
+ ORDER BY expire_at, id
+ LIMIT 1);
 
 -- name: CreateReminder :one
 INSERT INTO reminders (user_id, description, expire_at)
@@ -48,15 +83,70 @@ SET reference_message_id=$1,
     reference_guild_id=$3
 WHERE id = $4;
 
--- name: MarkReminderAsHandled :exec
+-- name: MarkRemindersAsHandled :exec
 UPDATE reminders
-SET handled = TRUE
-WHERE id = $1;
+SET handled          = TRUE,
+    leased_by        = NULL,
+    lease_expires_at = NULL
+WHERE id = ANY (sqlc.arg(ids)::BIGINT[]);
+
+-- name: RetryReminders :exec
+UPDATE reminders
+SET leased_by        = NULL,
+    lease_expires_at = NULL,
+    next_attempt_at  = retries.next_attempt_at
+FROM UNNEST(sqlc.arg(ids)::BIGINT[], sqlc.arg(next_attempt_ats)::TIMESTAMP WITH TIME ZONE[]) AS retries (id, next_attempt_at)
+WHERE reminders.id = retries.id;
+
+-- name: ReleaseReminders :exec
+UPDATE reminders
+SET leased_by        = NULL,
+    lease_expires_at = NULL,
+    attempts         = attempts - 1
+FROM UNNEST(sqlc.arg(ids)::BIGINT[], sqlc.arg(lease_expires_ats)::TIMESTAMP WITH TIME ZONE[]) AS released (id, lease_expires_at)
+WHERE reminders.id = released.id
+  AND reminders.leased_by = sqlc.arg(leased_by)
+  AND reminders.lease_expires_at = released.lease_expires_at;
+
+-- name: DeadLetterReminders :exec
+WITH dead AS (DELETE FROM reminders WHERE id = ANY (sqlc.arg(ids)::BIGINT[]) RETURNING *)
+INSERT
+INTO dead_reminders (id, user_id, description, expire_at, reference_message_id, reference_channel_id,
+                     reference_guild_id, attempts, last_error)
+SELECT dead.id,
+       dead.user_id,
+       dead.description,
+       dead.expire_at,
+       dead.reference_message_id,
+       dead.reference_channel_id,
+       dead.reference_guild_id,
+       dead.attempts,
+       failures.error
+FROM dead
+         JOIN UNNEST(sqlc.arg(ids)::BIGINT[], sqlc.arg(errors)::TEXT[]) AS failures (id, error) ON failures.id = dead.id;
+
+-- name: GetDeadReminders :many
+SELECT *
+FROM dead_reminders
+ORDER BY failed_at DESC
+LIMIT $1;
+
+-- name: RequeueDeadReminders :many
+WITH requeued AS (DELETE FROM dead_reminders WHERE id = ANY (sqlc.arg(ids)::BIGINT[]) RETURNING *)
+INSERT
+INTO reminders (id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id)
+SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id
+FROM requeued
+RETURNING *;
 
 -- name: RescheduleReminder :one
 UPDATE reminders
-SET handled   = FALSE,
-    expire_at = $1
+SET handled          = FALSE,
+    expire_at        = $1,
+    leased_by        = NULL,
+    lease_expires_at = NULL,
+    attempts         = 0,
+    next_attempt_at  = NULL
 WHERE id = $2
 RETURNING *;
 
@@ -65,11 +155,20 @@ DELETE
 FROM reminders
 WHERE id = $1;
 
+-- name: DeleteReminders :exec
+DELETE
+FROM reminders
+WHERE id = ANY (sqlc.arg(ids)::BIGINT[]);
+
+-- name: MaintainReminderPartitions :exec
+SELECT maintain_reminder_partitions(sqlc.arg(premake)::INTERVAL, sqlc.arg(retention)::INTERVAL);
+
 -- name: GetDmChannelForUser :one
 SELECT channel_id
 FROM dm_channels
 WHERE user_id = $1;
 
--- name: AddDmChannel :exec
+-- name: UpsertDmChannel :exec
 INSERT INTO dm_channels (user_id, channel_id)
-VALUES ($1, $2);
\ No newline at end of file
+VALUES ($1, $2)
+ON CONFLICT (user_id) DO UPDATE SET channel_id = excluded.channel_id;
\ No newline at end of file
@@ -1,3 +1,5 @@
+-- Baseline schema, applied as the first migration by `remindme.migrations`. Anything changing it from
+-- now on goes into a new migration instead
 CREATE TABLE IF NOT EXISTS reminders
 (
     id                   BIGSERIAL                NOT NULL,
@@ -8,12 +10,162 @@ CREATE TABLE IF NOT EXISTS reminders
     reference_channel_id BIGINT,
     reference_guild_id   BIGINT,
     handled              BOOLEAN DEFAULT FALSE    NOT NULL
-);
+) PARTITION BY RANGE (expire_at);
+
+-- Set while a replica is delivering the reminder. Once the lease expires, the reminder can be claimed again
+ALTER TABLE reminders
+    ADD COLUMN IF NOT EXISTS leased_by        TEXT,
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+
+-- Bumped every time the reminder is claimed. Failed deliveries are retried from `next_attempt_at` onwards
+ALTER TABLE reminders
+    ADD COLUMN IF NOT EXISTS attempts        INTEGER DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE;
+
+-- Older versions used a plain table. Its rows are moved to the default partition and then spread into
+-- daily partitions by `maintain_reminder_partitions`
+DO
+$$
+    BEGIN
+        IF (SELECT relkind FROM pg_class WHERE oid = 'reminders'::REGCLASS) = 'r' THEN
+            ALTER TABLE reminders RENAME TO reminders_unpartitioned;
+            ALTER SEQUENCE reminders_id_seq OWNED BY NONE;
+            DROP INDEX IF EXISTS idx_reminders_expire_at;
+
+            CREATE TABLE reminders (LIKE reminders_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (expire_at);
+            ALTER SEQUENCE reminders_id_seq OWNED BY reminders.id;
+            CREATE TABLE reminders_default PARTITION OF reminders DEFAULT;
+
+            INSERT INTO reminders SELECT * FROM reminders_unpartitioned;
+            DROP TABLE reminders_unpartitioned;
+        END IF;
+    END
+$$;
+
+-- Only holds reminders outside of the daily partitions, which are mostly ones far in the future
+CREATE TABLE IF NOT EXISTS reminders_default PARTITION OF reminders DEFAULT;
 
 CREATE INDEX IF NOT EXISTS idx_reminders_expire_at ON reminders (expire_at) WHERE handled = FALSE;
 
+-- Keeps a daily partition around for every day from `retention` ago until `premake` from now and drops the
+-- ones past that, so handled reminders are cleaned up a whole day at a time instead of row by row
+CREATE OR REPLACE FUNCTION maintain_reminder_partitions(premake INTERVAL, retention INTERVAL) RETURNS VOID AS
+$$
+DECLARE
+    partition_day  DATE;
+    lower_bound    TIMESTAMP WITH TIME ZONE;
+    upper_bound    TIMESTAMP WITH TIME ZONE;
+    partition_name TEXT;
+    has_pending    BOOLEAN;
+BEGIN
+    -- Another replica is already on it
+    IF NOT pg_try_advisory_xact_lock(hashtext('maintain_reminder_partitions')) THEN
+        RETURN;
+    END IF;
+
+    -- Never queue up in front of deliveries for long, the next run will try again
+    SET LOCAL lock_timeout = '5s';
+    -- Rows are only moved between partitions here, there is nothing for the listeners to act on
+    SET LOCAL remindme.moving_reminders = 'on';
+
+    FOR partition_day IN SELECT generate_series((NOW() - retention) AT TIME ZONE 'UTC',
+                                                (NOW() + premake) AT TIME ZONE 'UTC', '1 day')::DATE
+        LOOP
+            partition_name := 'reminders_p' || to_char(partition_day, 'YYYYMMDD');
+            CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+
+            lower_bound := partition_day::TIMESTAMP AT TIME ZONE 'UTC';
+            upper_bound := (partition_day + 1)::TIMESTAMP AT TIME ZONE 'UTC';
+
+            -- Attaching fails if the default partition has rows in the new range, so those are moved first
+            EXECUTE format('CREATE TABLE %I (LIKE reminders INCLUDING DEFAULTS)', partition_name);
+            EXECUTE format('WITH moved AS (DELETE FROM reminders_default '
+                           'WHERE expire_at >= %L AND expire_at < %L RETURNING *) '
+                           'INSERT INTO %I SELECT * FROM moved', lower_bound, upper_bound, partition_name);
+            EXECUTE format('ALTER TABLE reminders ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', partition_name,
+                           lower_bound, upper_bound);
+        END LOOP;
+
+    FOR partition_name IN SELECT c.relname
+                          FROM pg_inherits i
+                                   JOIN pg_class c ON c.oid = i.inhrelid
+                          WHERE i.inhparent = 'reminders'::REGCLASS
+                            AND c.relname LIKE 'reminders\_p%'
+        LOOP
+            CONTINUE WHEN to_date(substr(partition_name, 12), 'YYYYMMDD') + 1 > (NOW() - retention) AT TIME ZONE 'UTC';
+
+            -- Reminders which could not be delivered yet keep the whole day around
+            EXECUTE format('SELECT EXISTS (SELECT FROM %I WHERE handled = FALSE)', partition_name) INTO has_pending;
+            CONTINUE WHEN has_pending;
+
+            EXECUTE format('ALTER TABLE reminders DETACH PARTITION %I', partition_name);
+            EXECUTE format('DROP TABLE %I', partition_name);
+        END LOOP;
+
+    -- Whatever ends up in the default partition (mostly from before partitioning) is still cleaned up row by row
+    DELETE FROM reminders_default WHERE handled = TRUE AND expire_at < NOW() - retention;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Reminders which kept failing to be delivered, kept around until someone looks into them
+CREATE TABLE IF NOT EXISTS dead_reminders
+(
+    id                   BIGINT                                 NOT NULL PRIMARY KEY,
+    user_id              BIGINT                                 NOT NULL,
+    description          VARCHAR(4000)                          NOT NULL,
+    expire_at            TIMESTAMP WITH TIME ZONE               NOT NULL,
+    reference_message_id BIGINT,
+    reference_channel_id BIGINT,
+    reference_guild_id   BIGINT,
+    attempts             INTEGER                                NOT NULL,
+    last_error           TEXT                                   NOT NULL,
+    failed_at            TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
 CREATE TABLE IF NOT EXISTS dm_channels
 (
     user_id    BIGINT NOT NULL,
     channel_id BIGINT NOT NULL
-);
\ No newline at end of file
+);
+
+-- Older versions could store the same user more than once
+DELETE
+FROM dm_channels a
+    USING dm_channels b
+WHERE a.user_id = b.user_id
+  AND a.ctid < b.ctid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_dm_channels_user_id ON dm_channels (user_id);
+
+CREATE OR REPLACE FUNCTION notify_reminder_event() RETURNS TRIGGER AS
+$$
+BEGIN
+    IF current_setting('remindme.moving_reminders', TRUE) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        -- Handled reminders being cleaned up are of no interest to anyone. Rescheduling a reminder into another
+        -- partition shows up as a DELETE followed by an INSERT
+        IF NOT OLD.handled THEN
+            PERFORM pg_notify('reminder_events', json_build_object('op', TG_OP, 'id', OLD.id)::TEXT);
+        END IF;
+    ELSE
+        -- While leased or waiting for a retry, the reminder only needs attention again once that is over
+        PERFORM pg_notify('reminder_events', json_build_object('op', TG_OP, 'id', NEW.id, 'expire_at',
+                                                               CASE
+                                                                   WHEN NEW.handled THEN NULL
+                                                                   ELSE GREATEST(NEW.expire_at, NEW.lease_expires_at,
+                                                                                 NEW.next_attempt_at)
+                                                                   END)::TEXT);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER reminders_notify_event
+    AFTER INSERT OR DELETE OR UPDATE OF expire_at, handled, lease_expires_at, next_attempt_at
+    ON reminders
+    FOR EACH ROW
+EXECUTE FUNCTION notify_reminder_event();
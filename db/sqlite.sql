@@ -0,0 +1,76 @@
+-- Schema of the embedded SQLite backend, see `remindme.db.sqlite`. It mirrors `schema.sql` and its migrations,
+-- minus partitioning. Timestamps are stored as microseconds since the Unix epoch, booleans as 0 or 1
+CREATE TABLE IF NOT EXISTS reminders
+(
+    -- Ids must never be reused, as they are kept in the custom ids of messages sent long ago
+    id                   INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id              INTEGER           NOT NULL,
+    description          TEXT              NOT NULL,
+    expire_at            INTEGER           NOT NULL,
+    reference_message_id INTEGER,
+    reference_channel_id INTEGER,
+    reference_guild_id   INTEGER,
+    handled              INTEGER DEFAULT 0 NOT NULL,
+    leased_by            TEXT,
+    lease_expires_at     INTEGER,
+    attempts             INTEGER DEFAULT 0 NOT NULL,
+    next_attempt_at      INTEGER
+);
+
+-- Statements must spell out `handled = 0` for SQLite to pick these up
+CREATE INDEX IF NOT EXISTS idx_reminders_expire_at ON reminders (expire_at) WHERE handled = 0;
+CREATE INDEX IF NOT EXISTS idx_reminders_user_id_expire_at ON reminders (user_id, expire_at, id) WHERE handled = 0;
+
+CREATE TABLE IF NOT EXISTS dead_reminders
+(
+    id                   INTEGER PRIMARY KEY,
+    user_id              INTEGER NOT NULL,
+    description          TEXT    NOT NULL,
+    expire_at            INTEGER NOT NULL,
+    reference_message_id INTEGER,
+    reference_channel_id INTEGER,
+    reference_guild_id   INTEGER,
+    attempts             INTEGER NOT NULL,
+    last_error           TEXT    NOT NULL,
+    failed_at            INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS dm_channels
+(
+    user_id    INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL
+);
+
+-- Same events as `notify_reminder_event`, passed to `remindme_reminder_event`, a function defined by the backend
+CREATE TRIGGER IF NOT EXISTS reminders_insert_event
+    AFTER INSERT
+    ON reminders
+BEGIN
+    SELECT remindme_reminder_event('INSERT', NEW.id, NEW.user_id,
+                                   CASE
+                                       WHEN NEW.handled THEN NULL
+                                       ELSE max(NEW.expire_at, coalesce(NEW.lease_expires_at, 0),
+                                                coalesce(NEW.next_attempt_at, 0))
+                                       END);
+END;
+
+CREATE TRIGGER IF NOT EXISTS reminders_update_event
+    AFTER UPDATE OF expire_at, handled, lease_expires_at, next_attempt_at
+    ON reminders
+BEGIN
+    SELECT remindme_reminder_event('UPDATE', NEW.id, NEW.user_id,
+                                   CASE
+                                       WHEN NEW.handled THEN NULL
+                                       ELSE max(NEW.expire_at, coalesce(NEW.lease_expires_at, 0),
+                                                coalesce(NEW.next_attempt_at, 0))
+                                       END);
+END;
+
+-- Handled reminders being cleaned up are of no interest to anyone
+CREATE TRIGGER IF NOT EXISTS reminders_delete_event
+    AFTER DELETE
+    ON reminders
+    WHEN NOT OLD.handled
+BEGIN
+    SELECT remindme_reminder_event('DELETE', OLD.id, OLD.user_id, NULL);
+END;
@@ -1,3 +1,8 @@
 from __future__ import annotations
 
-from remindme.loader import Loader as Loader
+from remindme import startup
+
+# Before anything else is imported, so that all of it can be timed
+startup.install()
+
+from remindme.loader import Loader as Loader  # noqa: E402 - Imported once the startup profiler is installed
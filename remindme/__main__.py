@@ -1,29 +1,79 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
+import typing
+
 import asyncpg
 import confspec
 import hikari
 import lightbulb
 
+from remindme import cache
 from remindme import config as configuration
 from remindme import db
+from remindme import delivery
+from remindme import dm_channels
 from remindme import extensions
+from remindme import metrics
+from remindme import migrations
+from remindme import notifications
+from remindme import scheduling
+from remindme import startup
 from remindme.interaction_handlers import components as components_interaction_handler
 from remindme.interaction_handlers import modals as modals_interaction_handler
+from remindme.utils import times
+
+if typing.TYPE_CHECKING:
+    import linkd
+
+logger = logging.getLogger("remindme.main")
+startup.mark("imports")
 
 config = confspec.load("config.yml", cls=configuration.Config)
+startup.mark("config")
+
+
+@lightbulb.hook(lightbulb.ExecutionSteps.PRE_INVOKE)
+def tag_statements_with_command(_: lightbulb.ExecutionPipeline, ctx: lightbulb.Context) -> None:
+    db.statement_source.set(f"command:{ctx.command_data.qualified_name}")
+
 
 bot = hikari.RESTBot(token=config.token, public_key=config.public_key)
-client = lightbulb.client_from_app(bot)
+client = lightbulb.client_from_app(bot, hooks=[tag_statements_with_command])
+startup.mark("client")
 
 
 async def pool_teardown(pool: asyncpg.Pool) -> None:
     await pool.close()
 
 
-async def start_client(_: hikari.RESTBot) -> None:
-    default_registry = client.di.registry_for(lightbulb.di.Contexts.DEFAULT)
+async def sqlite_teardown(storage: db.SqliteQueries) -> None:
+    await storage.close()
+
+
+async def router_teardown(router: db.ReplicaRouter) -> None:
+    await router.close()
+
+
+async def listener_teardown(listener: notifications.ReminderListener) -> None:
+    await listener.close()
 
+
+async def pipeline_teardown(pipeline: delivery.DeliveryPipeline) -> None:
+    await pipeline.close()
+
+
+async def time_parser_teardown(time_parser: times.TimeParser) -> None:
+    time_parser.close()
+
+
+async def metrics_server_teardown(server: metrics.MetricsServer) -> None:
+    await server.close()
+
+
+async def connect_postgres(registry: linkd.Registry) -> tuple[db.Queries, int]:
     pool = await asyncpg.create_pool(
         host=config.db.host,
         port=config.db.port,
@@ -31,16 +81,55 @@ async def start_client(_: hikari.RESTBot) -> None:
         user=config.db.username,
         password=config.db.password,
     )
-    default_registry.register_value(asyncpg.Pool, pool, teardown=pool_teardown)
-    default_registry.register_value(db.Queries, db.Queries(pool))  # type: ignore
+    registry.register_value(asyncpg.Pool, pool, teardown=pool_teardown)
+
+    if config.db.migrate_on_startup:
+        async with pool.acquire() as conn:
+            await migrations.migrate(conn)
+
+    await db.prime_pool(pool)
+
+    slow_query_threshold = config.db.slow_query_threshold
+    primary = db.InstrumentedPool(pool, slow_threshold=slow_query_threshold)
+
+    queries: db.Queries
+    if config.db.replicas:
+        # Replicas are connected to lazily, so that one being down does not stop the bot from starting
+        replicas = [
+            db.InstrumentedPool(await asyncpg.create_pool(dsn, min_size=0), slow_threshold=slow_query_threshold)
+            for dsn in config.db.replicas
+        ]
+        router = db.ReplicaRouter(primary, replicas)
+        registry.register_value(db.ReplicaRouter, router, teardown=router_teardown)
+        router.start()
 
+        queries = db.RoutingQueries(primary, router)
+    else:
+        queries = db.PostgresQueries(primary)
+
+    metrics.DB_POOL_CONNECTIONS.set_function(pool.get_size, "open")
+    metrics.DB_POOL_CONNECTIONS.set_function(pool.get_idle_size, "idle")
+    metrics.DB_POOL_CONNECTIONS.set_function(pool.get_max_size, "max")
+
+    # Leave at least half of the pool for interactions
+    return queries, max(1, min(config.delivery.workers, pool.get_max_size() // 2))
+
+
+async def open_sqlite(registry: linkd.Registry) -> db.SqliteQueries:
+    storage = db.SqliteQueries(config.db.sqlite_path)
+    await storage.open()
+    registry.register_value(db.SqliteQueries, storage, teardown=sqlite_teardown)
+    return storage
+
+
+async def load_extensions(registry: linkd.Registry) -> None:
     component_token = components_interaction_handler.handler.set(
         ch := components_interaction_handler.ComponentHandler(client)
     )
-    default_registry.register_value(components_interaction_handler.ComponentHandler, ch)
+    registry.register_value(components_interaction_handler.ComponentHandler, ch)
 
     modal_token = modals_interaction_handler.handler.set(ch := modals_interaction_handler.ModalHandler(client))
-    default_registry.register_value(modals_interaction_handler.ModalHandler, ch)
+    registry.register_value(modals_interaction_handler.ModalHandler, ch)
 
     try:
         await client.load_extensions_from_package(extensions, recursive=True)
@@ -48,7 +137,82 @@ async def start_client(_: hikari.RESTBot) -> None:
         components_interaction_handler.handler.reset(component_token)
         modals_interaction_handler.handler.reset(modal_token)
 
+
+# hikari only starts accepting interactions once this returns, so everything which would otherwise
+# slow down the first ones (connections, prepared statements, the parser workers) is warmed up here
+async def start_client(app: hikari.RESTBot) -> None:
+    startup.mark("server")
+    started_at = time.perf_counter()
+    default_registry = client.di.registry_for(lightbulb.di.Contexts.DEFAULT)
+
+    # Started first, so that readiness probes are answered while warming up
+    metrics_server: metrics.MetricsServer | None = None
+    if config.metrics.enabled:
+        metrics_server = metrics.MetricsServer(metrics.registry, host=config.metrics.host, port=config.metrics.port)
+        default_registry.register_value(metrics.MetricsServer, metrics_server, teardown=metrics_server_teardown)
+        await metrics_server.start()
+        startup.mark("metrics server")
+
+    time_parser = times.TimeParser(
+        workers=config.parsing.workers, timeout=config.parsing.timeout, max_pending=config.parsing.max_pending
+    )
+    default_registry.register_value(times.TimeParser, time_parser, teardown=time_parser_teardown)
+    # The workers take a few seconds to start, which can happen while everything else is set up
+    time_parser_warm_up = asyncio.create_task(time_parser.warm_up())
+    startup.mark("time parser")
+
+    default_registry.register_value(scheduling.ReminderScheduler, scheduler := scheduling.ReminderScheduler())
+
+    queries: db.Queries
+    storage: db.SqliteQueries | None = None
+    if config.db.backend == "sqlite":
+        storage = await open_sqlite(default_registry)
+        queries = storage
+        workers = config.delivery.workers
+    else:
+        queries, workers = await connect_postgres(default_registry)
+    startup.mark("database")
+
+    default_registry.register_value(db.Queries, queries)
+    default_registry.register_value(cache.ReminderCache, reminder_cache := cache.ReminderCache(queries))
+
+    listener = (
+        notifications.ReminderListener(config.db, scheduler, queries, reminder_cache)
+        if storage is None
+        else notifications.LocalReminderListener(config.db, scheduler, storage, reminder_cache)
+    )
+    default_registry.register_value(notifications.ReminderListener, listener, teardown=listener_teardown)
+
+    default_registry.register_value(
+        dm_channels.DMChannelCache, dm_channel_cache := dm_channels.DMChannelCache(queries, app.rest)
+    )
+
+    pipeline = delivery.DeliveryPipeline(
+        queries, dm_channel_cache, app.rest, workers=workers, queue_size=config.delivery.queue_size
+    )
+    default_registry.register_value(delivery.DeliveryPipeline, pipeline, teardown=pipeline_teardown)
+    pipeline.start()
+
+    metrics.DELIVERY_QUEUE_DEPTH.set_function(lambda: pipeline.queue_depth)
+    metrics.DELIVERY_IN_FLIGHT.set_function(lambda: pipeline.in_flight)
+    metrics.SCHEDULED_REMINDERS.set_function(lambda: len(scheduler))
+    metrics.CACHE_ENTRIES.set_function(lambda: len(reminder_cache))
+    metrics.count_rate_limits()
+    startup.mark("services")
+
+    await load_extensions(default_registry)
+    startup.mark("extensions")
+
+    await time_parser_warm_up
+    startup.mark("time parser warm-up")
     await client.start()
+    startup.mark("client start")
+
+    logger.info("warmed up in %.2fs", time.perf_counter() - started_at)
+    if metrics_server is not None:
+        metrics_server.ready = True
+
+    startup.finish()
 
 
 async def stop_client(_: hikari.RESTBot) -> None:
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import sys
+import typing
+
+import asyncpg
+import confspec
+
+from remindme import config as configuration
+from remindme import db
+from remindme import migrations
+from remindme import transfer
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+
+async def list_dead_reminders(conn: asyncpg.Connection[asyncpg.Record], queries: db.Queries, *, limit: int) -> None:
+    # Iterating goes through a cursor, which only exists within a transaction
+    async with conn.transaction(readonly=True):
+        async for reminder in queries.get_dead_reminders(limit=limit):
+            sys.stdout.write(
+                f"{reminder.id}\tuser={reminder.user_id}\texpire_at={reminder.expire_at.isoformat()}\t"
+                f"failed_at={reminder.failed_at.isoformat()}\tattempts={reminder.attempts}\t{reminder.last_error}\n"
+            )
+
+
+async def requeue_dead_reminders(queries: db.Queries, *, ids: list[int]) -> None:
+    # They are due already, so the bots will pick them up straight away
+    requeued = await queries.requeue_dead_reminders(ids=ids)
+    sys.stdout.write(f"requeued {len(requeued)} reminder(s)\n")
+
+
+async def apply_migrations(conn: asyncpg.Connection[asyncpg.Record]) -> None:
+    applied = await migrations.migrate(conn)
+
+    for migration in applied:
+        sys.stdout.write(f"applied {migration.version:04d}_{migration.name}\n")
+
+    if not applied:
+        sys.stdout.write("already up to date\n")
+
+
+@contextlib.contextmanager
+def _open(path: str, mode: typing.Literal["rb", "wb"]) -> collections.abc.Iterator[typing.BinaryIO]:
+    if path == "-":
+        yield sys.stdin.buffer if mode == "rb" else sys.stdout.buffer
+        return
+
+    with open(path, mode) as file:  # noqa: PTH123 - Not worth a Path just to open it
+        yield file
+
+
+async def export_reminders(conn: asyncpg.Connection[asyncpg.Record], *, path: str, format_: transfer.Format) -> None:
+    # A repeatable read snapshot, so that reminders changing during a long export are seen only once
+    async with conn.transaction(isolation="repeatable_read", readonly=True):
+        with _open(path, "wb") as file:
+            count = await transfer.write_reminders(file, transfer.export_reminders(conn), format_=format_)
+
+    sys.stderr.write(f"exported {count} reminder(s)\n")
+
+
+async def import_reminders(conn: asyncpg.Connection[asyncpg.Record], *, path: str, format_: transfer.Format) -> None:
+    with _open(path, "rb") as file:
+        count = await transfer.import_reminders(conn, transfer.read_reminders(file, format_=format_))
+
+    sys.stderr.write(f"imported {count} reminder(s)\n")
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m remindme.admin")
+    parser.add_argument("--config", default="config.yml", help="path to the bot configuration")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    dead_letters = commands.add_parser("dead-letters", help="list reminders which failed to be delivered")
+    dead_letters.add_argument("--limit", type=int, default=50)
+
+    requeue = commands.add_parser("requeue", help="move dead reminders back to be delivered again")
+    requeue.add_argument("ids", type=int, nargs="+")
+
+    commands.add_parser("migrate", help="apply pending database migrations")
+
+    export = commands.add_parser("export", help="write out all pending reminders")
+    export.add_argument("path", nargs="?", default="-", help="file to write to, defaults to stdout")
+    export.add_argument("--format", type=transfer.Format, choices=list(transfer.Format), default=transfer.Format.NDJSON)
+
+    import_ = commands.add_parser("import", help="add reminders written out by `export`")
+    import_.add_argument("path", nargs="?", default="-", help="file to read from, defaults to stdin")
+    import_.add_argument(
+        "--format", type=transfer.Format, choices=list(transfer.Format), default=transfer.Format.NDJSON
+    )
+
+    return parser
+
+
+async def run(args: argparse.Namespace) -> None:
+    config = confspec.load(args.config, cls=configuration.Config)
+    conn = await asyncpg.connect(
+        host=config.db.host,
+        port=config.db.port,
+        database=config.db.database,
+        user=config.db.username,
+        password=config.db.password,
+    )
+
+    try:
+        queries = db.PostgresQueries(conn)
+
+        match args.command:
+            case "dead-letters":
+                await list_dead_reminders(conn, queries, limit=args.limit)
+            case "requeue":
+                await requeue_dead_reminders(queries, ids=args.ids)
+            case "migrate":
+                await apply_migrations(conn)
+            case "export":
+                await export_reminders(conn, path=args.path, format_=args.format)
+            case "import":
+                await import_reminders(conn, path=args.path, format_=args.format)
+            case _:
+                msg = f"unknown command {args.command!r}"
+                raise ValueError(msg)
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(make_parser().parse_args()))
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import collections
+import collections.abc
+import time
+import typing
+
+from remindme import metrics
+
+if typing.TYPE_CHECKING:
+    from remindme import db
+    from remindme.db import models
+    from remindme.utils import pagination
+
+    _PageKey = tuple[int, pagination.Cursor, int]
+
+DEFAULT_MAX_REMINDERS = 10_000
+DEFAULT_MAX_PAGES = 5_000
+# Only bounds how stale an entry can get when an event about it was missed, such as while the
+# listener reconnects. Events can also arrive before a lagging read replica has seen the change
+DEFAULT_TTL = 5 * 60
+
+
+class ReminderCache:
+    """LRU cache in front of the reminder reads of the user interface.
+
+    Anything changing reminders has to call `invalidate` for the user, or rely on the reminder
+    events to do it, which also covers changes made by other replicas. Reads which must see a write
+    made just before should pass `fresh=True`, which skips the cache and reads from the primary.
+    """
+
+    __slots__ = (
+        "_invalidations",
+        "_pages",
+        "_pages_by_user",
+        "_queries",
+        "_reminders",
+        "max_pages",
+        "max_reminders",
+        "ttl",
+    )
+
+    def __init__(
+        self,
+        queries: db.Queries,
+        *,
+        max_reminders: int = DEFAULT_MAX_REMINDERS,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        ttl: float = DEFAULT_TTL,
+    ) -> None:
+        self._queries = queries
+        self.max_reminders = max_reminders
+        self.max_pages = max_pages
+        self.ttl = ttl
+
+        # Least recently used first, along with their monotonic expiry
+        self._reminders: collections.OrderedDict[int, tuple[models.Reminder, float]] = collections.OrderedDict()
+        self._pages: collections.OrderedDict[_PageKey, tuple[tuple[models.Reminder, ...], float]] = (
+            collections.OrderedDict()
+        )
+        self._pages_by_user: dict[int, set[_PageKey]] = {}
+        # Results read while something was invalidated might be stale already, so those are not stored
+        self._invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._reminders) + len(self._pages)
+
+    async def get_reminder(self, reminder_id: int, *, fresh: bool = False) -> models.Reminder | None:
+        if not fresh and (cached := self._reminders.get(reminder_id)) is not None:
+            reminder, expires_at = cached
+            if expires_at > time.monotonic():
+                self._reminders.move_to_end(reminder_id)
+                metrics.CACHE_REQUESTS.inc("reminder", "hit")
+                return reminder
+
+            del self._reminders[reminder_id]
+
+        metrics.CACHE_REQUESTS.inc("reminder", "miss")
+        queries = self._queries.primary if fresh else self._queries
+        invalidations = self._invalidations
+        reminder = await queries.get_reminder(id_=reminder_id)
+
+        if reminder is not None and invalidations == self._invalidations:
+            self._store_reminder(reminder, time.monotonic() + self.ttl)
+
+        return reminder
+
+    # Rows as returned by the page queries, see `pagination.make_page`
+    async def get_page(
+        self, user_id: int, cursor: pagination.Cursor, *, limit: int, fresh: bool = False
+    ) -> collections.abc.Sequence[models.Reminder]:
+        key = (user_id, cursor, limit)
+
+        if not fresh and (cached := self._pages.get(key)) is not None:
+            rows, expires_at = cached
+            if expires_at > time.monotonic():
+                self._pages.move_to_end(key)
+                metrics.CACHE_REQUESTS.inc("page", "hit")
+                return rows
+
+            self._drop_page(key)
+
+        metrics.CACHE_REQUESTS.inc("page", "miss")
+        queries = self._queries.primary if fresh else self._queries
+        get_page = queries.get_reminders_page_before if cursor.before else queries.get_reminders_page_from
+        invalidations = self._invalidations
+        rows = tuple(
+            await get_page(
+                user_id=user_id, cursor_expire_at=cursor.expire_at, cursor_id=cursor.reminder_id, limit=limit
+            )
+        )
+        if invalidations != self._invalidations:
+            return rows
+
+        expires_at = time.monotonic() + self.ttl
+        self._pages[key] = (rows, expires_at)
+        self._pages_by_user.setdefault(user_id, set()).add(key)
+        while len(self._pages) > self.max_pages:
+            self._drop_page(next(iter(self._pages)))
+
+        # Viewing one of them usually comes next
+        for reminder in rows:
+            self._store_reminder(reminder, expires_at)
+
+        return rows
+
+    # The user can be left out when not known, the owners of the cached reminders are invalidated then
+    def invalidate(self, user_id: int | None, reminder_ids: collections.abc.Iterable[int] = ()) -> None:
+        self._invalidations += 1
+        user_ids = set[int]() if user_id is None else {user_id}
+
+        for reminder_id in reminder_ids:
+            if (cached := self._reminders.pop(reminder_id, None)) is not None:
+                user_ids.add(cached[0].user_id)
+
+        # Any change can move reminders between pages, so all of the user's go
+        for invalidated_user_id in user_ids:
+            for key in self._pages_by_user.pop(invalidated_user_id, ()):
+                del self._pages[key]
+
+    def clear(self) -> None:
+        self._invalidations += 1
+        self._reminders.clear()
+        self._pages.clear()
+        self._pages_by_user.clear()
+
+    def _store_reminder(self, reminder: models.Reminder, expires_at: float) -> None:
+        self._reminders[reminder.id] = (reminder, expires_at)
+        self._reminders.move_to_end(reminder.id)
+
+        while len(self._reminders) > self.max_reminders:
+            self._reminders.popitem(last=False)
+
+    def _drop_page(self, key: _PageKey) -> None:
+        del self._pages[key]
+
+        user_keys = self._pages_by_user[key[0]]
+        user_keys.discard(key)
+        if not user_keys:
+            del self._pages_by_user[key[0]]
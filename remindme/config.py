@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import typing
+
 import msgspec
 
 
@@ -10,13 +12,50 @@ class Config(msgspec.Struct, kw_only=True):
     public_key: str
     port: int
     db: DatabaseConfig
+    delivery: DeliveryConfig = msgspec.field(default_factory=lambda: DeliveryConfig())
+    parsing: ParsingConfig = msgspec.field(default_factory=lambda: ParsingConfig())
+    metrics: MetricsConfig = msgspec.field(default_factory=lambda: MetricsConfig())
 
 
 class DatabaseConfig(msgspec.Struct, kw_only=True):
     """Database configuration."""
 
+    # SQLite only suits a single replica, and leaves out the read replicas and the admin CLI
+    backend: typing.Literal["postgres", "sqlite"] = "postgres"
+    sqlite_path: str = "remindme.sqlite3"
     host: str
     port: int
     database: str
     username: str
     password: str
+    migrate_on_startup: bool = True
+    # Statements running for longer than this many seconds are logged along with their arguments
+    slow_query_threshold: float = 0.5
+    # DSNs of read replicas to send the reads of the user interface to
+    replicas: list[str] | None = None
+
+
+class DeliveryConfig(msgspec.Struct, kw_only=True):
+    """Reminder delivery configuration."""
+
+    workers: int = 8
+    queue_size: int = 256
+
+
+class ParsingConfig(msgspec.Struct, kw_only=True):
+    """Reminder time parsing configuration."""
+
+    # Processes running dateparser for the phrases the fast path does not cover
+    workers: int = 2
+    # Seconds a parse may take, including waiting for a worker, before the user is told to try again
+    timeout: float = 1
+    # Parses running or waiting for a worker at once, any more are turned down straight away
+    max_pending: int = 16
+
+
+class MetricsConfig(msgspec.Struct, kw_only=True):
+    """Metrics endpoint configuration."""
+
+    enabled: bool = True
+    host: str | None = None
+    port: int = 9090
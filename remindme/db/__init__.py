@@ -1,3 +1,11 @@
 from __future__ import annotations
 
-from remindme.db.queries import Queries as Queries
+from remindme.db.decoding import PostgresQueries as PostgresQueries
+from remindme.db.instrumentation import InstrumentedPool as InstrumentedPool
+from remindme.db.instrumentation import statement_source as statement_source
+from remindme.db.protocol import Queries as Queries
+from remindme.db.protocol import Rows as Rows
+from remindme.db.routing import ReplicaRouter as ReplicaRouter
+from remindme.db.routing import RoutingQueries as RoutingQueries
+from remindme.db.sqlite import SqliteQueries as SqliteQueries
+from remindme.db.warmup import prime_pool as prime_pool
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import functools
+import itertools
+import typing
+
+import msgspec
+
+from remindme.db import models
+from remindme.db import queries
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+    import asyncpg
+
+__all__: collections.abc.Sequence[str] = (
+    "Connection",
+    "DeadReminder",
+    "GetPendingRemindersBeforeRow",
+    "PostgresQueries",
+    "Reminder",
+)
+
+
+class Connection(typing.Protocol):
+    """What `PostgresQueries` runs its statements through.
+
+    An asyncpg connection, or one of the wrappers sending statements to a pool or to the replicas.
+    """
+
+    async def execute(self, query: str, *args: object) -> str: ...
+
+    async def fetch(self, query: str, *args: object) -> list[asyncpg.Record]: ...
+
+    async def fetchrow(self, query: str, *args: object) -> asyncpg.Record | None: ...
+
+    async def fetchval(self, query: str, *args: object) -> object: ...
+
+    def cursor(self, query: str, *args: object) -> collections.abc.AsyncIterable[asyncpg.Record]: ...
+
+
+# Rows only ever hold scalars, so they can never be part of a reference cycle. Keeping them away from the
+# garbage collector saves a GC header per row and stops large results from setting off collections
+class Reminder(models.Reminder, gc=False):
+    pass
+
+
+class DeadReminder(models.DeadReminder, gc=False):
+    pass
+
+
+class GetPendingRemindersBeforeRow(queries.GetPendingRemindersBeforeRow, gc=False):
+    pass
+
+
+class QueryResults[T](queries.QueryResults[T]):
+    """`QueryResults` decoding rows by passing their columns positionally to a callable, usually a struct type.
+
+    Rows are unpacked by `itertools.starmap`, so decoding a struct does not run any Python code per row.
+    Any `msgspec.Struct` whose fields are in the same order as the selected columns works, including
+    `array_like` and `gc=False` ones.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        conn: queries.ConnectionLike,
+        sql: str,
+        decode_hook: collections.abc.Callable[..., T],
+        *args: queries.QueryResultsArgsType,
+    ) -> None:
+        super().__init__(conn, sql, decode_hook, *args)
+
+    @classmethod
+    def from_results[U](
+        cls, results: queries.QueryResults[typing.Any], decode_hook: collections.abc.Callable[..., U]
+    ) -> QueryResults[U]:
+        """Run the statement of `results` with the same arguments, decoding the rows with `decode_hook` instead."""
+        return QueryResults(results._conn, results._sql, decode_hook, *results._args)  # noqa: SLF001 - Not worth a public accessor on generated code
+
+    def __await__(self) -> collections.abc.Generator[None, None, collections.abc.Sequence[T]]:
+        async def _wrapper() -> collections.abc.Sequence[T]:
+            return list(itertools.starmap(self._decode_hook, await self._conn.fetch(self._sql, *self._args)))
+
+        return _wrapper().__await__()
+
+    async def __anext__(self) -> T:
+        if self._cursor is None or self._iterator is None:
+            self._cursor = self._conn.cursor(self._sql, *self._args)
+            self._iterator = self._cursor.__aiter__()
+
+        try:
+            record: asyncpg.Record = await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self._cursor = None
+            self._iterator = None
+            raise
+
+        return self._decode_hook(*record)
+
+
+# Both keep the signature of the generated method, whose rows `decode` has to return (a subclass of)
+def _many[F: collections.abc.Callable[..., queries.QueryResults[typing.Any]]](
+    method: F, decode: collections.abc.Callable[..., object]
+) -> F:
+    # Runs the generated method for its statement and arguments, and decodes the rows with `decode` instead
+    @functools.wraps(method)
+    def wrapper(self: queries.Queries, /, *args: object, **kwargs: object) -> queries.QueryResults[typing.Any]:
+        return QueryResults.from_results(method(self, *args, **kwargs), decode)
+
+    return typing.cast("F", wrapper)
+
+
+def _one[F: collections.abc.Callable[..., collections.abc.Awaitable[msgspec.Struct | None]]](
+    method: F, decode: collections.abc.Callable[..., object]
+) -> F:
+    @functools.wraps(method)
+    async def wrapper(self: queries.Queries, /, *args: object, **kwargs: object) -> object:
+        if (row := await method(self, *args, **kwargs)) is None:
+            return None
+
+        return decode(*msgspec.structs.astuple(row))
+
+    return typing.cast("F", wrapper)
+
+
+class PostgresQueries(queries.Queries):
+    """Generated queries, with the rows they return decoded into the structs above."""
+
+    __slots__ = ()
+
+    def __init__(self, conn: Connection) -> None:
+        # The generated queries only ask for asyncpg connections, but never use more than `Connection` has
+        super().__init__(conn)  # type: ignore[reportArgumentType]
+
+    # Where reads which must see the writes made just before go. Only differs when reads are
+    # sent to replicas, see `routing.RoutingQueries`
+    @property
+    def primary(self) -> PostgresQueries:
+        return self
+
+    claim_due_reminders = _many(queries.Queries.claim_due_reminders, Reminder)
+    create_reminder = _one(queries.Queries.create_reminder, Reminder)
+    create_reminder_with_reference = _one(queries.Queries.create_reminder_with_reference, Reminder)
+    get_dead_reminders = _many(queries.Queries.get_dead_reminders, DeadReminder)
+    get_pending_reminders_before = _many(queries.Queries.get_pending_reminders_before, GetPendingRemindersBeforeRow)
+    get_reminder = _one(queries.Queries.get_reminder, Reminder)
+    get_reminders_page_before = _many(queries.Queries.get_reminders_page_before, Reminder)
+    get_reminders_page_from = _many(queries.Queries.get_reminders_page_from, Reminder)
+    requeue_dead_reminders = _many(queries.Queries.requeue_dead_reminders, Reminder)
+    reschedule_reminder = _one(queries.Queries.reschedule_reminder, Reminder)
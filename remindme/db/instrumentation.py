@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import logging
+import time
+import typing
+
+from remindme import metrics
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+    import asyncpg
+    import asyncpg.transaction
+
+__all__: collections.abc.Sequence[str] = (
+    "InstrumentedConnection",
+    "InstrumentedPool",
+    "statement_name",
+    "statement_source",
+)
+
+logger = logging.getLogger("remindme.db.slow")
+
+DEFAULT_SLOW_THRESHOLD = 0.5
+MAX_LOGGED_ARGUMENT_LENGTH = 200
+
+# What is running the statements (a command, an interaction or a task), for the slow statement log
+statement_source: contextvars.ContextVar[str] = contextvars.ContextVar("statement_source", default="unknown")
+
+_NAME_PREFIX = "-- name: "
+
+
+# sqlc puts `-- name: <Name> :<kind>` on the first line of every statement it generates
+@functools.lru_cache(maxsize=256)
+def statement_name(query: str) -> str:
+    if not query.startswith(_NAME_PREFIX):
+        return "other"
+
+    return query[len(_NAME_PREFIX) :].split(maxsplit=1)[0]
+
+
+def _format_arguments(args: tuple[object, ...]) -> str:
+    formatted = (repr(arg) for arg in args)
+    return ", ".join(
+        f"{arg[:MAX_LOGGED_ARGUMENT_LENGTH]}..." if len(arg) > MAX_LOGGED_ARGUMENT_LENGTH else arg for arg in formatted
+    )
+
+
+def _status_row_count(status: str) -> int:
+    # Such as "UPDATE 3" or "INSERT 0 1"
+    count = status.rpartition(" ")[2]
+    return int(count) if count.isdigit() else 0
+
+
+def _observe(name: str, elapsed: float, waited: float, args: tuple[object, ...], slow_threshold: float) -> None:
+    metrics.DB_QUERY_DURATION.observe(elapsed, name)
+
+    if elapsed >= slow_threshold:
+        logger.warning(
+            "slow statement %s from %s took %.3fs (after waiting %.3fs for a connection) with (%s)",
+            name,
+            statement_source.get(),
+            elapsed,
+            waited,
+            _format_arguments(args),
+        )
+
+
+async def _run_on[T](
+    conn: asyncpg.pool.PoolConnectionProxy[asyncpg.Record],
+    query: str,
+    args: tuple[object, ...],
+    call: collections.abc.Callable[[asyncpg.pool.PoolConnectionProxy[asyncpg.Record]], collections.abc.Awaitable[T]],
+    count_rows: collections.abc.Callable[[T], int],
+    *,
+    slow_threshold: float,
+    waited: float = 0,
+) -> T:
+    name = statement_name(query)
+    started_at = time.perf_counter()
+
+    try:
+        result = await call(conn)
+    finally:
+        _observe(name, time.perf_counter() - started_at, waited, args, slow_threshold)
+
+    metrics.DB_QUERY_ROWS.inc(name, amount=count_rows(result))
+    return result
+
+
+# Asyncpg cursors only work inside a transaction. The time taken includes however long the rows took to
+# be handled in between, as they are fetched as they are needed
+async def _iterate_on(
+    conn: asyncpg.pool.PoolConnectionProxy[asyncpg.Record],
+    query: str,
+    args: tuple[object, ...],
+    *,
+    slow_threshold: float,
+    waited: float = 0,
+) -> collections.abc.AsyncGenerator[asyncpg.Record]:
+    name = statement_name(query)
+    started_at = time.perf_counter()
+    rows = 0
+
+    try:
+        async for record in conn.cursor(query, *args):
+            rows += 1
+            yield record
+    finally:
+        _observe(name, time.perf_counter() - started_at, waited, args, slow_threshold)
+        metrics.DB_QUERY_ROWS.inc(name, amount=rows)
+
+
+class InstrumentedConnection:
+    """Connection wrapper timing every statement like `InstrumentedPool`, for those which must share a connection."""
+
+    __slots__ = ("_conn", "slow_threshold")
+
+    def __init__(
+        self, conn: asyncpg.pool.PoolConnectionProxy[asyncpg.Record], *, slow_threshold: float = DEFAULT_SLOW_THRESHOLD
+    ) -> None:
+        self._conn = conn
+        self.slow_threshold = slow_threshold
+
+    def transaction(self) -> asyncpg.transaction.Transaction:
+        return self._conn.transaction()
+
+    async def execute(self, query: str, *args: object) -> str:
+        return await _run_on(
+            self._conn,
+            query,
+            args,
+            lambda conn: conn.execute(query, *args),
+            _status_row_count,
+            slow_threshold=self.slow_threshold,
+        )
+
+    async def fetch(self, query: str, *args: object) -> list[asyncpg.Record]:
+        return await _run_on(
+            self._conn, query, args, lambda conn: conn.fetch(query, *args), len, slow_threshold=self.slow_threshold
+        )
+
+    async def fetchrow(self, query: str, *args: object) -> asyncpg.Record | None:
+        return await _run_on(
+            self._conn,
+            query,
+            args,
+            lambda conn: conn.fetchrow(query, *args),
+            lambda row: row is not None,
+            slow_threshold=self.slow_threshold,
+        )
+
+    async def fetchval(self, query: str, *args: object) -> object:
+        return await _run_on(
+            self._conn,
+            query,
+            args,
+            lambda conn: conn.fetchval(query, *args),
+            lambda value: value is not None,
+            slow_threshold=self.slow_threshold,
+        )
+
+    # Only works inside a transaction, like with asyncpg
+    def cursor(self, query: str, *args: object) -> collections.abc.AsyncIterator[asyncpg.Record]:
+        return _iterate_on(self._conn, query, args, slow_threshold=self.slow_threshold)
+
+
+class InstrumentedPool:
+    """Pool wrapper timing every statement, keyed by its sqlc query name.
+
+    Waiting for a connection is measured separately from running the statement, so that an exhausted
+    pool does not show up as slow statements. Statements which must run on the same connection, such
+    as those of a transaction, go through the `InstrumentedConnection` given by `acquire`.
+    """
+
+    __slots__ = ("_pool", "slow_threshold")
+
+    def __init__(self, pool: asyncpg.Pool, *, slow_threshold: float = DEFAULT_SLOW_THRESHOLD) -> None:
+        self._pool = pool
+        self.slow_threshold = slow_threshold
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> collections.abc.AsyncIterator[InstrumentedConnection]:
+        async with self._pool.acquire() as conn:
+            yield InstrumentedConnection(conn, slow_threshold=self.slow_threshold)
+
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> collections.abc.AsyncIterator[InstrumentedConnection]:
+        async with self.acquire() as conn, conn.transaction():
+            yield conn
+
+    async def _run[T](
+        self,
+        query: str,
+        args: tuple[object, ...],
+        call: collections.abc.Callable[
+            [asyncpg.pool.PoolConnectionProxy[asyncpg.Record]], collections.abc.Awaitable[T]
+        ],
+        count_rows: collections.abc.Callable[[T], int],
+    ) -> T:
+        started_at = time.perf_counter()
+
+        async with self._pool.acquire() as conn:
+            waited = time.perf_counter() - started_at
+            metrics.DB_POOL_ACQUIRE_WAIT.observe(waited, statement_name(query))
+
+            return await _run_on(conn, query, args, call, count_rows, slow_threshold=self.slow_threshold, waited=waited)
+
+    async def execute(self, query: str, *args: object) -> str:
+        return await self._run(query, args, lambda conn: conn.execute(query, *args), _status_row_count)
+
+    async def fetch(self, query: str, *args: object) -> list[asyncpg.Record]:
+        return await self._run(query, args, lambda conn: conn.fetch(query, *args), len)
+
+    async def fetchrow(self, query: str, *args: object) -> asyncpg.Record | None:
+        return await self._run(query, args, lambda conn: conn.fetchrow(query, *args), lambda row: row is not None)
+
+    async def fetchval(self, query: str, *args: object) -> object:
+        return await self._run(query, args, lambda conn: conn.fetchval(query, *args), lambda value: value is not None)
+
+    # Holds on to a connection, inside a transaction, until every row was read or the iteration is closed
+    async def cursor(self, query: str, *args: object) -> collections.abc.AsyncIterator[asyncpg.Record]:
+        started_at = time.perf_counter()
+
+        async with self._pool.acquire() as conn, conn.transaction():
+            waited = time.perf_counter() - started_at
+            metrics.DB_POOL_ACQUIRE_WAIT.observe(waited, statement_name(query))
+
+            async with contextlib.aclosing(
+                _iterate_on(conn, query, args, slow_threshold=self.slow_threshold, waited=waited)
+            ) as records:
+                async for record in records:
+                    yield record
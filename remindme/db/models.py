@@ -6,6 +6,7 @@
 from __future__ import annotations
 
 __all__: collections.abc.Sequence[str] = (
+    "DeadReminder",
     "Reminder",
 )
 
@@ -17,6 +18,35 @@ if typing.TYPE_CHECKING:
     import datetime
 
 
+class DeadReminder(msgspec.Struct):
+    """Model representing DeadReminder.
+
+    Attributes
+    ----------
+    id : int
+    user_id : int
+    description : str
+    expire_at : datetime.datetime
+    reference_message_id : int | None
+    reference_channel_id : int | None
+    reference_guild_id : int | None
+    attempts : int
+    last_error : str
+    failed_at : datetime.datetime
+
+    """
+
+    id: int
+    user_id: int
+    description: str
+    expire_at: datetime.datetime
+    reference_message_id: int | None
+    reference_channel_id: int | None
+    reference_guild_id: int | None
+    attempts: int
+    last_error: str
+    failed_at: datetime.datetime
+
 class Reminder(msgspec.Struct):
     """Model representing Reminder.
 
@@ -30,6 +60,10 @@ class Reminder(msgspec.Struct):
     reference_channel_id : int | None
     reference_guild_id : int | None
     handled : bool
+    leased_by : str | None
+    lease_expires_at : datetime.datetime | None
+    attempts : int
+    next_attempt_at : datetime.datetime | None
 
     """
 
@@ -41,3 +75,7 @@ class Reminder(msgspec.Struct):
     reference_channel_id: int | None
     reference_guild_id: int | None
     handled: bool
+    leased_by: str | None
+    lease_expires_at: datetime.datetime | None
+    attempts: int
+    next_attempt_at: datetime.datetime | None
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+    import datetime
+
+    from remindme.db import models
+    from remindme.db import queries
+
+__all__: collections.abc.Sequence[str] = ("Queries", "Rows")
+
+
+class Rows[T](typing.Protocol):
+    """Result of a `:many` query, which can be awaited for every row or iterated over."""
+
+    def __await__(self) -> collections.abc.Generator[typing.Any, None, collections.abc.Sequence[T]]: ...
+
+    def __aiter__(self) -> collections.abc.AsyncIterator[T]: ...
+
+
+class Queries(typing.Protocol):
+    """The queries of `db/queries.sql`, whichever database runs them.
+
+    Implemented by `decoding.PostgresQueries` (and `routing.RoutingQueries`) and `sqlite.SqliteQueries`.
+    """
+
+    # Where reads which must see the writes made just before go
+    @property
+    def primary(self) -> Queries: ...
+
+    async def add_reminder_reference_message(
+        self,
+        *,
+        reference_message_id: int | None,
+        reference_channel_id: int | None,
+        reference_guild_id: int | None,
+        id_: int,
+    ) -> None: ...
+
+    def claim_due_reminders(
+        self, *, leased_by: str | None, lease_expires_at: datetime.datetime | None, max_count: int
+    ) -> Rows[models.Reminder]: ...
+
+    async def count_due_reminders(self) -> int | None: ...
+
+    async def create_reminder(
+        self, *, user_id: int, description: str, expire_at: datetime.datetime
+    ) -> models.Reminder | None: ...
+
+    async def create_reminder_with_reference(
+        self,
+        *,
+        user_id: int,
+        description: str,
+        expire_at: datetime.datetime,
+        reference_message_id: int | None,
+        reference_channel_id: int | None,
+        reference_guild_id: int | None,
+    ) -> models.Reminder | None: ...
+
+    async def dead_letter_reminders(
+        self, *, ids: collections.abc.Sequence[int], errors: collections.abc.Sequence[str]
+    ) -> None: ...
+
+    async def delete_reminder(self, *, id_: int) -> None: ...
+
+    async def delete_reminders(self, *, ids: collections.abc.Sequence[int]) -> None: ...
+
+    def get_dead_reminders(self, *, limit: int) -> Rows[models.DeadReminder]: ...
+
+    async def get_dm_channel_for_user(self, *, user_id: int) -> int | None: ...
+
+    def get_pending_reminders_before(
+        self, *, expire_at: datetime.datetime
+    ) -> Rows[queries.GetPendingRemindersBeforeRow]: ...
+
+    async def get_reminder(self, *, id_: int) -> models.Reminder | None: ...
+
+    def get_reminders_page_before(
+        self, *, user_id: int, cursor_expire_at: datetime.datetime, cursor_id: int, limit: int
+    ) -> Rows[models.Reminder]: ...
+
+    def get_reminders_page_from(
+        self, *, user_id: int, cursor_expire_at: datetime.datetime, cursor_id: int, limit: int
+    ) -> Rows[models.Reminder]: ...
+
+    async def maintain_reminder_partitions(
+        self, *, premake: datetime.timedelta, retention: datetime.timedelta
+    ) -> None: ...
+
+    async def mark_reminders_as_handled(self, *, ids: collections.abc.Sequence[int]) -> None: ...
+
+    async def release_reminders(
+        self,
+        *,
+        ids: collections.abc.Sequence[int],
+        lease_expires_ats: collections.abc.Sequence[datetime.datetime],
+        leased_by: str | None,
+    ) -> None: ...
+
+    def requeue_dead_reminders(self, *, ids: collections.abc.Sequence[int]) -> Rows[models.Reminder]: ...
+
+    async def reschedule_reminder(self, *, expire_at: datetime.datetime, id_: int) -> models.Reminder | None: ...
+
+    async def retry_reminders(
+        self, *, ids: collections.abc.Sequence[int], next_attempt_ats: collections.abc.Sequence[datetime.datetime]
+    ) -> None: ...
+
+    async def upsert_dm_channel(self, *, user_id: int, channel_id: int) -> None: ...
@@ -6,11 +6,13 @@
 from __future__ import annotations
 
 __all__: collections.abc.Sequence[str] = (
+    "GetPendingRemindersBeforeRow",
     "Queries",
     "QueryResults",
 )
 
 import operator
+import msgspec
 import typing
 
 if typing.TYPE_CHECKING:
@@ -26,11 +28,6 @@ if typing.TYPE_CHECKING:
 from remindme.db import models
 
 
-ADD_DM_CHANNEL: typing.Final[str] = """-- name: AddDmChannel :exec
-INSERT INTO dm_channels (user_id, channel_id)
-VALUES ($1, $2)
-"""
-
 ADD_REMINDER_REFERENCE_MESSAGE: typing.Final[str] = """-- name: AddReminderReferenceMessage :exec
 UPDATE reminders
 SET reference_message_id=$1,
@@ -39,16 +36,58 @@ SET reference_message_id=$1,
 WHERE id = $4
 """
 
+CLAIM_DUE_REMINDERS: typing.Final[str] = """-- name: ClaimDueReminders :many
+UPDATE reminders
+SET leased_by        = $1,
+    lease_expires_at = $2,
+    attempts         = attempts + 1
+WHERE id IN (SELECT id
+             FROM reminders
+             WHERE expire_at < NOW()
+               AND handled = FALSE
+               AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+               AND (next_attempt_at IS NULL OR next_attempt_at < NOW())
+             ORDER BY expire_at
+             LIMIT $3 FOR UPDATE SKIP LOCKED)
+RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+"""
+
+COUNT_DUE_REMINDERS: typing.Final[str] = """-- name: CountDueReminders :one
+SELECT COUNT(*)
+FROM reminders
+WHERE expire_at < NOW()
+  AND handled = FALSE
+  AND (next_attempt_at IS NULL OR next_attempt_at < NOW())
+"""
+
 CREATE_REMINDER: typing.Final[str] = """-- name: CreateReminder :one
 INSERT INTO reminders (user_id, description, expire_at)
 VALUES ($1, $2, $3)
-RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
+RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
 """
 
 CREATE_REMINDER_WITH_REFERENCE: typing.Final[str] = """-- name: CreateReminderWithReference :one
 INSERT INTO reminders (user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id)
 VALUES ($1, $2, $3, $4, $5, $6)
-RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
+RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+"""
+
+DEAD_LETTER_REMINDERS: typing.Final[str] = """-- name: DeadLetterReminders :exec
+WITH dead AS (DELETE FROM reminders WHERE id = ANY ($1::BIGINT[]) RETURNING *)
+INSERT
+INTO dead_reminders (id, user_id, description, expire_at, reference_message_id, reference_channel_id,
+                     reference_guild_id, attempts, last_error)
+SELECT dead.id,
+       dead.user_id,
+       dead.description,
+       dead.expire_at,
+       dead.reference_message_id,
+       dead.reference_channel_id,
+       dead.reference_guild_id,
+       dead.attempts,
+       failures.error
+FROM dead
+         JOIN UNNEST($1::BIGINT[], $2::TEXT[]) AS failures (id, error) ON failures.id = dead.id
 """
 
 DELETE_REMINDER: typing.Final[str] = """-- name: DeleteReminder :exec
@@ -57,62 +96,147 @@ FROM reminders
 WHERE id = $1
 """
 
+DELETE_REMINDERS: typing.Final[str] = """-- name: DeleteReminders :exec
+DELETE
+FROM reminders
+WHERE id = ANY ($1::BIGINT[])
+"""
+
+GET_DEAD_REMINDERS: typing.Final[str] = """-- name: GetDeadReminders :many
+SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, attempts, last_error, failed_at
+FROM dead_reminders
+ORDER BY failed_at DESC
+LIMIT $1
+"""
+
 GET_DM_CHANNEL_FOR_USER: typing.Final[str] = """-- name: GetDmChannelForUser :one
 SELECT channel_id
 FROM dm_channels
 WHERE user_id = $1
 """
 
-GET_EXPIRED_REMINDERS: typing.Final[str] = """-- name: GetExpiredReminders :many
-SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
+GET_PENDING_REMINDERS_BEFORE: typing.Final[str] = """-- name: GetPendingRemindersBefore :many
+SELECT id, GREATEST(expire_at, lease_expires_at, next_attempt_at)::TIMESTAMP WITH TIME ZONE AS due_at
 FROM reminders
-WHERE expire_at < NOW()
+WHERE expire_at < $1
   AND handled = FALSE
 """
 
-GET_HANDLED_REMINDERS: typing.Final[str] = """-- name: GetHandledReminders :many
-SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
-FROM reminders
-WHERE handled = TRUE
-  AND expire_at < $1
-"""
-
 GET_REMINDER: typing.Final[str] = """-- name: GetReminder :one
-SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
+SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
 FROM reminders
 WHERE id = $1
 """
 
-GET_REMINDERS_COUNT_FOR: typing.Final[str] = """-- name: GetRemindersCountFor :one
-SELECT COUNT(*)
-FROM reminders
-WHERE user_id = $1
-  AND handled = FALSE
+GET_REMINDERS_PAGE_BEFORE: typing.Final[str] = """-- name: GetRemindersPageBefore :many
+(SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+ FROM reminders
+ WHERE user_id = $1
+   AND handled = FALSE
+   AND (expire_at, id) < ($2::TIMESTAMP WITH TIME ZONE, $3::BIGINT)
+ ORDER BY expire_at DESC, id DESC
+ LIMIT $4)
+UNION ALL
+(SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+ FROM reminders
+ WHERE user_id = $1
+   AND handled = FALSE
+   AND (expire_at, id) >= ($2::TIMESTAMP WITH TIME ZONE, $3::BIGINT)
+ ORDER BY expire_at, id
+ LIMIT 1)
 """
 
-GET_REMINDERS_FOR: typing.Final[str] = """-- name: GetRemindersFor :many
-SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
-FROM reminders
-WHERE user_id = $1
-  AND handled = FALSE
-ORDER BY expire_at
-OFFSET $2 ROWS FETCH NEXT $3 ROWS ONLY
+GET_REMINDERS_PAGE_FROM: typing.Final[str] = """-- name: GetRemindersPageFrom :many
+(SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+ FROM reminders
+ WHERE user_id = $1
+   AND handled = FALSE
+   AND (expire_at, id) < ($2::TIMESTAMP WITH TIME ZONE, $3::BIGINT)
+ ORDER BY expire_at DESC, id DESC
+ LIMIT 1)
+UNION ALL
+(SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+ FROM reminders
+ WHERE user_id = $1
+   AND handled = FALSE
+   AND (expire_at, id) >= ($2::TIMESTAMP WITH TIME ZONE, $3::BIGINT)
+ ORDER BY expire_at, id
+ LIMIT $4)
 """
 
-MARK_REMINDER_AS_HANDLED: typing.Final[str] = """-- name: MarkReminderAsHandled :exec
+MAINTAIN_REMINDER_PARTITIONS: typing.Final[str] = """-- name: MaintainReminderPartitions :exec
+SELECT maintain_reminder_partitions($1::INTERVAL, $2::INTERVAL)
+"""
+
+MARK_REMINDERS_AS_HANDLED: typing.Final[str] = """-- name: MarkRemindersAsHandled :exec
 UPDATE reminders
-SET handled = TRUE
-WHERE id = $1
+SET handled          = TRUE,
+    leased_by        = NULL,
+    lease_expires_at = NULL
+WHERE id = ANY ($1::BIGINT[])
+"""
+
+RELEASE_REMINDERS: typing.Final[str] = """-- name: ReleaseReminders :exec
+UPDATE reminders
+SET leased_by        = NULL,
+    lease_expires_at = NULL,
+    attempts         = attempts - 1
+FROM UNNEST($1::BIGINT[], $2::TIMESTAMP WITH TIME ZONE[]) AS released (id, lease_expires_at)
+WHERE reminders.id = released.id
+  AND reminders.leased_by = $3
+  AND reminders.lease_expires_at = released.lease_expires_at
+"""
+
+REQUEUE_DEAD_REMINDERS: typing.Final[str] = """-- name: RequeueDeadReminders :many
+WITH requeued AS (DELETE FROM dead_reminders WHERE id = ANY ($1::BIGINT[]) RETURNING *)
+INSERT
+INTO reminders (id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id)
+SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id
+FROM requeued
+RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
 """
 
 RESCHEDULE_REMINDER: typing.Final[str] = """-- name: RescheduleReminder :one
 UPDATE reminders
-SET handled   = FALSE,
-    expire_at = $1
+SET handled          = FALSE,
+    expire_at        = $1,
+    leased_by        = NULL,
+    lease_expires_at = NULL,
+    attempts         = 0,
+    next_attempt_at  = NULL
 WHERE id = $2
-RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
+RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+"""
+
+RETRY_REMINDERS: typing.Final[str] = """-- name: RetryReminders :exec
+UPDATE reminders
+SET leased_by        = NULL,
+    lease_expires_at = NULL,
+    next_attempt_at  = retries.next_attempt_at
+FROM UNNEST($1::BIGINT[], $2::TIMESTAMP WITH TIME ZONE[]) AS retries (id, next_attempt_at)
+WHERE reminders.id = retries.id
 """
 
+UPSERT_DM_CHANNEL: typing.Final[str] = """-- name: UpsertDmChannel :exec
+INSERT INTO dm_channels (user_id, channel_id)
+VALUES ($1, $2)
+ON CONFLICT (user_id) DO UPDATE SET channel_id = excluded.channel_id
+"""
+
+
+class GetPendingRemindersBeforeRow(msgspec.Struct):
+    """Model representing GetPendingRemindersBeforeRow.
+
+    Attributes
+    ----------
+    id : int
+    due_at : datetime.datetime
+
+    """
+
+    id: int
+    due_at: datetime.datetime
+
 
 T = typing.TypeVar("T")
 
@@ -227,22 +351,6 @@ class Queries:
         """
         return self._conn
 
-    async def add_dm_channel(self, *, user_id: int, channel_id: int) -> None:
-        """Execute SQL query with `name: AddDmChannel :exec`.
-
-        ```sql
-        INSERT INTO dm_channels (user_id, channel_id)
-        VALUES ($1, $2)
-        ```
-
-        Parameters
-        ----------
-        user_id : int
-        channel_id : int
-
-        """
-        await self._conn.execute(ADD_DM_CHANNEL, user_id, channel_id)
-
     async def add_reminder_reference_message(self, *, reference_message_id: int | None, reference_channel_id: int | None, reference_guild_id: int | None, id_: int) -> None:
         """Execute SQL query with `name: AddReminderReferenceMessage :exec`.
 
@@ -264,13 +372,70 @@ class Queries:
         """
         await self._conn.execute(ADD_REMINDER_REFERENCE_MESSAGE, reference_message_id, reference_channel_id, reference_guild_id, id_)
 
+    def claim_due_reminders(self, *, leased_by: str | None, lease_expires_at: datetime.datetime | None, max_count: int) -> QueryResults[models.Reminder]:
+        """Fetch many from the db using the SQL query with `name: ClaimDueReminders :many`.
+
+        ```sql
+        UPDATE reminders
+        SET leased_by        = $1,
+            lease_expires_at = $2,
+            attempts         = attempts + 1
+        WHERE id IN (SELECT id
+                     FROM reminders
+                     WHERE expire_at < NOW()
+                       AND handled = FALSE
+                       AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+                       AND (next_attempt_at IS NULL OR next_attempt_at < NOW())
+                     ORDER BY expire_at
+                     LIMIT $3 FOR UPDATE SKIP LOCKED)
+        RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+        ```
+
+        Parameters
+        ----------
+        leased_by : str | None
+        lease_expires_at : datetime.datetime | None
+        max_count : int
+
+        Returns
+        -------
+        QueryResults[models.Reminder]
+            Helper class that allows both iteration and normal fetching of data from the db.
+
+        """
+        def _decode_hook(row: asyncpg.Record) -> models.Reminder:
+            return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7], leased_by=row[8], lease_expires_at=row[9], attempts=row[10], next_attempt_at=row[11])
+        return QueryResults[models.Reminder](self._conn, CLAIM_DUE_REMINDERS, _decode_hook, leased_by, lease_expires_at, max_count)
+
+    async def count_due_reminders(self) -> int | None:
+        """Fetch one from the db using the SQL query with `name: CountDueReminders :one`.
+
+        ```sql
+        SELECT COUNT(*)
+        FROM reminders
+        WHERE expire_at < NOW()
+          AND handled = FALSE
+          AND (next_attempt_at IS NULL OR next_attempt_at < NOW())
+        ```
+
+        Returns
+        -------
+        int
+            Result fetched from the db. Will be `None` if not found.
+
+        """
+        row = await self._conn.fetchrow(COUNT_DUE_REMINDERS)
+        if row is None:
+            return None
+        return row[0]
+
     async def create_reminder(self, *, user_id: int, description: str, expire_at: datetime.datetime) -> models.Reminder | None:
         """Fetch one from the db using the SQL query with `name: CreateReminder :one`.
 
         ```sql
         INSERT INTO reminders (user_id, description, expire_at)
         VALUES ($1, $2, $3)
-        RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
+        RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
         ```
 
         Parameters
@@ -288,7 +453,7 @@ class Queries:
         row = await self._conn.fetchrow(CREATE_REMINDER, user_id, description, expire_at)
         if row is None:
             return None
-        return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7])
+        return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7], leased_by=row[8], lease_expires_at=row[9], attempts=row[10], next_attempt_at=row[11])
 
     async def create_reminder_with_reference(self, *, user_id: int, description: str, expire_at: datetime.datetime, reference_message_id: int | None, reference_channel_id: int | None, reference_guild_id: int | None) -> models.Reminder | None:
         """Fetch one from the db using the SQL query with `name: CreateReminderWithReference :one`.
@@ -296,7 +461,7 @@ class Queries:
         ```sql
         INSERT INTO reminders (user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id)
         VALUES ($1, $2, $3, $4, $5, $6)
-        RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
+        RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
         ```
 
         Parameters
@@ -317,7 +482,36 @@ class Queries:
         row = await self._conn.fetchrow(CREATE_REMINDER_WITH_REFERENCE, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id)
         if row is None:
             return None
-        return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7])
+        return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7], leased_by=row[8], lease_expires_at=row[9], attempts=row[10], next_attempt_at=row[11])
+
+    async def dead_letter_reminders(self, *, ids: collections.abc.Sequence[int], errors: collections.abc.Sequence[str]) -> None:
+        """Execute SQL query with `name: DeadLetterReminders :exec`.
+
+        ```sql
+        WITH dead AS (DELETE FROM reminders WHERE id = ANY ($1::BIGINT[]) RETURNING *)
+        INSERT
+        INTO dead_reminders (id, user_id, description, expire_at, reference_message_id, reference_channel_id,
+                             reference_guild_id, attempts, last_error)
+        SELECT dead.id,
+               dead.user_id,
+               dead.description,
+               dead.expire_at,
+               dead.reference_message_id,
+               dead.reference_channel_id,
+               dead.reference_guild_id,
+               dead.attempts,
+               failures.error
+        FROM dead
+                 JOIN UNNEST($1::BIGINT[], $2::TEXT[]) AS failures (id, error) ON failures.id = dead.id
+        ```
+
+        Parameters
+        ----------
+        ids : collections.abc.Sequence[int]
+        errors : collections.abc.Sequence[str]
+
+        """
+        await self._conn.execute(DEAD_LETTER_REMINDERS, ids, errors)
 
     async def delete_reminder(self, *, id_: int) -> None:
         """Execute SQL query with `name: DeleteReminder :exec`.
@@ -335,6 +529,46 @@ class Queries:
         """
         await self._conn.execute(DELETE_REMINDER, id_)
 
+    async def delete_reminders(self, *, ids: collections.abc.Sequence[int]) -> None:
+        """Execute SQL query with `name: DeleteReminders :exec`.
+
+        ```sql
+        DELETE
+        FROM reminders
+        WHERE id = ANY ($1::BIGINT[])
+        ```
+
+        Parameters
+        ----------
+        ids : collections.abc.Sequence[int]
+
+        """
+        await self._conn.execute(DELETE_REMINDERS, ids)
+
+    def get_dead_reminders(self, *, limit: int) -> QueryResults[models.DeadReminder]:
+        """Fetch many from the db using the SQL query with `name: GetDeadReminders :many`.
+
+        ```sql
+        SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, attempts, last_error, failed_at
+        FROM dead_reminders
+        ORDER BY failed_at DESC
+        LIMIT $1
+        ```
+
+        Parameters
+        ----------
+        limit : int
+
+        Returns
+        -------
+        QueryResults[models.DeadReminder]
+            Helper class that allows both iteration and normal fetching of data from the db.
+
+        """
+        def _decode_hook(row: asyncpg.Record) -> models.DeadReminder:
+            return models.DeadReminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], attempts=row[7], last_error=row[8], failed_at=row[9])
+        return QueryResults[models.DeadReminder](self._conn, GET_DEAD_REMINDERS, _decode_hook, limit)
+
     async def get_dm_channel_for_user(self, *, user_id: int) -> int | None:
         """Fetch one from the db using the SQL query with `name: GetDmChannelForUser :one`.
 
@@ -359,55 +593,35 @@ class Queries:
             return None
         return row[0]
 
-    def get_expired_reminders(self) -> QueryResults[models.Reminder]:
-        """Fetch many from the db using the SQL query with `name: GetExpiredReminders :many`.
+    def get_pending_reminders_before(self, *, expire_at: datetime.datetime) -> QueryResults[GetPendingRemindersBeforeRow]:
+        """Fetch many from the db using the SQL query with `name: GetPendingRemindersBefore :many`.
 
         ```sql
-        SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
+        SELECT id, GREATEST(expire_at, lease_expires_at, next_attempt_at)::TIMESTAMP WITH TIME ZONE AS due_at
         FROM reminders
-        WHERE expire_at < NOW()
+        WHERE expire_at < $1
           AND handled = FALSE
         ```
 
-        Returns
-        -------
-        QueryResults[models.Reminder]
-            Helper class that allows both iteration and normal fetching of data from the db.
-
-        """
-        def _decode_hook(row: asyncpg.Record) -> models.Reminder:
-            return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7])
-        return QueryResults[models.Reminder](self._conn, GET_EXPIRED_REMINDERS, _decode_hook)
-
-    def get_handled_reminders(self, *, expire_at: datetime.datetime) -> QueryResults[models.Reminder]:
-        """Fetch many from the db using the SQL query with `name: GetHandledReminders :many`.
-
-        ```sql
-        SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
-        FROM reminders
-        WHERE handled = TRUE
-          AND expire_at < $1
-        ```
-
         Parameters
         ----------
         expire_at : datetime.datetime
 
         Returns
         -------
-        QueryResults[models.Reminder]
+        QueryResults[GetPendingRemindersBeforeRow]
             Helper class that allows both iteration and normal fetching of data from the db.
 
         """
-        def _decode_hook(row: asyncpg.Record) -> models.Reminder:
-            return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7])
-        return QueryResults[models.Reminder](self._conn, GET_HANDLED_REMINDERS, _decode_hook, expire_at)
+        def _decode_hook(row: asyncpg.Record) -> GetPendingRemindersBeforeRow:
+            return GetPendingRemindersBeforeRow(id=row[0], due_at=row[1])
+        return QueryResults[GetPendingRemindersBeforeRow](self._conn, GET_PENDING_REMINDERS_BEFORE, _decode_hook, expire_at)
 
     async def get_reminder(self, *, id_: int) -> models.Reminder | None:
         """Fetch one from the db using the SQL query with `name: GetReminder :one`.
 
         ```sql
-        SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
+        SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
         FROM reminders
         WHERE id = $1
         ```
@@ -425,49 +639,72 @@ class Queries:
         row = await self._conn.fetchrow(GET_REMINDER, id_)
         if row is None:
             return None
-        return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7])
+        return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7], leased_by=row[8], lease_expires_at=row[9], attempts=row[10], next_attempt_at=row[11])
 
-    async def get_reminders_count_for(self, *, user_id: int) -> int | None:
-        """Fetch one from the db using the SQL query with `name: GetRemindersCountFor :one`.
+    def get_reminders_page_before(self, *, user_id: int, cursor_expire_at: datetime.datetime, cursor_id: int, limit: int) -> QueryResults[models.Reminder]:
+        """Fetch many from the db using the SQL query with `name: GetRemindersPageBefore :many`.
 
         ```sql
-        SELECT COUNT(*)
-        FROM reminders
-        WHERE user_id = $1
-          AND handled = FALSE
+        (SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+         FROM reminders
+         WHERE user_id = $1
+           AND handled = FALSE
+           AND (expire_at, id) < ($2::TIMESTAMP WITH TIME ZONE, $3::BIGINT)
+         ORDER BY expire_at DESC, id DESC
+         LIMIT $4)
+        UNION ALL
+        (SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+         FROM reminders
+         WHERE user_id = $1
+           AND handled = FALSE
+           AND (expire_at, id) >= ($2::TIMESTAMP WITH TIME ZONE, $3::BIGINT)
+         ORDER BY expire_at, id
+         LIMIT 1)
         ```
 
         Parameters
         ----------
         user_id : int
+        cursor_expire_at : datetime.datetime
+        cursor_id : int
+        limit : int
 
         Returns
         -------
-        int
-            Result fetched from the db. Will be `None` if not found.
+        QueryResults[models.Reminder]
+            Helper class that allows both iteration and normal fetching of data from the db.
 
         """
-        row = await self._conn.fetchrow(GET_REMINDERS_COUNT_FOR, user_id)
-        if row is None:
-            return None
-        return row[0]
+        def _decode_hook(row: asyncpg.Record) -> models.Reminder:
+            return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7], leased_by=row[8], lease_expires_at=row[9], attempts=row[10], next_attempt_at=row[11])
+        return QueryResults[models.Reminder](self._conn, GET_REMINDERS_PAGE_BEFORE, _decode_hook, user_id, cursor_expire_at, cursor_id, limit)
 
-    def get_reminders_for(self, *, user_id: int, offset: int, limit: int) -> QueryResults[models.Reminder]:
-        """Fetch many from the db using the SQL query with `name: GetRemindersFor :many`.
+    def get_reminders_page_from(self, *, user_id: int, cursor_expire_at: datetime.datetime, cursor_id: int, limit: int) -> QueryResults[models.Reminder]:
+        """Fetch many from the db using the SQL query with `name: GetRemindersPageFrom :many`.
 
         ```sql
-        SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
-        FROM reminders
-        WHERE user_id = $1
-          AND handled = FALSE
-        ORDER BY expire_at
-        OFFSET $2 ROWS FETCH NEXT $3 ROWS ONLY
+        (SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+         FROM reminders
+         WHERE user_id = $1
+           AND handled = FALSE
+           AND (expire_at, id) < ($2::TIMESTAMP WITH TIME ZONE, $3::BIGINT)
+         ORDER BY expire_at DESC, id DESC
+         LIMIT 1)
+        UNION ALL
+        (SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+         FROM reminders
+         WHERE user_id = $1
+           AND handled = FALSE
+           AND (expire_at, id) >= ($2::TIMESTAMP WITH TIME ZONE, $3::BIGINT)
+         ORDER BY expire_at, id
+         LIMIT $4)
         ```
 
         Parameters
         ----------
         user_id : int
-        offset : int
+        cursor_expire_at : datetime.datetime
+        cursor_id : int
         limit : int
 
         Returns
@@ -477,34 +714,104 @@ class Queries:
 
         """
         def _decode_hook(row: asyncpg.Record) -> models.Reminder:
-            return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7])
-        return QueryResults[models.Reminder](self._conn, GET_REMINDERS_FOR, _decode_hook, user_id, offset, limit)
+            return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7], leased_by=row[8], lease_expires_at=row[9], attempts=row[10], next_attempt_at=row[11])
+        return QueryResults[models.Reminder](self._conn, GET_REMINDERS_PAGE_FROM, _decode_hook, user_id, cursor_expire_at, cursor_id, limit)
 
-    async def mark_reminder_as_handled(self, *, id_: int) -> None:
-        """Execute SQL query with `name: MarkReminderAsHandled :exec`.
+    async def maintain_reminder_partitions(self, *, premake: datetime.timedelta, retention: datetime.timedelta) -> None:
+        """Execute SQL query with `name: MaintainReminderPartitions :exec`.
+
+        ```sql
+        SELECT maintain_reminder_partitions($1::INTERVAL, $2::INTERVAL)
+        ```
+
+        Parameters
+        ----------
+        premake : datetime.timedelta
+        retention : datetime.timedelta
+
+        """
+        await self._conn.execute(MAINTAIN_REMINDER_PARTITIONS, premake, retention)
+
+    async def mark_reminders_as_handled(self, *, ids: collections.abc.Sequence[int]) -> None:
+        """Execute SQL query with `name: MarkRemindersAsHandled :exec`.
 
         ```sql
         UPDATE reminders
-        SET handled = TRUE
-        WHERE id = $1
+        SET handled          = TRUE,
+            leased_by        = NULL,
+            lease_expires_at = NULL
+        WHERE id = ANY ($1::BIGINT[])
         ```
 
         Parameters
         ----------
-        id_ : int
+        ids : collections.abc.Sequence[int]
+
+        """
+        await self._conn.execute(MARK_REMINDERS_AS_HANDLED, ids)
+
+    async def release_reminders(self, *, ids: collections.abc.Sequence[int], lease_expires_ats: collections.abc.Sequence[datetime.datetime], leased_by: str | None) -> None:
+        """Execute SQL query with `name: ReleaseReminders :exec`.
+
+        ```sql
+        UPDATE reminders
+        SET leased_by        = NULL,
+            lease_expires_at = NULL,
+            attempts         = attempts - 1
+        FROM UNNEST($1::BIGINT[], $2::TIMESTAMP WITH TIME ZONE[]) AS released (id, lease_expires_at)
+        WHERE reminders.id = released.id
+          AND reminders.leased_by = $3
+          AND reminders.lease_expires_at = released.lease_expires_at
+        ```
+
+        Parameters
+        ----------
+        ids : collections.abc.Sequence[int]
+        lease_expires_ats : collections.abc.Sequence[datetime.datetime]
+        leased_by : str | None
+
+        """
+        await self._conn.execute(RELEASE_REMINDERS, ids, lease_expires_ats, leased_by)
+
+    def requeue_dead_reminders(self, *, ids: collections.abc.Sequence[int]) -> QueryResults[models.Reminder]:
+        """Fetch many from the db using the SQL query with `name: RequeueDeadReminders :many`.
+
+        ```sql
+        WITH requeued AS (DELETE FROM dead_reminders WHERE id = ANY ($1::BIGINT[]) RETURNING *)
+        INSERT
+        INTO reminders (id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id)
+        SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id
+        FROM requeued
+        RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
+        ```
+
+        Parameters
+        ----------
+        ids : collections.abc.Sequence[int]
+
+        Returns
+        -------
+        QueryResults[models.Reminder]
+            Helper class that allows both iteration and normal fetching of data from the db.
 
         """
-        await self._conn.execute(MARK_REMINDER_AS_HANDLED, id_)
+        def _decode_hook(row: asyncpg.Record) -> models.Reminder:
+            return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7], leased_by=row[8], lease_expires_at=row[9], attempts=row[10], next_attempt_at=row[11])
+        return QueryResults[models.Reminder](self._conn, REQUEUE_DEAD_REMINDERS, _decode_hook, ids)
 
     async def reschedule_reminder(self, *, expire_at: datetime.datetime, id_: int) -> models.Reminder | None:
         """Fetch one from the db using the SQL query with `name: RescheduleReminder :one`.
 
         ```sql
         UPDATE reminders
-        SET handled   = FALSE,
-            expire_at = $1
+        SET handled          = FALSE,
+            expire_at        = $1,
+            leased_by        = NULL,
+            lease_expires_at = NULL,
+            attempts         = 0,
+            next_attempt_at  = NULL
         WHERE id = $2
-        RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled
+        RETURNING id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id, handled, leased_by, lease_expires_at, attempts, next_attempt_at
         ```
 
         Parameters
@@ -521,4 +828,41 @@ class Queries:
         row = await self._conn.fetchrow(RESCHEDULE_REMINDER, expire_at, id_)
         if row is None:
             return None
-        return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7])
+        return models.Reminder(id=row[0], user_id=row[1], description=row[2], expire_at=row[3], reference_message_id=row[4], reference_channel_id=row[5], reference_guild_id=row[6], handled=row[7], leased_by=row[8], lease_expires_at=row[9], attempts=row[10], next_attempt_at=row[11])
+
+    async def retry_reminders(self, *, ids: collections.abc.Sequence[int], next_attempt_ats: collections.abc.Sequence[datetime.datetime]) -> None:
+        """Execute SQL query with `name: RetryReminders :exec`.
+
+        ```sql
+        UPDATE reminders
+        SET leased_by        = NULL,
+            lease_expires_at = NULL,
+            next_attempt_at  = retries.next_attempt_at
+        FROM UNNEST($1::BIGINT[], $2::TIMESTAMP WITH TIME ZONE[]) AS retries (id, next_attempt_at)
+        WHERE reminders.id = retries.id
+        ```
+
+        Parameters
+        ----------
+        ids : collections.abc.Sequence[int]
+        next_attempt_ats : collections.abc.Sequence[datetime.datetime]
+
+        """
+        await self._conn.execute(RETRY_REMINDERS, ids, next_attempt_ats)
+
+    async def upsert_dm_channel(self, *, user_id: int, channel_id: int) -> None:
+        """Execute SQL query with `name: UpsertDmChannel :exec`.
+
+        ```sql
+        INSERT INTO dm_channels (user_id, channel_id)
+        VALUES ($1, $2)
+        ON CONFLICT (user_id) DO UPDATE SET channel_id = excluded.channel_id
+        ```
+
+        Parameters
+        ----------
+        user_id : int
+        channel_id : int
+
+        """
+        await self._conn.execute(UPSERT_DM_CHANNEL, user_id, channel_id)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import typing
+
+import asyncpg
+
+from remindme.db import decoding
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+    import datetime
+
+    from remindme.db import instrumentation
+    from remindme.db import models
+    from remindme.db import queries
+
+
+__all__: collections.abc.Sequence[str] = ("ReplicaRouter", "RoutingQueries")
+
+logger = logging.getLogger("remindme.db.routing")
+
+HEALTH_CHECK_INTERVAL = 10
+HEALTH_CHECK_TIMEOUT = 5
+
+# Errors meaning the replica itself is unusable, rather than the statement being wrong
+_CONNECTION_ERRORS = (
+    OSError,
+    TimeoutError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.exceptions.ConnectionDoesNotExistError,
+)
+
+
+class ReplicaRouter:
+    """Connection-like object sending statements to healthy replicas in turn.
+
+    Replicas that fail are skipped until the next health check sees them working again. When none
+    is healthy, statements go to the primary instead.
+    """
+
+    __slots__ = ("_checker", "_healthy", "_primary", "_replicas", "_turns")
+
+    def __init__(
+        self,
+        primary: instrumentation.InstrumentedPool,
+        replicas: collections.abc.Sequence[instrumentation.InstrumentedPool],
+    ) -> None:
+        self._primary = primary
+        self._replicas = replicas
+        self._healthy = [True] * len(replicas)
+        self._turns = itertools.cycle(range(len(replicas)))
+        self._checker: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._checker is None:
+            self._checker = asyncio.create_task(self._check_periodically(), name="replica-health-check")
+
+    async def close(self) -> None:
+        if self._checker is not None:
+            self._checker.cancel()
+            await asyncio.gather(self._checker, return_exceptions=True)
+            self._checker = None
+
+        await asyncio.gather(*(replica.close() for replica in self._replicas), return_exceptions=True)
+
+    def _pick(self) -> int | None:
+        for _ in self._replicas:
+            if self._healthy[index := next(self._turns)]:
+                return index
+
+        return None
+
+    def _mark(self, index: int, *, healthy: bool, ex: BaseException | None = None) -> None:
+        if self._healthy[index] == healthy:
+            return
+
+        self._healthy[index] = healthy
+        if healthy:
+            logger.info("replica %s is healthy again", index)
+        else:
+            logger.warning("replica %s is unhealthy, sending its reads elsewhere", index, exc_info=ex)
+
+    async def _call[T](
+        self, call: collections.abc.Callable[[instrumentation.InstrumentedPool], collections.abc.Awaitable[T]]
+    ) -> T:
+        if (index := self._pick()) is not None:
+            try:
+                return await call(self._replicas[index])
+            except _CONNECTION_ERRORS as ex:
+                self._mark(index, healthy=False, ex=ex)
+
+        return await call(self._primary)
+
+    # Only reads go to the replicas, anything else has to reach the primary
+    async def execute(self, query: str, *args: object) -> str:
+        return await self._primary.execute(query, *args)
+
+    async def fetch(self, query: str, *args: object) -> list[asyncpg.Record]:
+        return await self._call(lambda pool: pool.fetch(query, *args))
+
+    async def fetchrow(self, query: str, *args: object) -> asyncpg.Record | None:
+        return await self._call(lambda pool: pool.fetchrow(query, *args))
+
+    async def fetchval(self, query: str, *args: object) -> object:
+        return await self._call(lambda pool: pool.fetchval(query, *args))
+
+    # Rows are read as they are needed, so there is no going to another replica once it started
+    def cursor(self, query: str, *args: object) -> collections.abc.AsyncIterator[asyncpg.Record]:
+        index = self._pick()
+        return (self._primary if index is None else self._replicas[index]).cursor(query, *args)
+
+    async def _check(self, index: int) -> None:
+        try:
+            await asyncio.wait_for(self._replicas[index].fetchval("SELECT 1"), HEALTH_CHECK_TIMEOUT)
+        except (*_CONNECTION_ERRORS, asyncpg.PostgresError) as ex:
+            self._mark(index, healthy=False, ex=ex)
+        else:
+            self._mark(index, healthy=True)
+
+    async def _check_periodically(self) -> None:
+        while True:
+            await asyncio.gather(*(self._check(index) for index in range(len(self._replicas))))
+            await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+
+
+class RoutingQueries(decoding.PostgresQueries):
+    """Queries sending the reads of the user interface to read replicas.
+
+    Replicas lag behind, so anything which must see a write made just before has to go through
+    `primary` instead.
+    """
+
+    __slots__ = ("_primary", "_replica")
+
+    def __init__(self, conn: decoding.Connection, router: ReplicaRouter) -> None:
+        super().__init__(conn)
+        self._primary = decoding.PostgresQueries(conn)
+        self._replica = decoding.PostgresQueries(router)
+
+    @property
+    def primary(self) -> decoding.PostgresQueries:
+        return self._primary
+
+    async def get_dm_channel_for_user(self, *, user_id: int) -> int | None:
+        return await self._replica.get_dm_channel_for_user(user_id=user_id)
+
+    async def get_reminder(self, *, id_: int) -> models.Reminder | None:
+        return await self._replica.get_reminder(id_=id_)
+
+    def get_reminders_page_before(
+        self, *, user_id: int, cursor_expire_at: datetime.datetime, cursor_id: int, limit: int
+    ) -> queries.QueryResults[models.Reminder]:
+        return self._replica.get_reminders_page_before(
+            user_id=user_id, cursor_expire_at=cursor_expire_at, cursor_id=cursor_id, limit=limit
+        )
+
+    def get_reminders_page_from(
+        self, *, user_id: int, cursor_expire_at: datetime.datetime, cursor_id: int, limit: int
+    ) -> queries.QueryResults[models.Reminder]:
+        return self._replica.get_reminders_page_from(
+            user_id=user_id, cursor_expire_at=cursor_expire_at, cursor_id=cursor_id, limit=limit
+        )
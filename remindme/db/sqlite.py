@@ -0,0 +1,594 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextlib
+import datetime
+import logging
+import pathlib
+import sqlite3
+import time
+import typing
+
+from remindme import metrics
+from remindme.db import decoding
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+    from remindme.db import models
+
+    type _Row = tuple[typing.Any, ...]
+    type _Event = tuple[str, int, int, datetime.datetime | None]
+    type EventListener = collections.abc.Callable[[str, int, int, datetime.datetime | None], None]
+
+__all__: collections.abc.Sequence[str] = ("SqliteQueries",)
+
+logger = logging.getLogger("remindme.db.sqlite")
+
+SCHEMA_PATH = pathlib.Path(__file__).parents[2] / "db" / "sqlite.sql"
+BUSY_TIMEOUT = 5
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+# Same statements as `db/queries.sql`, with `now` passed in instead of using `NOW()`
+GET_REMINDER = "SELECT * FROM reminders WHERE id = :id"
+
+CLAIM_DUE_REMINDERS = """
+UPDATE reminders
+SET leased_by        = :leased_by,
+    lease_expires_at = :lease_expires_at,
+    attempts         = attempts + 1
+WHERE id IN (SELECT id
+             FROM reminders
+             WHERE expire_at < :now
+               AND handled = 0
+               AND (lease_expires_at IS NULL OR lease_expires_at < :now)
+               AND (next_attempt_at IS NULL OR next_attempt_at < :now)
+             ORDER BY expire_at
+             LIMIT :max_count)
+RETURNING *
+"""
+
+COUNT_DUE_REMINDERS = """
+SELECT COUNT(*)
+FROM reminders
+WHERE expire_at < :now
+  AND handled = 0
+  AND (next_attempt_at IS NULL OR next_attempt_at < :now)
+"""
+
+GET_PENDING_REMINDERS_BEFORE = """
+SELECT id, max(expire_at, coalesce(lease_expires_at, 0), coalesce(next_attempt_at, 0))
+FROM reminders
+WHERE expire_at < :expire_at
+  AND handled = 0
+"""
+
+_PAGE_BEFORE_CURSOR = """
+SELECT *
+FROM (SELECT *
+      FROM reminders
+      WHERE user_id = :user_id
+        AND handled = 0
+        AND (expire_at, id) < (:cursor_expire_at, :cursor_id)
+      ORDER BY expire_at DESC, id DESC
+      LIMIT {limit})
+"""
+_PAGE_FROM_CURSOR = """
+SELECT *
+FROM (SELECT *
+      FROM reminders
+      WHERE user_id = :user_id
+        AND handled = 0
+        AND (expire_at, id) >= (:cursor_expire_at, :cursor_id)
+      ORDER BY expire_at, id
+      LIMIT {limit})
+"""
+GET_REMINDERS_PAGE_FROM = _PAGE_BEFORE_CURSOR.format(limit="1") + "UNION ALL" + _PAGE_FROM_CURSOR.format(limit=":limit")
+GET_REMINDERS_PAGE_BEFORE = (
+    _PAGE_BEFORE_CURSOR.format(limit=":limit") + "UNION ALL" + _PAGE_FROM_CURSOR.format(limit="1")
+)
+
+CREATE_REMINDER = """
+INSERT INTO reminders (user_id, description, expire_at)
+VALUES (:user_id, :description, :expire_at)
+RETURNING *
+"""
+
+CREATE_REMINDER_WITH_REFERENCE = """
+INSERT INTO reminders (user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id)
+VALUES (:user_id, :description, :expire_at, :reference_message_id, :reference_channel_id, :reference_guild_id)
+RETURNING *
+"""
+
+ADD_REMINDER_REFERENCE_MESSAGE = """
+UPDATE reminders
+SET reference_message_id = :reference_message_id,
+    reference_channel_id = :reference_channel_id,
+    reference_guild_id   = :reference_guild_id
+WHERE id = :id
+"""
+
+MARK_REMINDER_AS_HANDLED = """
+UPDATE reminders
+SET handled          = 1,
+    leased_by        = NULL,
+    lease_expires_at = NULL
+WHERE id = ?
+"""
+
+RETRY_REMINDER = """
+UPDATE reminders
+SET leased_by        = NULL,
+    lease_expires_at = NULL,
+    next_attempt_at  = ?
+WHERE id = ?
+"""
+
+RELEASE_REMINDER = """
+UPDATE reminders
+SET leased_by        = NULL,
+    lease_expires_at = NULL,
+    attempts         = attempts - 1
+WHERE id = ?
+  AND leased_by = ?
+  AND lease_expires_at = ?
+"""
+
+DEAD_LETTER_REMINDER = """
+INSERT INTO dead_reminders (id, user_id, description, expire_at, reference_message_id, reference_channel_id,
+                            reference_guild_id, attempts, last_error, failed_at)
+SELECT id,
+       user_id,
+       description,
+       expire_at,
+       reference_message_id,
+       reference_channel_id,
+       reference_guild_id,
+       attempts,
+       :error,
+       :now
+FROM reminders
+WHERE id = :id
+"""
+
+GET_DEAD_REMINDERS = "SELECT * FROM dead_reminders ORDER BY failed_at DESC LIMIT :limit"
+
+REQUEUE_DEAD_REMINDER = """
+INSERT INTO reminders (id, user_id, description, expire_at, reference_message_id, reference_channel_id,
+                       reference_guild_id)
+SELECT id, user_id, description, expire_at, reference_message_id, reference_channel_id, reference_guild_id
+FROM dead_reminders
+WHERE id = :id
+RETURNING *
+"""
+
+RESCHEDULE_REMINDER = """
+UPDATE reminders
+SET handled          = 0,
+    expire_at        = :expire_at,
+    leased_by        = NULL,
+    lease_expires_at = NULL,
+    attempts         = 0,
+    next_attempt_at  = NULL
+WHERE id = :id
+RETURNING *
+"""
+
+DELETE_REMINDER = "DELETE FROM reminders WHERE id = ?"
+DELETE_DEAD_REMINDER = "DELETE FROM dead_reminders WHERE id = ?"
+
+# There are no partitions, so this is all there is to maintaining them
+DELETE_HANDLED_REMINDERS = "DELETE FROM reminders WHERE handled = 1 AND expire_at < :expire_at"
+
+GET_DM_CHANNEL_FOR_USER = "SELECT channel_id FROM dm_channels WHERE user_id = :user_id"
+
+UPSERT_DM_CHANNEL = """
+INSERT INTO dm_channels (user_id, channel_id)
+VALUES (:user_id, :channel_id)
+ON CONFLICT (user_id) DO UPDATE SET channel_id = excluded.channel_id
+"""
+
+
+def _to_timestamp(value: datetime.datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_timestamp(value: int) -> datetime.datetime:
+    return _EPOCH + datetime.timedelta(microseconds=value)
+
+
+# Takes the write lock straight away, so that it cannot fail halfway through on another process holding it
+@contextlib.contextmanager
+def _transaction(conn: sqlite3.Connection) -> collections.abc.Iterator[None]:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    conn.execute("COMMIT")
+
+
+def _decode_reminder(row: _Row) -> models.Reminder:
+    return decoding.Reminder(
+        row[0],
+        row[1],
+        row[2],
+        _from_timestamp(row[3]),
+        row[4],
+        row[5],
+        row[6],
+        bool(row[7]),
+        row[8],
+        None if row[9] is None else _from_timestamp(row[9]),
+        row[10],
+        None if row[11] is None else _from_timestamp(row[11]),
+    )
+
+
+def _decode_dead_reminder(row: _Row) -> models.DeadReminder:
+    return decoding.DeadReminder(
+        row[0], row[1], row[2], _from_timestamp(row[3]), row[4], row[5], row[6], row[7], row[8], _from_timestamp(row[9])
+    )
+
+
+def _decode_pending_reminder(row: _Row) -> decoding.GetPendingRemindersBeforeRow:
+    return decoding.GetPendingRemindersBeforeRow(row[0], _from_timestamp(row[1]))
+
+
+class Results[T]:
+    """Awaitable and async iterable rows, like `queries.QueryResults`, which are read all at once."""
+
+    __slots__ = ("_fetch", "_iterator")
+
+    def __init__(self, fetch: collections.abc.Callable[[], collections.abc.Awaitable[list[T]]]) -> None:
+        self._fetch = fetch
+        self._iterator: collections.abc.Iterator[T] | None = None
+
+    def __await__(self) -> collections.abc.Generator[None, None, collections.abc.Sequence[T]]:
+        return self._fetch().__await__()
+
+    def __aiter__(self) -> Results[T]:
+        return self
+
+    async def __anext__(self) -> T:
+        if self._iterator is None:
+            self._iterator = iter(await self._fetch())
+
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+class SqliteQueries:
+    """The queries of `decoding.PostgresQueries`, run against an embedded SQLite database instead.
+
+    Meant for single node installs and local runs. Every statement runs on one dedicated thread, which
+    owns the connection, so writes never wait on each other's locks. Reminder events are raised by
+    triggers, like with Postgres, and passed to the listeners added through `add_listener` once the
+    statement raising them went through.
+    """
+
+    __slots__ = ("_conn", "_events", "_executor", "_listeners", "_loop", "path")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="remindme-sqlite")
+        self._conn: sqlite3.Connection | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listeners: list[EventListener] = []
+        # Only touched from the database thread
+        self._events: list[_Event] = []
+
+    @property
+    def primary(self) -> SqliteQueries:
+        return self
+
+    async def open(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        await self._loop.run_in_executor(self._executor, self._connect)
+
+    async def close(self) -> None:
+        if self._loop is not None:
+            await self._loop.run_in_executor(self._executor, self._disconnect)
+
+        self._executor.shutdown()
+
+    def add_listener(self, listener: EventListener) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: EventListener) -> None:
+        self._listeners.remove(listener)
+
+    def _connect(self) -> None:
+        conn = sqlite3.connect(self.path, isolation_level=None, timeout=BUSY_TIMEOUT)
+        conn.create_function("remindme_reminder_event", 4, self._on_event)
+        # Readers (such as a backup) never block the writes then, and NORMAL is still safe in WAL mode
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.executescript(SCHEMA_PATH.read_text())
+        self._conn = conn
+
+    def _disconnect(self) -> None:
+        if self._conn is not None:
+            self._conn.execute("PRAGMA optimize")
+            self._conn.close()
+            self._conn = None
+
+    def _on_event(self, op: str, id_: int, user_id: int, due_at: int | None) -> None:
+        self._events.append((op, id_, user_id, None if due_at is None else _from_timestamp(due_at)))
+
+    def _dispatch(self, events: list[_Event]) -> None:
+        for event in events:
+            for listener in tuple(self._listeners):
+                try:
+                    listener(*event)
+                except Exception:
+                    logger.exception("reminder event listener %r failed", listener)
+
+    def _call_in_thread[T](self, call: collections.abc.Callable[[sqlite3.Connection], T]) -> T:
+        assert self._conn is not None
+        assert self._loop is not None
+
+        try:
+            result = call(self._conn)
+        except BaseException:
+            # Whatever raised them was rolled back
+            self._events.clear()
+            raise
+
+        if self._events:
+            events, self._events = self._events, []
+            self._loop.call_soon_threadsafe(self._dispatch, events)
+
+        return result
+
+    async def _run[T](self, name: str, call: collections.abc.Callable[[sqlite3.Connection], T]) -> T:
+        if self._loop is None:
+            msg = "the database was not opened"
+            raise RuntimeError(msg)
+
+        started_at = time.perf_counter()
+        try:
+            return await self._loop.run_in_executor(self._executor, self._call_in_thread, call)
+        finally:
+            metrics.DB_QUERY_DURATION.observe(time.perf_counter() - started_at, name)
+
+    async def _fetch_one(self, name: str, sql: str, params: dict[str, object]) -> _Row | None:
+        return await self._run(name, lambda conn: conn.execute(sql, params).fetchone())
+
+    def _fetch_many[T](
+        self, name: str, sql: str, params: dict[str, object], decode: collections.abc.Callable[[_Row], T]
+    ) -> Results[T]:
+        async def fetch() -> list[T]:
+            return list(map(decode, await self._run(name, lambda conn: conn.execute(sql, params).fetchall())))
+
+        return Results(fetch)
+
+    async def _execute(self, name: str, sql: str, params: dict[str, object]) -> None:
+        await self._run(name, lambda conn: conn.execute(sql, params))
+
+    async def _execute_many(self, name: str, sql: str, params: collections.abc.Iterable[tuple[object, ...]]) -> None:
+        def call(conn: sqlite3.Connection) -> None:
+            with _transaction(conn):
+                conn.executemany(sql, params)
+
+        await self._run(name, call)
+
+    async def add_reminder_reference_message(
+        self,
+        *,
+        reference_message_id: int | None,
+        reference_channel_id: int | None,
+        reference_guild_id: int | None,
+        id_: int,
+    ) -> None:
+        await self._execute(
+            "AddReminderReferenceMessage",
+            ADD_REMINDER_REFERENCE_MESSAGE,
+            {
+                "reference_message_id": reference_message_id,
+                "reference_channel_id": reference_channel_id,
+                "reference_guild_id": reference_guild_id,
+                "id": id_,
+            },
+        )
+
+    def claim_due_reminders(
+        self, *, leased_by: str | None, lease_expires_at: datetime.datetime | None, max_count: int
+    ) -> Results[models.Reminder]:
+        return self._fetch_many(
+            "ClaimDueReminders",
+            CLAIM_DUE_REMINDERS,
+            {
+                "leased_by": leased_by,
+                "lease_expires_at": None if lease_expires_at is None else _to_timestamp(lease_expires_at),
+                "max_count": max_count,
+                "now": _to_timestamp(datetime.datetime.now(tz=datetime.UTC)),
+            },
+            _decode_reminder,
+        )
+
+    async def count_due_reminders(self) -> int | None:
+        row = await self._fetch_one(
+            "CountDueReminders", COUNT_DUE_REMINDERS, {"now": _to_timestamp(datetime.datetime.now(tz=datetime.UTC))}
+        )
+        return None if row is None else row[0]
+
+    async def create_reminder(
+        self, *, user_id: int, description: str, expire_at: datetime.datetime
+    ) -> models.Reminder | None:
+        row = await self._fetch_one(
+            "CreateReminder",
+            CREATE_REMINDER,
+            {"user_id": user_id, "description": description, "expire_at": _to_timestamp(expire_at)},
+        )
+        return None if row is None else _decode_reminder(row)
+
+    async def create_reminder_with_reference(
+        self,
+        *,
+        user_id: int,
+        description: str,
+        expire_at: datetime.datetime,
+        reference_message_id: int | None,
+        reference_channel_id: int | None,
+        reference_guild_id: int | None,
+    ) -> models.Reminder | None:
+        row = await self._fetch_one(
+            "CreateReminderWithReference",
+            CREATE_REMINDER_WITH_REFERENCE,
+            {
+                "user_id": user_id,
+                "description": description,
+                "expire_at": _to_timestamp(expire_at),
+                "reference_message_id": reference_message_id,
+                "reference_channel_id": reference_channel_id,
+                "reference_guild_id": reference_guild_id,
+            },
+        )
+        return None if row is None else _decode_reminder(row)
+
+    async def dead_letter_reminders(
+        self, *, ids: collections.abc.Sequence[int], errors: collections.abc.Sequence[str]
+    ) -> None:
+        now = _to_timestamp(datetime.datetime.now(tz=datetime.UTC))
+
+        def call(conn: sqlite3.Connection) -> None:
+            with _transaction(conn):
+                conn.executemany(
+                    DEAD_LETTER_REMINDER,
+                    ({"id": id_, "error": error, "now": now} for id_, error in zip(ids, errors, strict=True)),
+                )
+                conn.executemany(DELETE_REMINDER, ((id_,) for id_ in ids))
+
+        await self._run("DeadLetterReminders", call)
+
+    async def delete_reminder(self, *, id_: int) -> None:
+        await self._run("DeleteReminder", lambda conn: conn.execute(DELETE_REMINDER, (id_,)))
+
+    async def delete_reminders(self, *, ids: collections.abc.Sequence[int]) -> None:
+        await self._execute_many("DeleteReminders", DELETE_REMINDER, ((id_,) for id_ in ids))
+
+    def get_dead_reminders(self, *, limit: int) -> Results[models.DeadReminder]:
+        return self._fetch_many("GetDeadReminders", GET_DEAD_REMINDERS, {"limit": limit}, _decode_dead_reminder)
+
+    async def get_dm_channel_for_user(self, *, user_id: int) -> int | None:
+        row = await self._fetch_one("GetDmChannelForUser", GET_DM_CHANNEL_FOR_USER, {"user_id": user_id})
+        return None if row is None else row[0]
+
+    def get_pending_reminders_before(
+        self, *, expire_at: datetime.datetime
+    ) -> Results[decoding.GetPendingRemindersBeforeRow]:
+        return self._fetch_many(
+            "GetPendingRemindersBefore",
+            GET_PENDING_REMINDERS_BEFORE,
+            {"expire_at": _to_timestamp(expire_at)},
+            _decode_pending_reminder,
+        )
+
+    async def get_reminder(self, *, id_: int) -> models.Reminder | None:
+        row = await self._fetch_one("GetReminder", GET_REMINDER, {"id": id_})
+        return None if row is None else _decode_reminder(row)
+
+    def get_reminders_page_before(
+        self, *, user_id: int, cursor_expire_at: datetime.datetime, cursor_id: int, limit: int
+    ) -> Results[models.Reminder]:
+        return self._fetch_many(
+            "GetRemindersPageBefore",
+            GET_REMINDERS_PAGE_BEFORE,
+            {
+                "user_id": user_id,
+                "cursor_expire_at": _to_timestamp(cursor_expire_at),
+                "cursor_id": cursor_id,
+                "limit": limit,
+            },
+            _decode_reminder,
+        )
+
+    def get_reminders_page_from(
+        self, *, user_id: int, cursor_expire_at: datetime.datetime, cursor_id: int, limit: int
+    ) -> Results[models.Reminder]:
+        return self._fetch_many(
+            "GetRemindersPageFrom",
+            GET_REMINDERS_PAGE_FROM,
+            {
+                "user_id": user_id,
+                "cursor_expire_at": _to_timestamp(cursor_expire_at),
+                "cursor_id": cursor_id,
+                "limit": limit,
+            },
+            _decode_reminder,
+        )
+
+    async def maintain_reminder_partitions(
+        self,
+        *,
+        premake: datetime.timedelta,  # noqa: ARG002 - Nothing to create ahead without partitions
+        retention: datetime.timedelta,
+    ) -> None:
+        expire_at = _to_timestamp(datetime.datetime.now(tz=datetime.UTC) - retention)
+
+        def call(conn: sqlite3.Connection) -> None:
+            conn.execute(DELETE_HANDLED_REMINDERS, {"expire_at": expire_at})
+            conn.execute("PRAGMA optimize")
+
+        await self._run("MaintainReminderPartitions", call)
+
+    async def mark_reminders_as_handled(self, *, ids: collections.abc.Sequence[int]) -> None:
+        await self._execute_many("MarkRemindersAsHandled", MARK_REMINDER_AS_HANDLED, ((id_,) for id_ in ids))
+
+    async def release_reminders(
+        self,
+        *,
+        ids: collections.abc.Sequence[int],
+        lease_expires_ats: collections.abc.Sequence[datetime.datetime],
+        leased_by: str | None,
+    ) -> None:
+        await self._execute_many(
+            "ReleaseReminders",
+            RELEASE_REMINDER,
+            (
+                (id_, leased_by, _to_timestamp(lease_expires_at))
+                for id_, lease_expires_at in zip(ids, lease_expires_ats, strict=True)
+            ),
+        )
+
+    def requeue_dead_reminders(self, *, ids: collections.abc.Sequence[int]) -> Results[models.Reminder]:
+        def call(conn: sqlite3.Connection) -> list[_Row]:
+            rows: list[_Row] = []
+            with _transaction(conn):
+                for id_ in ids:
+                    rows.extend(conn.execute(REQUEUE_DEAD_REMINDER, {"id": id_}).fetchall())
+
+                conn.executemany(DELETE_DEAD_REMINDER, ((id_,) for id_ in ids))
+
+            return rows
+
+        async def fetch() -> list[models.Reminder]:
+            return list(map(_decode_reminder, await self._run("RequeueDeadReminders", call)))
+
+        return Results(fetch)
+
+    async def reschedule_reminder(self, *, expire_at: datetime.datetime, id_: int) -> models.Reminder | None:
+        row = await self._fetch_one(
+            "RescheduleReminder", RESCHEDULE_REMINDER, {"expire_at": _to_timestamp(expire_at), "id": id_}
+        )
+        return None if row is None else _decode_reminder(row)
+
+    async def retry_reminders(
+        self, *, ids: collections.abc.Sequence[int], next_attempt_ats: collections.abc.Sequence[datetime.datetime]
+    ) -> None:
+        await self._execute_many(
+            "RetryReminders",
+            RETRY_REMINDER,
+            ((_to_timestamp(next_attempt_at), id_) for id_, next_attempt_at in zip(ids, next_attempt_ats, strict=True)),
+        )
+
+    async def upsert_dm_channel(self, *, user_id: int, channel_id: int) -> None:
+        await self._execute("UpsertDmChannel", UPSERT_DM_CHANNEL, {"user_id": user_id, "channel_id": channel_id})
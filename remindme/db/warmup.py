@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+import typing
+
+from remindme.db import queries
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+    import asyncpg
+
+__all__: collections.abc.Sequence[str] = ("STATEMENTS", "prime_pool")
+
+# Every statement generated by sqlc, see `instrumentation.statement_name`
+STATEMENTS = tuple(
+    value for name, value in vars(queries).items() if name.isupper() and str(value).startswith("-- name: ")
+)
+
+
+async def _prime_connection(conn: asyncpg.pool.PoolConnectionProxy[asyncpg.Record]) -> None:
+    for statement in STATEMENTS:
+        # `prepare` does not put anything into the statement cache the queries go through
+        await conn._get_statement(statement, None)  # noqa: SLF001  # type: ignore[reportPrivateUsage]
+
+
+# Prepares every statement on each of the connections the pool opened up front, so that the first
+# use of each one does not pay for the extra round trip
+async def prime_pool(pool: asyncpg.Pool) -> None:
+    # Holding them all at once is the only way to be handed each one
+    connections = [await pool.acquire() for _ in range(pool.get_min_size())]
+    try:
+        await asyncio.gather(*(_prime_connection(conn) for conn in connections))
+    finally:
+        await asyncio.gather(*(pool.release(conn) for conn in connections))
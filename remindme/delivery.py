@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import operator
+import os
+import random
+import socket
+import time
+import typing
+
+import hikari
+
+from remindme import db
+from remindme import metrics
+from remindme.utils import components
+from remindme.utils import reminders as utils
+
+if typing.TYPE_CHECKING:
+    from remindme import dm_channels
+    from remindme.db import models
+
+logger = logging.getLogger("remindme.delivery")
+
+# If a replica does not deliver its claimed reminders in time (most likely because it crashed),
+# they will be claimed again by whichever replica gets to them first
+LEASE_DURATION = datetime.timedelta(minutes=2)
+REPLICA_ID = f"{socket.gethostname()}:{os.getpid()}"
+# Reminders are claimed before they wait in the queue. Those with less than this left of their lease
+# once a worker gets to them are not sent, since they could be claimed again while being sent and go
+# out twice. Their lease is released instead, without counting it as an attempt
+SEND_MARGIN = datetime.timedelta(seconds=30)
+# Weight of the latest send in the average time taken by one, which bounds how much is claimed at once
+SEND_TIME_WEIGHT = 0.1
+
+# Failed deliveries are retried with a jittered exponential backoff, until the reminder is moved to
+# the dead letter table for someone to look into
+MAX_DELIVERY_ATTEMPTS = 10
+RETRY_BASE_DELAY = datetime.timedelta(seconds=30)
+RETRY_MAX_DELAY = datetime.timedelta(hours=6)
+
+FLUSH_INTERVAL = 0.5
+FLUSH_BATCH_SIZE = 500
+PROGRESS_REPORT_INTERVAL = 10
+
+
+def retry_delay(attempts: int) -> datetime.timedelta:
+    # Keep at least half of the delay so that retries still back off, but spread the rest out so that
+    # reminders which failed together (such as during an outage) do not all come back at once
+    delay = min(RETRY_BASE_DELAY * 2 ** min(attempts - 1, 30), RETRY_MAX_DELAY)
+    return delay / 2 + random.random() * (delay / 2)  # noqa: S311 - Not used for anything secret
+
+
+class DrainProgress:
+    """Progress of working through a backlog of due reminders, such as after downtime."""
+
+    __slots__ = ("_last_report", "_started_at", "claimed", "total")
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.claimed = 0
+        self._started_at = self._last_report = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self._started_at
+        return self.claimed / elapsed if elapsed > 0 else 0
+
+    def advance(self, count: int) -> None:
+        self.claimed += count
+
+        now = time.monotonic()
+        if now - self._last_report < PROGRESS_REPORT_INTERVAL:
+            return
+
+        self._last_report = now
+        rate = self.rate
+        # Reminders keep becoming due while we drain, so the total is only an estimate
+        remaining = max(self.total - self.claimed, 0)
+        logger.info(
+            "draining reminder backlog: %s/%s claimed (%.0f/s, ~%.0fs remaining)",
+            self.claimed,
+            self.total,
+            rate,
+            remaining / rate if rate else 0,
+        )
+
+    def finish(self) -> None:
+        logger.info("drained reminder backlog of %s in %.0fs", self.claimed, time.monotonic() - self._started_at)
+
+
+class DeliveryPipeline:
+    """Fixed pool of workers delivering reminders from a bounded queue.
+
+    The number of workers caps how many pool connections and REST calls delivery can hold at once,
+    while the queue size caps how many reminders are claimed ahead of being sent.
+    """
+
+    __slots__ = (
+        "_dead",
+        "_dm_channel_cache",
+        "_flush_wakeup",
+        "_flusher",
+        "_handled",
+        "_has_capacity",
+        "_in_flight",
+        "_progress",
+        "_queries",
+        "_queue",
+        "_released",
+        "_rest",
+        "_retries",
+        "_send_time",
+        "_unreachable",
+        "_worker_count",
+        "_workers",
+    )
+
+    def __init__(
+        self,
+        queries: db.Queries,
+        dm_channel_cache: dm_channels.DMChannelCache,
+        rest: hikari.api.RESTClient,
+        *,
+        workers: int,
+        queue_size: int,
+    ) -> None:
+        self._queries = queries
+        self._dm_channel_cache = dm_channel_cache
+        self._rest = rest
+        self._worker_count = workers
+        self._workers: list[asyncio.Task[None]] = []
+        # Each item is one message: reminders due for the same user at the same time are sent together
+        self._queue: asyncio.Queue[list[models.Reminder]] = asyncio.Queue(maxsize=queue_size)
+        self._has_capacity = asyncio.Event()
+        self._in_flight = 0
+        self._progress: DrainProgress | None = None
+        # Average seconds taken to send a message, `None` until one was sent
+        self._send_time: float | None = None
+
+        # Outcomes are written back in bulk by the flusher instead of one statement per reminder
+        self._handled: list[int] = []
+        self._unreachable: list[int] = []
+        self._retries: list[tuple[int, datetime.datetime]] = []
+        self._dead: list[tuple[int, str]] = []
+        # With the expiry of their lease, so that only those still leased from this claim are released
+        self._released: list[tuple[int, datetime.datetime]] = []
+        self._flush_wakeup = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def progress(self) -> DrainProgress | None:
+        return self._progress
+
+    def start(self) -> None:
+        if self._workers:
+            return
+
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"delivery-worker-{i}") for i in range(self._worker_count)
+        ]
+        self._flusher = asyncio.create_task(self._flush_periodically(), name="delivery-flusher")
+
+    async def close(self) -> None:
+        tasks, self._workers = [*self._workers, self._flusher], []
+        self._flusher = None
+
+        for task in tasks:
+            if task is not None:
+                task.cancel()
+
+        await asyncio.gather(*(task for task in tasks if task is not None), return_exceptions=True)
+        await self._flush()
+
+    # Claims in pages the size of the free space in the queue, so that claimed reminders never wait on
+    # a full queue and the memory used stays the same no matter how many reminders are due. Pages are
+    # also kept to what the workers can get through before the leases run out, going by how long sends
+    # took so far
+    def _claimable(self) -> int:
+        free = self._queue.maxsize - self._queue.qsize()
+        if self._send_time is None:
+            return free
+
+        per_worker = max(1, int((LEASE_DURATION - SEND_MARGIN).total_seconds() / self._send_time))
+        return min(free, self._worker_count * per_worker - self._queue.qsize() - self._in_flight)
+
+    async def drain(self) -> None:
+        while True:
+            while (max_count := self._claimable()) <= 0:
+                self._has_capacity.clear()
+                await self._has_capacity.wait()
+
+            claimed_reminders = await self._queries.claim_due_reminders(
+                leased_by=REPLICA_ID,
+                lease_expires_at=datetime.datetime.now(tz=datetime.UTC) + LEASE_DURATION,
+                max_count=max_count,
+            )
+
+            # RETURNING does not keep the order of the sub-query, so make sure the oldest go out first
+            by_user: dict[int, list[models.Reminder]] = {}
+            for reminder in sorted(claimed_reminders, key=operator.attrgetter("expire_at")):
+                # Claimed plenty of times without an outcome ever being written back, which means whatever
+                # was delivering it died while doing so
+                if reminder.attempts > MAX_DELIVERY_ATTEMPTS:
+                    self._dead.append((reminder.id, "lease expired without the delivery finishing"))
+                    metrics.DELIVERY_OUTCOMES.inc("dead_lettered")
+                    continue
+
+                by_user.setdefault(reminder.user_id, []).append(reminder)
+
+            # There are never more groups than reminders, so this always fits
+            for user_reminders in by_user.values():
+                for group in components.group_reminders_for_message(user_reminders):
+                    self._queue.put_nowait(group)
+
+            if len(claimed_reminders) < max_count:
+                break
+
+            if self._progress is None:
+                total = await self._queries.count_due_reminders()
+                self._progress = DrainProgress(total or 0)
+
+            self._progress.advance(len(claimed_reminders))
+
+        if self._progress is not None:
+            self._progress.finish()
+            self._progress = None
+
+    async def _work(self) -> None:
+        db.statement_source.set("delivery")
+
+        while True:
+            group = await self._queue.get()
+            self._has_capacity.set()
+
+            # All reminders of a group were claimed together, so they share the same lease
+            lease_expires_at = group[0].lease_expires_at
+            now = datetime.datetime.now(tz=datetime.UTC)
+            if lease_expires_at is not None and lease_expires_at - SEND_MARGIN < now:
+                logger.warning("lease of %s reminder(s) ran out while queued, releasing them", len(group))
+                self._released.extend((reminder.id, lease_expires_at) for reminder in group)
+                metrics.DELIVERY_OUTCOMES.inc("lease_expired", amount=len(group))
+                self._queue.task_done()
+                continue
+
+            self._in_flight += 1
+            started_at = time.perf_counter()
+
+            try:
+                delivered = await utils.send_reminders(group, dm_channel_cache=self._dm_channel_cache, rest=self._rest)
+            except Exception as ex:
+                logger.exception("failed to send reminders")
+                if isinstance(ex, hikari.HTTPError):
+                    metrics.count_rest_error(ex)
+
+                self._fail(group, ex)
+            else:
+                if delivered:
+                    self._handled.extend(reminder.id for reminder in group)
+
+                    now = datetime.datetime.now(tz=datetime.UTC)
+                    for reminder in group:
+                        metrics.DELIVERY_LAG.observe((now - reminder.expire_at).total_seconds())
+                else:
+                    self._unreachable.extend(reminder.id for reminder in group)
+
+                metrics.DELIVERY_OUTCOMES.inc("delivered" if delivered else "unreachable", amount=len(group))
+            finally:
+                send_time = time.perf_counter() - started_at
+                self._send_time = (
+                    send_time
+                    if self._send_time is None
+                    else self._send_time + (send_time - self._send_time) * SEND_TIME_WEIGHT
+                )
+
+                if self._pending_outcomes >= FLUSH_BATCH_SIZE:
+                    self._flush_wakeup.set()
+
+                self._in_flight -= 1
+                self._queue.task_done()
+                # Claiming can be held up by what is in flight too
+                self._has_capacity.set()
+
+    @property
+    def _pending_outcomes(self) -> int:
+        return len(self._handled) + len(self._unreachable) + len(self._retries) + len(self._dead) + len(self._released)
+
+    def _fail(self, group: list[models.Reminder], ex: Exception) -> None:
+        now = datetime.datetime.now(tz=datetime.UTC)
+        error = repr(ex)
+
+        for reminder in group:
+            if reminder.attempts >= MAX_DELIVERY_ATTEMPTS:
+                logger.error("giving up on reminder %s after %s attempts", reminder.id, reminder.attempts)
+                self._dead.append((reminder.id, error))
+                metrics.DELIVERY_OUTCOMES.inc("dead_lettered")
+            else:
+                self._retries.append((reminder.id, now + retry_delay(reminder.attempts)))
+                metrics.DELIVERY_OUTCOMES.inc("retried")
+
+    async def _flush_periodically(self) -> None:
+        db.statement_source.set("delivery")
+
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), FLUSH_INTERVAL)
+            except TimeoutError:
+                pass
+
+            self._flush_wakeup.clear()
+            await self._flush()
+
+    async def _flush(self) -> None:
+        # Ids are only dropped once written, so a failed flush is retried by the next one. If that does
+        # not happen before the lease expires, the reminders will be delivered again
+        try:
+            if handled := self._handled[:]:
+                await self._queries.mark_reminders_as_handled(ids=handled)
+                del self._handled[: len(handled)]
+
+            if unreachable := self._unreachable[:]:
+                await self._queries.delete_reminders(ids=unreachable)
+                del self._unreachable[: len(unreachable)]
+
+            if retries := self._retries[:]:
+                await self._queries.retry_reminders(
+                    ids=[reminder_id for reminder_id, _ in retries],
+                    next_attempt_ats=[next_attempt_at for _, next_attempt_at in retries],
+                )
+                del self._retries[: len(retries)]
+
+            if released := self._released[:]:
+                await self._queries.release_reminders(
+                    ids=[reminder_id for reminder_id, _ in released],
+                    lease_expires_ats=[lease_expires_at for _, lease_expires_at in released],
+                    leased_by=REPLICA_ID,
+                )
+                del self._released[: len(released)]
+
+            if dead := self._dead[:]:
+                await self._queries.dead_letter_reminders(
+                    ids=[reminder_id for reminder_id, _ in dead], errors=[error for _, error in dead]
+                )
+                del self._dead[: len(dead)]
+        except Exception:
+            logger.exception("failed to flush delivery results")
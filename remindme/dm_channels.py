@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import time
+import typing
+
+import hikari
+
+if typing.TYPE_CHECKING:
+    from remindme import db
+
+DEFAULT_MAX_SIZE = 10_000
+# DM channels never change, this only keeps users who stopped getting reminders from lingering
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_FORBIDDEN_TTL = 60 * 60
+
+
+class DMChannelCache:
+    """LRU cache in front of the stored DM channels, also remembering users that cannot be messaged."""
+
+    __slots__ = ("_channels", "_forbidden", "_pending", "_queries", "_rest", "forbidden_ttl", "max_size", "ttl")
+
+    def __init__(
+        self,
+        queries: db.Queries,
+        rest: hikari.api.RESTClient,
+        *,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl: float = DEFAULT_TTL,
+        forbidden_ttl: float = DEFAULT_FORBIDDEN_TTL,
+    ) -> None:
+        self._queries = queries
+        self._rest = rest
+        self.max_size = max_size
+        self.ttl = ttl
+        self.forbidden_ttl = forbidden_ttl
+
+        # user id -> (channel id, monotonic expiry), least recently used first
+        self._channels: collections.OrderedDict[int, tuple[int, float]] = collections.OrderedDict()
+        # user id -> monotonic expiry, oldest first
+        self._forbidden: collections.OrderedDict[int, float] = collections.OrderedDict()
+        self._pending: dict[int, asyncio.Task[int | None]] = {}
+
+    # Returns `None` if the user cannot be messaged
+    async def resolve(self, user_id: int) -> int | None:
+        now = time.monotonic()
+
+        if (cached := self._channels.get(user_id)) is not None:
+            channel_id, expires_at = cached
+            if expires_at > now:
+                self._channels.move_to_end(user_id)
+                return channel_id
+
+            del self._channels[user_id]
+
+        if (forbidden_until := self._forbidden.get(user_id)) is not None:
+            if forbidden_until > now:
+                return None
+
+            del self._forbidden[user_id]
+
+        # Several reminders for the same user can be delivered at once, make sure only one of
+        # them looks the channel up (and creates it if needed)
+        if (task := self._pending.get(user_id)) is None:
+            task = self._pending[user_id] = asyncio.create_task(self._lookup(user_id))
+            task.add_done_callback(lambda _: self._pending.pop(user_id, None))
+
+        return await asyncio.shield(task)
+
+    def forbid(self, user_id: int) -> None:
+        # Otherwise the cached channel would keep being handed out, and messaging it would keep failing
+        self._channels.pop(user_id, None)
+        self._forbidden[user_id] = time.monotonic() + self.forbidden_ttl
+        self._forbidden.move_to_end(user_id)
+
+        while len(self._forbidden) > self.max_size:
+            self._forbidden.popitem(last=False)
+
+    async def _lookup(self, user_id: int) -> int | None:
+        channel_id = await self._queries.get_dm_channel_for_user(user_id=user_id)
+
+        if channel_id is None:
+            try:
+                dm_channel = await self._rest.create_dm_channel(user_id)
+            except hikari.ForbiddenError:
+                # The user deauthorized the app, oh well :)
+                self.forbid(user_id)
+                return None
+
+            channel_id = dm_channel.id
+            await self._queries.upsert_dm_channel(user_id=user_id, channel_id=channel_id)
+
+        self._channels[user_id] = (channel_id, time.monotonic() + self.ttl)
+        self._channels.move_to_end(user_id)
+
+        while len(self._channels) > self.max_size:
+            self._channels.popitem(last=False)
+
+        return channel_id
@@ -6,10 +6,13 @@ import hikari
 import lightbulb
 
 import remindme
+from remindme import cache
 from remindme import db
 from remindme import interaction_handlers
+from remindme import scheduling
 from remindme.utils import components
 from remindme.utils import keys
+from remindme.utils import pagination
 
 loader = remindme.Loader()
 
@@ -17,19 +20,25 @@ REMINDERS_PER_PAGE = 5
 
 
 async def _get_reminders_list(
-    ctx: lightbulb.Context | interaction_handlers.ComponentContext, queries: db.Queries, *, offset: int = 0
+    ctx: lightbulb.Context | interaction_handlers.ComponentContext,
+    reminder_cache: cache.ReminderCache,
+    *,
+    cursor: pagination.Cursor = pagination.FIRST_PAGE,
+    fresh: bool = False,
 ) -> typing.Sequence[hikari.api.ComponentBuilder] | None:
-    count = await queries.get_reminders_count_for(user_id=ctx.interaction.user.id)
-    assert count is not None
-    if count == 0:
-        return None
+    rows = await reminder_cache.get_page(ctx.interaction.user.id, cursor, limit=REMINDERS_PER_PAGE + 1, fresh=fresh)
+    page = pagination.make_page(rows, cursor, limit=REMINDERS_PER_PAGE)
 
-    reminders = await queries.get_reminders_for(
-        user_id=ctx.interaction.user.id, offset=offset, limit=REMINDERS_PER_PAGE
-    )
-    return components.make_reminder_list_component(
-        reminders, offset=offset, limit=REMINDERS_PER_PAGE, total_count=count
-    )
+    if not page.reminders:
+        # Everything on the page was deleted or delivered in the meantime. Show the page before it
+        # instead and, if there is none, start over
+        if cursor == pagination.FIRST_PAGE:
+            return None
+
+        fallback = pagination.FIRST_PAGE if cursor.before else cursor._replace(before=True)
+        return await _get_reminders_list(ctx, reminder_cache, cursor=fallback, fresh=fresh)
+
+    return components.make_reminder_list_component(page)
 
 
 @loader.command
@@ -37,8 +46,8 @@ class ListReminders(lightbulb.SlashCommand, name="listreminders", description="L
     __slots__ = ()
 
     @lightbulb.invoke
-    async def invoke(self, ctx: lightbulb.Context, queries: db.Queries) -> None:
-        list_components = await _get_reminders_list(ctx=ctx, queries=queries)
+    async def invoke(self, ctx: lightbulb.Context, reminder_cache: cache.ReminderCache) -> None:
+        list_components = await _get_reminders_list(ctx=ctx, reminder_cache=reminder_cache)
 
         if list_components:
             await ctx.respond(components=list_components, ephemeral=True)
@@ -48,44 +57,48 @@ class ListReminders(lightbulb.SlashCommand, name="listreminders", description="L
 
 @loader.component(keys.REMINDER_LIST_MOVE)
 async def list_move_callback(
-    ctx: interaction_handlers.ComponentContext, queries: db.Queries = lightbulb.di.INJECTED
+    ctx: interaction_handlers.ComponentContext, reminder_cache: cache.ReminderCache = lightbulb.di.INJECTED
 ) -> None:
-    offset = int(ctx.arguments[0])
-    list_components = await _get_reminders_list(ctx=ctx, queries=queries, offset=offset)
+    (cursor,) = ctx.arguments
+    list_components = await _get_reminders_list(ctx=ctx, reminder_cache=reminder_cache, cursor=cursor)
 
     if list_components:
         await ctx.respond(components=list_components, edit=True)
     else:
-        await ctx.respond(component=components.wrap_text("No currently active reminders"), edit=True)
+        await ctx.respond(component=components.NO_ACTIVE_REMINDERS, edit=True)
 
 
 @loader.component(keys.REMINDER_VIEW)
 async def reminder_view_callback(
-    ctx: interaction_handlers.ComponentContext, queries: db.Queries = lightbulb.di.INJECTED
+    ctx: interaction_handlers.ComponentContext, reminder_cache: cache.ReminderCache = lightbulb.di.INJECTED
 ) -> None:
-    reminder_id = int(ctx.arguments[0])
-    offset = int(ctx.arguments[1])
+    reminder_id, cursor = ctx.arguments
 
-    reminder = await queries.get_reminder(id_=reminder_id)
+    reminder = await reminder_cache.get_reminder(reminder_id)
     if not reminder:
         await ctx.respond("Reminder not found", ephemeral=True)
         return
 
-    await ctx.respond(components=components.make_reminder_view_component(reminder, offset=offset), edit=True)
+    await ctx.respond(components=components.make_reminder_view_component(reminder, cursor=cursor), edit=True)
 
 
 @loader.component(keys.REMINDER_DELETE)
 async def reminder_delete_callback(
-    ctx: interaction_handlers.ComponentContext, queries: db.Queries = lightbulb.di.INJECTED
+    ctx: interaction_handlers.ComponentContext,
+    queries: db.Queries = lightbulb.di.INJECTED,
+    scheduler: scheduling.ReminderScheduler = lightbulb.di.INJECTED,
+    reminder_cache: cache.ReminderCache = lightbulb.di.INJECTED,
 ) -> None:
-    reminder_id = int(ctx.arguments[0])
-    offset = int(ctx.arguments[1])
+    reminder_id, cursor = ctx.arguments
 
     await queries.delete_reminder(id_=reminder_id)
+    scheduler.unschedule(reminder_id)
+    reminder_cache.invalidate(ctx.interaction.user.id, (reminder_id,))
 
-    list_components = await _get_reminders_list(ctx=ctx, queries=queries, offset=offset)
+    # A replica might not have seen the delete yet
+    list_components = await _get_reminders_list(ctx=ctx, reminder_cache=reminder_cache, cursor=cursor, fresh=True)
 
     if list_components:
         await ctx.respond(components=list_components, edit=True)
     else:
-        await ctx.respond(component=components.wrap_text("No currently active reminders"), edit=True)
+        await ctx.respond(component=components.NO_ACTIVE_REMINDERS, edit=True)
@@ -3,11 +3,14 @@ from __future__ import annotations
 import lightbulb
 
 import remindme
+from remindme import cache
 from remindme import db
 from remindme import interaction_handlers
+from remindme import scheduling
 from remindme.utils import keys
 from remindme.utils import modals
 from remindme.utils import reminders as utils
+from remindme.utils import times
 
 loader = remindme.Loader()
 
@@ -23,9 +26,23 @@ class RemindMeSlashCommand(lightbulb.SlashCommand, name="remindme", description=
     public_ack = lightbulb.boolean("public_ack", "Whether to send a public acknowledgement", default=True)
 
     @lightbulb.invoke
-    async def invoke(self, ctx: lightbulb.Context, queries: db.Queries) -> None:
+    async def invoke(
+        self,
+        ctx: lightbulb.Context,
+        queries: db.Queries,
+        scheduler: scheduling.ReminderScheduler,
+        reminder_cache: cache.ReminderCache,
+        time_parser: times.TimeParser,
+    ) -> None:
         await utils.create_reminder(
-            ctx=ctx, queries=queries, description=self.description, when_str=self.when, public_ack=self.public_ack
+            ctx=ctx,
+            queries=queries,
+            scheduler=scheduler,
+            reminder_cache=reminder_cache,
+            time_parser=time_parser,
+            description=self.description,
+            when_str=self.when,
+            public_ack=self.public_ack,
         )
 
 
@@ -39,7 +56,7 @@ class RemindMeMenuSlashCommand(
     async def invoke(self, ctx: lightbulb.Context) -> None:
         await ctx.respond_with_modal(
             "Create a reminder",
-            keys.REMINDER_CREATE_MODAL_CUSTOM_ID,
+            keys.REMINDER_CREATE_MODAL.make(),
             components=modals.make_reminder_from_message_modal(""),
         )
 
@@ -54,11 +71,8 @@ class RemindMeMessageCommand(
     async def invoke(self, ctx: lightbulb.Context) -> None:
         await ctx.respond_with_modal(
             "Create a reminder",
-            keys.make_key(
-                keys.REMINDER_CREATE_FROM_MESSAGE_MODAL_CUSTOM_ID,
-                self.target.guild_id or 0,
-                self.target.channel_id,
-                self.target.id,
+            keys.REMINDER_CREATE_FROM_MESSAGE_MODAL.make(
+                self.target.guild_id or 0, self.target.channel_id, self.target.id
             ),
             components=modals.make_reminder_from_message_modal(self.target.content or ""),
         )
@@ -66,10 +80,14 @@ class RemindMeMessageCommand(
 
 @loader.component(keys.REMINDER_SNOOZE_SELECT)
 async def snooze_select_callback(
-        ctx: interaction_handlers.ComponentContext, queries: db.Queries = lightbulb.di.INJECTED
+        ctx: interaction_handlers.ComponentContext,
+        queries: db.Queries = lightbulb.di.INJECTED,
+        scheduler: scheduling.ReminderScheduler = lightbulb.di.INJECTED,
+        reminder_cache: cache.ReminderCache = lightbulb.di.INJECTED,
+        time_parser: times.TimeParser = lightbulb.di.INJECTED,
 ) -> None:
-    reminder_id = int(ctx.arguments[0])
-    reminder = await queries.get_reminder(id_=reminder_id)
+    reminder_id, group_ids = ctx.arguments
+    reminder = await reminder_cache.get_reminder(reminder_id)
 
     if reminder is None:
         await ctx.respond("This reminder has expired", ephemeral=True)
@@ -80,7 +98,7 @@ async def snooze_select_callback(
     if value == "custom":
         await ctx.respond_with_modal(
             "Choose custom snooze time",
-            custom_id=keys.make_key(keys.REMINDER_SNOOZE_CUSTOM_MODAL, reminder_id),
+            custom_id=keys.REMINDER_SNOOZE_CUSTOM_MODAL.make(reminder_id, group_ids),
             components=modals.snooze_input_custom_modal,
         )
         return
@@ -88,16 +106,28 @@ async def snooze_select_callback(
     original_message = ctx.interaction.message
 
     await utils.reschedule_reminder(
-        ctx=ctx, reminder=reminder, when_str=value, queries=queries, original_message_id=original_message.id
+        ctx=ctx,
+        reminder=reminder,
+        when_str=value,
+        queries=queries,
+        scheduler=scheduler,
+        reminder_cache=reminder_cache,
+        time_parser=time_parser,
+        original_message_id=original_message.id,
+        group_ids=group_ids,
     )
 
 
 @loader.modal(keys.REMINDER_SNOOZE_CUSTOM_MODAL)
 async def snooze_with_custom_time_callback(
-        ctx: interaction_handlers.ModalContext, queries: db.Queries = lightbulb.di.INJECTED
+        ctx: interaction_handlers.ModalContext,
+        queries: db.Queries = lightbulb.di.INJECTED,
+        scheduler: scheduling.ReminderScheduler = lightbulb.di.INJECTED,
+        reminder_cache: cache.ReminderCache = lightbulb.di.INJECTED,
+        time_parser: times.TimeParser = lightbulb.di.INJECTED,
 ) -> None:
-    reminder_id = int(ctx.arguments[0])
-    reminder = await queries.get_reminder(id_=reminder_id)
+    reminder_id, group_ids = ctx.arguments
+    reminder = await reminder_cache.get_reminder(reminder_id)
 
     if reminder is None:
         await ctx.respond("This reminder has expired", ephemeral=True)
@@ -112,24 +142,35 @@ async def snooze_with_custom_time_callback(
         when_str=ctx.values["when"],
         original_message_id=original_message.id,
         queries=queries,
+        scheduler=scheduler,
+        reminder_cache=reminder_cache,
+        time_parser=time_parser,
+        group_ids=group_ids,
     )
 
 
-@loader.modal(keys.REMINDER_CREATE_MODAL_CUSTOM_ID)
-@loader.modal(keys.REMINDER_CREATE_FROM_MESSAGE_MODAL_CUSTOM_ID)
-async def create_submit(ctx: interaction_handlers.ModalContext, queries: db.Queries = lightbulb.di.INJECTED) -> None:
+@loader.modal(keys.REMINDER_CREATE_MODAL)
+@loader.modal(keys.REMINDER_CREATE_FROM_MESSAGE_MODAL)
+async def create_submit(
+    ctx: interaction_handlers.ModalContext,
+    queries: db.Queries = lightbulb.di.INJECTED,
+    scheduler: scheduling.ReminderScheduler = lightbulb.di.INJECTED,
+    reminder_cache: cache.ReminderCache = lightbulb.di.INJECTED,
+    time_parser: times.TimeParser = lightbulb.di.INJECTED,
+) -> None:
     if len(ctx.arguments) == 0:
         reference_guild_id = None
         reference_channel_id = None
         reference_message_id = None
     else:
-        reference_guild_id = int(ctx.arguments[0])
-        reference_channel_id = int(ctx.arguments[1])
-        reference_message_id = int(ctx.arguments[2])
+        reference_guild_id, reference_channel_id, reference_message_id = ctx.arguments
 
     await utils.create_reminder(
         ctx=ctx,
         queries=queries,
+        scheduler=scheduler,
+        reminder_cache=reminder_cache,
+        time_parser=time_parser,
         description=ctx.values["description"],
         when_str=ctx.values["when"],
         public_ack=ctx.values["public_ack"].lower() == "true",
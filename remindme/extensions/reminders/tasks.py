@@ -1,51 +1,52 @@
 from __future__ import annotations
 
-import asyncio
 import datetime
 import logging
 
-import hikari  # noqa: TC002 - Needed for DI
 import lightbulb
 
 import remindme
 from remindme import db
-from remindme.utils import reminders as utils
+from remindme import delivery
+from remindme import notifications
+from remindme import scheduling
 
 logger = logging.getLogger("remindme.ext.reminders")
 loader = remindme.Loader()
 
 REMINDER_POST_EXPIRE_LIFETIME = datetime.timedelta(days=1)
+# Reminders are partitioned by day. Partitions are created this far ahead so that new reminders
+# rarely end up in the default partition
+REMINDER_PARTITION_PREMAKE = datetime.timedelta(days=7)
 
 
-@loader.task(lightbulb.uniformtrigger(5, wait_first=False), auto_start=True, max_failures=-1)
-async def check_reminders(queries: db.Queries, rest: hikari.api.RESTClient) -> None:
-    expired_reminders = await queries.get_expired_reminders()
+# The scheduler decides when to run, so the trigger itself never waits
+@loader.task(lambda _: 0, auto_start=True, max_failures=-1)
+async def check_reminders(scheduler: scheduling.ReminderScheduler, pipeline: delivery.DeliveryPipeline) -> None:
+    db.statement_source.set("task:check_reminders")
+    await scheduler.wait_for_due()
+    await pipeline.drain()
 
-    if not expired_reminders:
-        return
 
-    returned = await asyncio.gather(
-        *(utils.send_reminder(reminder=r, queries=queries, rest=rest) for r in expired_reminders),
-        return_exceptions=True,
-    )
-
-    for r in returned:
-        if isinstance(r, Exception):
-            logger.error("failed to send reminder", exc_info=r)
+# Reconnects itself and refills the scheduler every time it does
+@loader.task(lambda _: 0, auto_start=True, max_failures=-1)
+async def listen_for_reminder_events(listener: notifications.ReminderListener) -> None:
+    db.statement_source.set("task:listen_for_reminder_events")
+    await listener.run()
 
 
-@loader.task(lightbulb.uniformtrigger(10), auto_start=True, max_failures=-1)
-async def cleanup_reminders(queries: db.Queries) -> None:
-    now = datetime.datetime.now(tz=datetime.UTC)
-    handled_reminders = await queries.get_handled_reminders(expire_at=now - REMINDER_POST_EXPIRE_LIFETIME)
+# Changes (including leases expiring) are pushed by the listener, so this only needs to pull in
+# reminders entering the horizon
+@loader.task(lightbulb.uniformtrigger(minutes=30), auto_start=True, max_failures=-1)
+async def refill_scheduler(scheduler: scheduling.ReminderScheduler, queries: db.Queries) -> None:
+    db.statement_source.set("task:refill_scheduler")
+    await scheduler.refill(queries)
 
-    if not handled_reminders:
-        return
 
-    returned = await asyncio.gather(
-        *(queries.delete_reminder(id_=r.id) for r in handled_reminders), return_exceptions=True
+# Handled reminders are dropped a whole partition at a time, so retention is only accurate to the day
+@loader.task(lightbulb.uniformtrigger(hours=1, wait_first=False), auto_start=True, max_failures=-1)
+async def maintain_reminder_partitions(queries: db.Queries) -> None:
+    db.statement_source.set("task:maintain_reminder_partitions")
+    await queries.maintain_reminder_partitions(
+        premake=REMINDER_PARTITION_PREMAKE, retention=REMINDER_POST_EXPIRE_LIFETIME
     )
-
-    for r in returned:
-        if isinstance(r, Exception):
-            logger.error("failed to delete reminder", exc_info=r)
@@ -2,11 +2,18 @@ from __future__ import annotations
 
 import abc
 import asyncio
+import functools
+import inspect
+import time
 import typing
 
 import hikari
 import lightbulb
 
+from remindme import db
+from remindme import metrics
+from remindme.utils import keys
+
 InteractionT_co = typing.TypeVar("InteractionT_co", bound="InteractionProtocol", covariant=True)
 ContextT = typing.TypeVar("ContextT", bound="ContextProtocol[typing.Any]")
 HandlerT = typing.TypeVar("HandlerT", bound="BaseInteractionHandler[typing.Any, typing.Any]")
@@ -18,7 +25,11 @@ if typing.TYPE_CHECKING:
 
     class ContextProtocol(typing.Protocol[InteractionT_co]):
         def __init__(
-            self, client: lightbulb.Client, interaction: InteractionT_co, initial_response_sent: asyncio.Event
+            self,
+            client: lightbulb.Client,
+            interaction: InteractionT_co,
+            arguments: tuple[typing.Any, ...],
+            initial_response_sent: InitialResponseSent,
         ) -> None: ...
 
     class InteractionProtocol(typing.Protocol):
@@ -26,8 +37,41 @@ if typing.TYPE_CHECKING:
         def custom_id(self) -> str: ...
 
 
+class InitialResponseSent:
+    """Stands in for the `asyncio.Event` lightbulb sets once the initial response is sent.
+
+    Lightbulb only ever sets and checks it, so it resolves a future instead, which is cheaper to make
+    and to wait for.
+    """
+
+    __slots__ = ("_future", "_is_set")
+
+    def __init__(self, future: asyncio.Future[None]) -> None:
+        self._future = future
+        self._is_set = False
+
+    def is_set(self) -> bool:
+        return self._is_set
+
+    def set(self) -> None:
+        self._is_set = True
+        _resolve(self._future)
+
+
+def _resolve(future: asyncio.Future[None], *_: object) -> None:
+    # Can be cancelled along with the interaction, or resolved already by the callback being done
+    if not future.done():
+        future.set_result(None)
+
+
+class _Route(typing.NamedTuple):
+    key: keys.Key
+    callback: InteractionCallbackT[typing.Any]
+    unpack: typing.Callable[[str], tuple[typing.Any, ...]]
+
+
 class BaseInteractionHandler(typing.Generic[InteractionT_co, ContextT]):
-    __slots__ = ("_client", "_context_type", "_handlers")
+    __slots__ = ("_client", "_context_type", "_routes")
 
     _context_type_: type[ContextT] = NotImplemented
     _interaction_type_: type[InteractionT_co] = NotImplemented
@@ -42,74 +86,96 @@ class BaseInteractionHandler(typing.Generic[InteractionT_co, ContextT]):
             raise RuntimeError(msg)
 
         self._client = client
-        self._handlers: dict[str, InteractionCallbackT[ContextT]] = {}
+        # By prefix, and by name for the custom ids of messages sent before prefixes were short
+        self._routes: dict[str, _Route] = {}
 
         app = client.app
         assert isinstance(app, hikari.InteractionServerAware)
         app.interaction_server.set_listener(self._interaction_type_, self._handle_interaction, replace=True)  # type: ignore[reportCallIssue]
 
     async def _handle_interaction(self, interaction: InteractionProtocol) -> typing.AsyncGenerator[None]:
-        callback = self._handlers.get(interaction.custom_id.split(":")[0])
+        started_at = time.perf_counter()
+        prefix, _, packed = interaction.custom_id.partition(keys.SEPARATOR)
+        route = self._routes.get(prefix)
 
-        if not callback:
+        if not route:
             msg = f"No callback found for id: {interaction.custom_id}"
             raise RuntimeError(msg)
 
-        ctx = self._context_type_(self._client, interaction, (ir := asyncio.Event()))
-        callback_task = asyncio.create_task(self._handle_with_context(ctx, callback))
-        event_wait_task = asyncio.create_task(ir.wait())
-        tasks = (event_wait_task, callback_task)
+        # Metrics keep being labelled with the names, which they were before prefixes were short
+        name = route.key.name
+        responded = asyncio.get_running_loop().create_future()
+        ctx = self._context_type_(self._client, interaction, route.unpack(packed), InitialResponseSent(responded))
+        task = asyncio.create_task(self._handle_with_context(ctx, route.callback, name))
+        # Stops waiting as well if the callback is done without having responded
+        task.add_done_callback(functools.partial(_resolve, responded))
 
-        finished, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        await responded
+        metrics.INTERACTION_RESPONSE_TIME.observe(time.perf_counter() - started_at, name)
 
         yield None
 
-        if callback_task not in finished:
-            await callback_task
-
-        for task in tasks:
-            if task.done():
-                continue
-
-            task.cancel()
+        try:
+            await task
+        finally:
+            metrics.INTERACTION_DURATION.observe(time.perf_counter() - started_at, name)
 
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+    async def _handle_with_context(self, ctx: ContextT, callback: InteractionCallbackT[ContextT], name: str) -> None:
+        db.statement_source.set(f"interaction:{name}")
 
-    async def _handle_with_context(self, ctx: ContextT, callback: InteractionCallbackT[ContextT]) -> None:
-        async with self._client.di.enter_context(lightbulb.di.Contexts.DEFAULT):
+        try:
             await callback(ctx)
+        except hikari.HTTPError as ex:
+            metrics.count_rest_error(ex)
+            raise
 
-    def add(self, common_prefix: str, callback: InteractionCallbackT[ContextT]) -> None:
-        if common_prefix in self._handlers:
-            msg = f"common prefix '{common_prefix}' already registered"
-            raise ValueError(msg)
+    def add(self, key: keys.Key, callback: InteractionCallbackT[ContextT]) -> None:
+        for prefix in (key.prefix, key.name):
+            if prefix in self._routes:
+                msg = f"prefix '{prefix}' already registered"
+                raise ValueError(msg)
 
-        self._handlers[common_prefix] = callback
+        self._routes[key.prefix] = _Route(key, callback, key.unpack)
+        self._routes[key.name] = _Route(key, callback, key.unpack_legacy)
 
-    def remove(self, common_prefix: str) -> None:
-        self._handlers.pop(common_prefix, None)
+    def remove(self, key: keys.Key) -> None:
+        self._routes.pop(key.prefix, None)
+        self._routes.pop(key.name, None)
 
 
 class BaseLoadable(lightbulb.Loadable, typing.Generic[HandlerT], abc.ABC):
-    __slots__ = ("_callback", "_common_prefix")
+    __slots__ = ("_callback", "_key")
 
     _handler_contextvar_: contextvars.ContextVar[HandlerT] = NotImplemented
 
-    def __init__(self, common_prefix: str, callback: InteractionCallbackT[typing.Any]) -> None:
+    def __init__(self, key: keys.Key, callback: InteractionCallbackT[typing.Any]) -> None:
         if self._handler_contextvar_ is NotImplemented:
             msg = "'_handler_contextvar_' has not been set"
             raise RuntimeError(msg)
 
-        self._common_prefix = common_prefix
+        self._key = key
         self._callback = callback
 
-    async def load(self, client: lightbulb.Client) -> None:  # noqa: ARG002
+    async def load(self, client: lightbulb.Client) -> None:
         current_handler = self._handler_contextvar_.get()
-        current_handler.add(self._common_prefix, lightbulb.di.with_di(self._callback))
+        current_handler.add(self._key, await _inject(client, self._callback))
 
     async def unload(self, client: lightbulb.Client) -> None:  # noqa: ARG002
         current_handler = self._handler_contextvar_.get()
-        current_handler.remove(self._common_prefix)
+        current_handler.remove(self._key)
+
+
+# Everything callbacks depend on is registered as a value of the default context when starting up, so it
+# is resolved once here instead of entering the context on every interaction
+async def _inject(
+    client: lightbulb.Client, callback: InteractionCallbackT[typing.Any]
+) -> InteractionCallbackT[typing.Any]:
+    annotations = typing.get_type_hints(callback)
+    dependencies: dict[str, typing.Any] = {}
+
+    async with client.di.enter_context(lightbulb.di.Contexts.DEFAULT) as container:
+        for name, parameter in inspect.signature(callback).parameters.items():
+            if parameter.default is lightbulb.di.INJECTED:
+                dependencies[name] = await container.get(annotations[name])
+
+    return functools.partial(callback, **dependencies)
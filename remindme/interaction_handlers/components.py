@@ -8,10 +8,6 @@ import lightbulb
 
 from remindme.interaction_handlers import base
 
-if typing.TYPE_CHECKING:
-    import asyncio
-
-
 handler: contextvars.ContextVar[ComponentHandler] = contextvars.ContextVar("component_handler")
 
 
@@ -19,13 +15,18 @@ class ComponentContext(lightbulb.components.MessageResponseMixinWithEdit[hikari.
     __slots__ = ("_interaction", "arguments", "client")
 
     def __init__(
-        self, client: lightbulb.Client, interaction: hikari.ComponentInteraction, initial_response_sent: asyncio.Event
+        self,
+        client: lightbulb.Client,
+        interaction: hikari.ComponentInteraction,
+        arguments: tuple[typing.Any, ...],
+        initial_response_sent: base.InitialResponseSent,
     ) -> None:
-        super().__init__(initial_response_sent)
+        super().__init__(initial_response_sent)  # type: ignore[reportArgumentType]
 
         self.client = client
         self._interaction = interaction
-        self.arguments = interaction.custom_id.split(":")[1:]
+        # Unpacked as declared by the key the callback was registered with
+        self.arguments = arguments
 
     @property
     def interaction(self) -> hikari.ComponentInteraction:
@@ -8,10 +8,6 @@ import lightbulb
 
 from remindme.interaction_handlers import base
 
-if typing.TYPE_CHECKING:
-    import asyncio
-
-
 handler: contextvars.ContextVar[ModalHandler] = contextvars.ContextVar("modal_handler")
 
 
@@ -19,13 +15,18 @@ class ModalContext(lightbulb.components.MessageResponseMixinWithEdit[hikari.Moda
     __slots__ = ("_interaction", "arguments", "client", "values")
 
     def __init__(
-        self, client: lightbulb.Client, interaction: hikari.ModalInteraction, initial_response_sent: asyncio.Event
+        self,
+        client: lightbulb.Client,
+        interaction: hikari.ModalInteraction,
+        arguments: tuple[typing.Any, ...],
+        initial_response_sent: base.InitialResponseSent,
     ) -> None:
-        super().__init__(initial_response_sent)
+        super().__init__(initial_response_sent)  # type: ignore[reportArgumentType]
 
         self.client = client
         self._interaction = interaction
-        self.arguments = interaction.custom_id.split(":")[1:]
+        # Unpacked as declared by the key the callback was registered with
+        self.arguments = arguments
 
         self.values: dict[str, str] = {}
         for row in interaction.components:
@@ -7,6 +7,8 @@ import lightbulb
 from remindme import interaction_handlers
 
 if typing.TYPE_CHECKING:
+    from remindme.utils import keys
+
     ContextT = typing.TypeVar("ContextT")
     InteractionCallbackT = typing.Callable[
         typing.Concatenate[ContextT, ...], typing.Coroutine[typing.Any, typing.Any, None]
@@ -15,7 +17,7 @@ if typing.TYPE_CHECKING:
 
 class Loader(lightbulb.Loader):
     def component(
-        self, custom_id: str
+        self, key: keys.Key
     ) -> typing.Callable[
         [InteractionCallbackT[interaction_handlers.ComponentContext]],
         InteractionCallbackT[interaction_handlers.ComponentContext],
@@ -23,13 +25,13 @@ class Loader(lightbulb.Loader):
         def _inner(
             func: InteractionCallbackT[interaction_handlers.ComponentContext],
         ) -> InteractionCallbackT[interaction_handlers.ComponentContext]:
-            self.add(interaction_handlers.ComponentLoadable(custom_id, func))
+            self.add(interaction_handlers.ComponentLoadable(key, func))
             return func
 
         return _inner
 
     def modal(
-        self, custom_id: str
+        self, key: keys.Key
     ) -> typing.Callable[
         [InteractionCallbackT[interaction_handlers.ModalContext]],
         InteractionCallbackT[interaction_handlers.ModalContext],
@@ -37,7 +39,7 @@ class Loader(lightbulb.Loader):
         def _inner(
             func: InteractionCallbackT[interaction_handlers.ModalContext],
         ) -> InteractionCallbackT[interaction_handlers.ModalContext]:
-            self.add(interaction_handlers.ModalLoadable(custom_id, func))
+            self.add(interaction_handlers.ModalLoadable(key, func))
             return func
 
         return _inner
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import typing
+
+import aiohttp.web
+import hikari
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+
+    pairs = (f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values, strict=True))
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    __slots__ = ("description", "label_names", "name")
+
+    _type_: typing.ClassVar[str]
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...]) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+
+    def _check_labels(self, label_values: tuple[str, ...]) -> None:
+        if len(label_values) != len(self.label_names):
+            msg = f"{self.name} expects labels {self.label_names}, got {label_values}"
+            raise ValueError(msg)
+
+    def _samples(self) -> collections.abc.Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> collections.abc.Iterator[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} {self._type_}"
+        yield from self._samples()
+
+
+class Counter(_Metric):
+    __slots__ = ("_values",)
+
+    _type_ = "counter"
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...]) -> None:
+        super().__init__(name, description, label_names)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        if label_values not in self._values:
+            self._check_labels(label_values)
+
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def _samples(self) -> collections.abc.Iterator[str]:
+        for label_values, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    __slots__ = ("_functions", "_values")
+
+    _type_ = "gauge"
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...]) -> None:
+        super().__init__(name, description, label_names)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._functions: dict[tuple[str, ...], collections.abc.Callable[[], float]] = {}
+
+    def set(self, value: float, *label_values: str) -> None:
+        self._check_labels(label_values)
+        self._values[label_values] = value
+
+    # For values which are cheaper to read when scraped than to keep updated
+    def set_function(self, function: collections.abc.Callable[[], float], *label_values: str) -> None:
+        self._check_labels(label_values)
+        self._functions[label_values] = function
+
+    def _samples(self) -> collections.abc.Iterator[str]:
+        values = self._values | {label_values: function() for label_values, function in self._functions.items()}
+
+        for label_values, value in values.items():
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    __slots__ = ("_buckets", "_counts", "_sums")
+
+    _type_ = "histogram"
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...], buckets: tuple[float, ...]) -> None:
+        super().__init__(name, description, label_names)
+        self._buckets = (*sorted(buckets), math.inf)
+        # Counts are kept per bucket and only added up when rendering, so observing stays O(log n)
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        if (counts := self._counts.get(label_values)) is None:
+            self._check_labels(label_values)
+            counts = self._counts[label_values] = [0] * len(self._buckets)
+            self._sums[label_values] = 0
+
+        counts[bisect.bisect_left(self._buckets, value)] += 1
+        self._sums[label_values] += value
+
+    def _samples(self) -> collections.abc.Iterator[str]:
+        bucket_label_names = (*self.label_names, "le")
+
+        for label_values, counts in self._counts.items():
+            total = 0
+            for bound, count in zip(self._buckets, counts, strict=True):
+                total += count
+                labels = _format_labels(bucket_label_names, (*label_values, _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {total}"
+
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(self._sums[label_values])}"
+            yield f"{self.name}_count{labels} {total}"
+
+
+class Registry:
+    __slots__ = ("_metrics",)
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register[MetricT: _Metric](self, metric: MetricT) -> MetricT:
+        if metric.name in self._metrics:
+            msg = f"metric '{metric.name}' already registered"
+            raise ValueError(msg)
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, *, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, description, labels))
+
+    def gauge(self, name: str, description: str, *, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, description, labels))
+
+    def histogram(
+        self, name: str, description: str, *, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, description, labels, buckets))
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics.values() for line in metric.render()) + "\n"
+
+
+registry = Registry()
+
+INTERACTION_RESPONSE_TIME = registry.histogram(
+    "remindme_interaction_response_seconds",
+    "Time from receiving a component or modal interaction to sending its initial response",
+    labels=("prefix",),
+)
+INTERACTION_DURATION = registry.histogram(
+    "remindme_interaction_duration_seconds",
+    "Time from receiving a component or modal interaction until its callback finished",
+    labels=("prefix",),
+)
+DELIVERY_LAG = registry.histogram(
+    "remindme_delivery_lag_seconds",
+    "Time between a reminder expiring and it being sent",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600),
+)
+DELIVERY_OUTCOMES = registry.counter(
+    "remindme_delivery_outcomes_total", "Delivered reminders by outcome", labels=("outcome",)
+)
+REST_ERRORS = registry.counter("remindme_rest_errors_total", "Failed Discord REST requests", labels=("status",))
+REST_RATE_LIMITS = registry.counter(
+    "remindme_rest_rate_limits_total", "Discord REST requests which were rate limited and retried"
+)
+DB_POOL_CONNECTIONS = registry.gauge(
+    "remindme_db_pool_connections", "Connections in the database pool", labels=("state",)
+)
+DB_POOL_ACQUIRE_WAIT = registry.histogram(
+    "remindme_db_pool_acquire_wait_seconds", "Time spent waiting for a pool connection", labels=("query",)
+)
+DB_QUERY_DURATION = registry.histogram(
+    "remindme_db_query_duration_seconds", "Time spent running a statement, by sqlc query name", labels=("query",)
+)
+DB_QUERY_ROWS = registry.counter(
+    "remindme_db_query_rows_total", "Rows returned or affected by statements", labels=("query",)
+)
+CACHE_REQUESTS = registry.counter("remindme_cache_requests_total", "Reminder cache lookups", labels=("kind", "result"))
+CACHE_ENTRIES = registry.gauge("remindme_cache_entries", "Reminders and pages held by the reminder cache")
+DELIVERY_QUEUE_DEPTH = registry.gauge(
+    "remindme_delivery_queue_depth", "Messages waiting in the delivery queue for a worker"
+)
+DELIVERY_IN_FLIGHT = registry.gauge("remindme_delivery_in_flight", "Messages currently being delivered")
+SCHEDULED_REMINDERS = registry.gauge("remindme_scheduled_reminders", "Reminders tracked by the in-process scheduler")
+TIME_PARSES = registry.counter(
+    "remindme_time_parses_total", "Reminder times parsed, by how they were handled", labels=("result",)
+)
+
+
+def count_rest_error(ex: hikari.HTTPError) -> None:
+    REST_ERRORS.inc(str(int(ex.status)) if isinstance(ex, hikari.HTTPResponseError) else "connection")
+
+
+class _RateLimitCounter(logging.Handler):
+    # hikari retries rate limited requests internally and the only trace it leaves behind are the
+    # warnings it logs, which all start the same way
+    def emit(self, record: logging.LogRecord) -> None:
+        if isinstance(record.msg, str) and record.msg.startswith("rate limited"):
+            REST_RATE_LIMITS.inc()
+
+
+def count_rate_limits() -> None:
+    logging.getLogger("hikari.rest").addHandler(_RateLimitCounter(logging.WARNING))
+
+
+class MetricsServer:
+    """Serves the registry in the Prometheus text format, along with a readiness route.
+
+    This runs on its own port rather than next to the interaction endpoint, which has to be reachable
+    by Discord and so is usually public. `/ready` only succeeds once `ready` is set.
+    """
+
+    __slots__ = ("_registry", "_runner", "host", "port", "ready")
+
+    def __init__(self, registry: Registry, *, host: str | None, port: int) -> None:
+        self._registry = registry
+        self._runner: aiohttp.web.AppRunner | None = None
+        self.host = host
+        self.port = port
+        self.ready = False
+
+    async def start(self) -> None:
+        app = aiohttp.web.Application()
+        app.add_routes([aiohttp.web.get("/metrics", self._handle), aiohttp.web.get("/ready", self._handle_ready)])
+
+        self._runner = aiohttp.web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await aiohttp.web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, _: aiohttp.web.Request) -> aiohttp.web.Response:
+        return aiohttp.web.Response(body=self._registry.render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+    async def _handle_ready(self, _: aiohttp.web.Request) -> aiohttp.web.Response:
+        if not self.ready:
+            return aiohttp.web.Response(status=503, text="warming up")
+
+        return aiohttp.web.Response(text="ready")
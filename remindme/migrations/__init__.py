@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import pkgutil
+import re
+import typing
+
+if typing.TYPE_CHECKING:
+    import types
+
+    import asyncpg
+
+    # Migrations are applied with a connection of the bot's pool, or their own one from the admin CLI
+    Connection = asyncpg.Connection[asyncpg.Record] | asyncpg.pool.PoolConnectionProxy[asyncpg.Record]
+
+logger = logging.getLogger("remindme.migrations")
+
+# Versions are modules named `vNNNN_description`, defining `async def apply(conn)`. Those which set
+# `TRANSACTIONAL = False` (to build indexes concurrently) must be safe to run again after failing halfway
+_VERSION_MODULE_PATTERN = re.compile(r"^v(?P<version>\d{4})_(?P<name>\w+)$")
+_LOCK_ID = 7_215_630_412_876_143
+_LOCK_RETRY_INTERVAL = 1
+
+
+class Migration(typing.NamedTuple):
+    version: int
+    name: str
+    module: types.ModuleType
+
+    @property
+    def transactional(self) -> bool:
+        return getattr(self.module, "TRANSACTIONAL", True)
+
+
+def load_migrations() -> list[Migration]:
+    migrations: list[Migration] = []
+
+    for module_info in pkgutil.iter_modules(__path__):
+        if not (match := _VERSION_MODULE_PATTERN.match(module_info.name)):
+            continue
+
+        module = importlib.import_module(f"{__name__}.{module_info.name}")
+        migrations.append(Migration(int(match.group("version")), match.group("name"), module))
+
+    migrations.sort()
+    return migrations
+
+
+async def _acquire_lock(conn: Connection) -> None:
+    # Several replicas might start at the same time. Polling instead of blocking on `pg_advisory_lock`
+    # matters here: a waiting statement holds a snapshot, which concurrent index builds would wait on
+    while True:
+        if await conn.fetchval("SELECT pg_try_advisory_lock($1)", _LOCK_ID):
+            return
+
+        await asyncio.sleep(_LOCK_RETRY_INTERVAL)
+
+
+async def migrate(conn: Connection) -> list[Migration]:
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations
+        (
+            version    INTEGER                                NOT NULL PRIMARY KEY,
+            name       TEXT                                   NOT NULL,
+            applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+        )
+        """
+    )
+
+    await _acquire_lock(conn)
+    try:
+        applied_versions = {row[0] for row in await conn.fetch("SELECT version FROM schema_migrations")}
+        pending = [migration for migration in load_migrations() if migration.version not in applied_versions]
+
+        for migration in pending:
+            logger.info("applying migration %04d_%s", migration.version, migration.name)
+
+            if migration.transactional:
+                async with conn.transaction():
+                    await migration.module.apply(conn)
+                    await _record(conn, migration)
+            else:
+                await migration.module.apply(conn)
+                await _record(conn, migration)
+
+        return pending
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", _LOCK_ID)
+
+
+async def _record(conn: Connection, migration: Migration) -> None:
+    await conn.execute(
+        "INSERT INTO schema_migrations (version, name) VALUES ($1, $2)", migration.version, migration.name
+    )
+
+
+async def _build_index_concurrently(conn: Connection, name: str, table: str, definition: str) -> None:
+    valid = await conn.fetchval("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)", name)
+    if valid:
+        return
+
+    # Left behind invalid by a build which failed or was interrupted
+    if valid is not None:
+        await conn.execute(f"DROP INDEX CONCURRENTLY {name}")
+
+    await conn.execute(f"CREATE INDEX CONCURRENTLY {name} ON {table} {definition}")
+
+
+# Partitioned tables do not support `CREATE INDEX CONCURRENTLY`. Instead, the index is created on the parent
+# only (which is instant, as it starts out invalid and empty), then built concurrently on every partition
+# and attached. The parent index becomes valid once all partitions are attached
+async def create_index_concurrently(conn: Connection, name: str, table: str, definition: str) -> None:
+    if await conn.fetchval("SELECT relkind::TEXT FROM pg_class WHERE oid = $1::TEXT::REGCLASS", table) != "p":
+        await _build_index_concurrently(conn, name, table, definition)
+        return
+
+    await conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {table} {definition}")
+
+    partitions = await conn.fetch(
+        """
+        SELECT c.relname
+        FROM pg_inherits i
+                 JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = $1::TEXT::REGCLASS
+        """,
+        table,
+    )
+    for (partition,) in partitions:
+        # Partitions created in the meantime get their index when they are attached
+        attached = await conn.fetchval(
+            """
+            SELECT EXISTS (SELECT
+                           FROM pg_inherits i
+                                    JOIN pg_index x ON x.indexrelid = i.inhrelid
+                           WHERE i.inhparent = $1::TEXT::REGCLASS
+                             AND x.indrelid = $2::TEXT::REGCLASS)
+            """,
+            name,
+            partition,
+        )
+        if attached:
+            continue
+
+        partition_index = f"{partition}_{name}"
+        await _build_index_concurrently(conn, partition_index, partition, definition)
+        await conn.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}")
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import pathlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from remindme import migrations
+
+SCHEMA_PATH = pathlib.Path(__file__).parents[2] / "db" / "schema.sql"
+
+
+# `db/schema.sql` was applied by hand before migrations existed. It only ever creates what is missing,
+# so it is fine to run against those databases too
+async def apply(conn: migrations.Connection) -> None:
+    await conn.execute(SCHEMA_PATH.read_text())
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from remindme import migrations
+
+
+# Promotes the existing unique index, so nothing needs to be built while the table is locked
+async def apply(conn: migrations.Connection) -> None:
+    has_primary_key = await conn.fetchval(
+        "SELECT EXISTS (SELECT FROM pg_constraint WHERE conrelid = 'dm_channels'::REGCLASS AND contype = 'p')"
+    )
+    if not has_primary_key:
+        await conn.execute(
+            "ALTER TABLE dm_channels ADD CONSTRAINT dm_channels_pkey PRIMARY KEY USING INDEX idx_dm_channels_user_id"
+        )
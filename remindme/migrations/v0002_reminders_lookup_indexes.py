@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from remindme import migrations
+
+TRANSACTIONAL = False
+
+
+async def apply(conn: migrations.Connection) -> None:
+    # Every statement working on single reminders (getting, claiming, marking as handled, rescheduling
+    # and deleting) looks them up by id. It cannot be unique, as that would need to include `expire_at`
+    await migrations.create_index_concurrently(conn, "idx_reminders_id", "reminders", "(id)")
+    # Keyset pages of /listreminders
+    await migrations.create_index_concurrently(
+        conn, "idx_reminders_user_id_expire_at", "reminders", "(user_id, expire_at, id) WHERE handled = FALSE"
+    )
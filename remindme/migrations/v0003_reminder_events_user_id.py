@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from remindme import migrations
+
+
+# Adds the owner of the reminder to every event, so that caches can drop what they hold for them
+async def apply(conn: migrations.Connection) -> None:
+    await conn.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_reminder_event() RETURNS TRIGGER AS
+        $$
+        BEGIN
+            IF current_setting('remindme.moving_reminders', TRUE) = 'on' THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP = 'DELETE' THEN
+                IF NOT OLD.handled THEN
+                    PERFORM pg_notify('reminder_events',
+                                      json_build_object('op', TG_OP, 'id', OLD.id, 'user_id', OLD.user_id)::TEXT);
+                END IF;
+            ELSE
+                PERFORM pg_notify('reminder_events',
+                                  json_build_object('op', TG_OP, 'id', NEW.id, 'user_id', NEW.user_id, 'expire_at',
+                                                    CASE
+                                                        WHEN NEW.handled THEN NULL
+                                                        ELSE GREATEST(NEW.expire_at, NEW.lease_expires_at,
+                                                                      NEW.next_attempt_at)
+                                                        END)::TEXT);
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
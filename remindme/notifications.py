@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import datetime  # noqa: TC003 - Needed for msgspec
+import logging
+import typing
+
+import asyncpg
+import msgspec
+
+if typing.TYPE_CHECKING:
+    from remindme import cache
+    from remindme import config as configuration
+    from remindme import db
+    from remindme import scheduling
+
+logger = logging.getLogger("remindme.notifications")
+
+# Must match the channel used by `notify_reminder_event` in `db/schema.sql`
+CHANNEL = "reminder_events"
+
+HEALTH_CHECK_INTERVAL = 30
+HEALTH_CHECK_TIMEOUT = 5
+MAX_RECONNECT_DELAY = 60
+
+
+class ReminderEvent(msgspec.Struct):
+    op: typing.Literal["INSERT", "UPDATE", "DELETE"]
+    id: int
+    # Missing from events sent before the 0003 migration
+    user_id: int | None = None
+    # Unset when the reminder is not pending anymore (deleted or handled)
+    expire_at: datetime.datetime | None = None
+
+
+class ReminderListener:
+    """Dedicated connection listening for reminder changes made by any replica."""
+
+    __slots__ = ("_config", "_conn", "_decoder", "_queries", "_reminder_cache", "_scheduler")
+
+    def __init__(
+        self,
+        config: configuration.DatabaseConfig,
+        scheduler: scheduling.ReminderScheduler,
+        queries: db.Queries,
+        reminder_cache: cache.ReminderCache,
+    ) -> None:
+        self._config = config
+        self._scheduler = scheduler
+        self._queries = queries
+        self._reminder_cache = reminder_cache
+        self._decoder = msgspec.json.Decoder(ReminderEvent)
+        self._conn: asyncpg.Connection[asyncpg.Record] | None = None
+
+    async def run(self) -> None:
+        delay = 1
+
+        while True:
+            try:
+                self._conn = await asyncpg.connect(
+                    host=self._config.host,
+                    port=self._config.port,
+                    database=self._config.database,
+                    user=self._config.username,
+                    password=self._config.password,
+                )
+            except (OSError, asyncpg.PostgresError) as ex:
+                logger.warning("failed to connect listener, retrying in %ss", delay, exc_info=ex)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                continue
+
+            delay = 1
+            try:
+                await self._listen(self._conn)
+            finally:
+                await self.close()
+
+    async def close(self) -> None:
+        if self._conn is None:
+            return
+
+        conn, self._conn = self._conn, None
+        if not conn.is_closed():
+            await conn.close(timeout=HEALTH_CHECK_TIMEOUT)
+
+    async def _listen(self, conn: asyncpg.Connection[asyncpg.Record]) -> None:
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda _: lost.set())
+        await conn.add_listener(CHANNEL, self._on_notification)
+
+        # We might have missed events while disconnected, so catch up now that new ones are
+        # guaranteed to reach us
+        await self._scheduler.refill(self._queries)
+        self._reminder_cache.clear()
+        logger.info("listening for reminder events")
+
+        while not lost.is_set():
+            try:
+                await asyncio.wait_for(lost.wait(), HEALTH_CHECK_INTERVAL)
+            except TimeoutError:
+                pass
+            else:
+                break
+
+            # An idle connection can die silently, make sure it is still usable
+            try:
+                await conn.execute("SELECT 1", timeout=HEALTH_CHECK_TIMEOUT)
+            except (OSError, TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                break
+
+        logger.warning("lost listener connection")
+
+    def _on_notification(self, _conn: object, _pid: int, _channel: str, payload: object) -> None:
+        assert isinstance(payload, str)
+
+        try:
+            event = self._decoder.decode(payload)
+        except msgspec.DecodeError:
+            logger.exception("received malformed reminder event: %r", payload)
+            return
+
+        self._apply(event)
+
+    def _apply(self, event: ReminderEvent) -> None:
+        self._reminder_cache.invalidate(event.user_id, (event.id,))
+
+        if event.expire_at is None:
+            self._scheduler.unschedule(event.id)
+        else:
+            self._scheduler.schedule(event.id, event.expire_at)
+
+
+class LocalReminderListener(ReminderListener):
+    """Listener for the SQLite backend, whose events are raised in process and can never be missed."""
+
+    __slots__ = ("_storage",)
+
+    def __init__(
+        self,
+        config: configuration.DatabaseConfig,
+        scheduler: scheduling.ReminderScheduler,
+        storage: db.SqliteQueries,
+        reminder_cache: cache.ReminderCache,
+    ) -> None:
+        super().__init__(config, scheduler, storage, reminder_cache)  # type: ignore[arg-type]
+        self._storage = storage
+
+    async def run(self) -> None:
+        self._storage.add_listener(self._on_event)
+        try:
+            # Only changes made while not running yet were missed
+            await self._scheduler.refill(self._queries)
+            self._reminder_cache.clear()
+            logger.info("listening for reminder events")
+
+            await asyncio.Event().wait()
+        finally:
+            self._storage.remove_listener(self._on_event)
+
+    async def close(self) -> None:
+        pass
+
+    def _on_event(self, op: str, id_: int, user_id: int, due_at: datetime.datetime | None) -> None:
+        self._apply(ReminderEvent(op, id_, user_id, due_at))  # type: ignore[arg-type]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import heapq
+import typing
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+    from remindme import db
+
+DEFAULT_HORIZON = datetime.timedelta(hours=1)
+
+
+class ReminderScheduler:
+    """In-process timer keeping track of the reminders due within a rolling horizon.
+
+    The database is still the source of truth. The scheduler only knows *when* something is
+    due so that the delivery task can sleep until exactly that moment instead of polling.
+    Anything further away than the horizon is left for a later reconciliation scan.
+    """
+
+    __slots__ = ("_entries", "_heap", "_wakeup", "horizon")
+
+    def __init__(self, *, horizon: datetime.timedelta = DEFAULT_HORIZON) -> None:
+        self.horizon = horizon
+
+        # Removals are lazy: `_entries` holds the live expire time for each reminder and any
+        # heap item which does not match it anymore is discarded when it reaches the top
+        self._heap: list[tuple[datetime.datetime, int]] = []
+        self._entries: dict[int, datetime.datetime] = {}
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def next_due(self) -> datetime.datetime | None:
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def schedule(self, reminder_id: int, expire_at: datetime.datetime) -> None:
+        if expire_at > datetime.datetime.now(tz=datetime.UTC) + self.horizon:
+            self.unschedule(reminder_id)
+            return
+
+        if self._entries.get(reminder_id) == expire_at:
+            return
+
+        self._entries[reminder_id] = expire_at
+        heapq.heappush(self._heap, (expire_at, reminder_id))
+
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+
+        if self._heap[0] == (expire_at, reminder_id):
+            self._wakeup.set()
+
+    def unschedule(self, reminder_id: int) -> None:
+        self._entries.pop(reminder_id, None)
+
+    def reconcile(self, reminders: collections.abc.Iterable[tuple[int, datetime.datetime]]) -> None:
+        # Merge instead of replacing, as a reminder might have been scheduled while the scan was running.
+        # Stale entries are harmless, they only cause an extra delivery pass
+        for reminder_id, expire_at in reminders:
+            self.schedule(reminder_id, expire_at)
+
+    async def refill(self, queries: db.Queries) -> None:
+        now = datetime.datetime.now(tz=datetime.UTC)
+        pending = await queries.get_pending_reminders_before(expire_at=now + self.horizon)
+
+        self.reconcile((r.id, r.due_at) for r in pending)
+
+    async def wait_for_due(self) -> list[int]:
+        while True:
+            self._prune()
+
+            timeout: float | None = None
+            if self._heap:
+                timeout = (self._heap[0][0] - datetime.datetime.now(tz=datetime.UTC)).total_seconds()
+
+                if timeout <= 0:
+                    return self._pop_due()
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    def _pop_due(self) -> list[int]:
+        now = datetime.datetime.now(tz=datetime.UTC)
+        due: list[int] = []
+
+        while self._heap and self._heap[0][0] <= now:
+            expire_at, reminder_id = heapq.heappop(self._heap)
+
+            if self._entries.get(reminder_id) == expire_at:
+                del self._entries[reminder_id]
+                due.append(reminder_id)
+
+        return due
+
+    def _prune(self) -> None:
+        while self._heap:
+            expire_at, reminder_id = self._heap[0]
+
+            if self._entries.get(reminder_id) == expire_at:
+                return
+
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        self._heap = [(expire_at, reminder_id) for reminder_id, expire_at in self._entries.items()]
+        heapq.heapify(self._heap)
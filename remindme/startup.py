@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+    import importlib.abc
+    import importlib.machinery
+    import types
+
+__all__: collections.abc.Sequence[str] = (
+    "ENVIRONMENT_VARIABLE",
+    "StartupProfiler",
+    "finish",
+    "install",
+    "mark",
+    "profiler",
+)
+
+# Set to anything to have the bot print where its start-up time went
+ENVIRONMENT_VARIABLE = "REMINDME_PROFILE_STARTUP"
+SLOWEST_ENTRIES = 20
+
+
+class _Import(typing.NamedTuple):
+    name: str
+    # Without the modules it imported itself
+    own: float
+    total: float
+
+
+class _TimedLoader:
+    __slots__ = ("_loader", "_profiler")
+
+    def __init__(self, profiler: StartupProfiler, loader: importlib.abc.Loader) -> None:
+        self._profiler = profiler
+        self._loader = loader
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> types.ModuleType | None:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        self._profiler.exec_module(self._loader, module)
+
+
+class StartupProfiler:
+    """Times every module imported and every phase marked from when it is installed.
+
+    It sits first in `sys.meta_path` and wraps the loaders found by the finders after it. Only imports
+    done by the thread which installed it are timed, anything else would mess up the nesting.
+    """
+
+    __slots__ = ("_imports", "_last_mark", "_marks", "_nested", "_thread_id", "started_at")
+
+    def __init__(self) -> None:
+        self._imports: list[_Import] = []
+        self._marks: list[tuple[str, float]] = []
+        # Time spent importing other modules, for each module being imported
+        self._nested: list[float] = []
+        self._thread_id = threading.get_ident()
+        self.started_at = self._last_mark = time.perf_counter()
+
+    def find_spec(
+        self, fullname: str, path: collections.abc.Sequence[str] | None, target: types.ModuleType | None = None
+    ) -> importlib.machinery.ModuleSpec | None:
+        if threading.get_ident() != self._thread_id:
+            return None
+
+        for finder in sys.meta_path:
+            if finder is self or (find_spec := getattr(finder, "find_spec", None)) is None:
+                continue
+
+            if (spec := find_spec(fullname, path, target)) is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(self, spec.loader)  # type: ignore[reportAttributeAccessIssue]
+
+        return spec
+
+    def exec_module(self, loader: importlib.abc.Loader, module: types.ModuleType) -> None:
+        self._nested.append(0)
+        started_at = time.perf_counter()
+        try:
+            loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - started_at
+            own = total - self._nested.pop()
+            if self._nested:
+                self._nested[-1] += total
+
+            self._imports.append(_Import(module.__name__, own, total))
+            # Nothing should see the wrapper once the module is done
+            if module.__spec__ is not None:
+                module.__spec__.loader = loader
+            if isinstance(getattr(module, "__loader__", None), _TimedLoader):
+                module.__loader__ = loader
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self._marks.append((phase, now - self._last_mark))
+        self._last_mark = now
+
+    def report(self) -> str:
+        lines = [f"started up in {self._last_mark - self.started_at:.3f}s", "", "phases:"]
+        lines.extend(f"  {phase:<40} {elapsed:>8.3f}s" for phase, elapsed in self._marks)
+
+        packages: dict[str, float] = {}
+        for imported in self._imports:
+            package = imported.name.partition(".")[0]
+            packages[package] = packages.get(package, 0) + imported.own
+
+        lines.extend(("", f"slowest of {len(packages)} packages imported:"))
+        lines.extend(
+            f"  {package:<40} {elapsed:>8.3f}s"
+            for package, elapsed in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:SLOWEST_ENTRIES]
+        )
+
+        lines.extend(("", f"slowest of {len(self._imports)} modules imported (own, with what they import):"))
+        lines.extend(
+            f"  {imported.name:<40} {imported.own:>8.3f}s {imported.total:>8.3f}s"
+            for imported in sorted(self._imports, key=lambda imported: imported.own, reverse=True)[:SLOWEST_ENTRIES]
+        )
+
+        return "\n".join(lines) + "\n"
+
+
+# Taken out of the environment, so that the time parser workers do not profile themselves as well
+profiler = StartupProfiler() if os.environ.pop(ENVIRONMENT_VARIABLE, "") else None
+
+
+def install() -> None:
+    if profiler is not None and profiler not in sys.meta_path:
+        sys.meta_path.insert(0, profiler)  # type: ignore[reportArgumentType]
+
+
+def mark(phase: str) -> None:
+    if profiler is not None:
+        profiler.mark(phase)
+
+
+# Stops timing imports and prints everything timed so far
+def finish() -> None:
+    if profiler is None or profiler not in sys.meta_path:
+        return
+
+    sys.meta_path.remove(profiler)  # type: ignore[reportArgumentType]
+    sys.stderr.write(profiler.report())
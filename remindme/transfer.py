@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import enum
+import struct
+import typing
+
+import msgspec
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+    import asyncpg
+
+# Ids, leases and retry state belong to the instance the reminders come from, so only what is needed to
+# deliver them somewhere else is carried over. Imported reminders get new ids
+COLUMNS = ("user_id", "description", "expire_at", "reference_message_id", "reference_channel_id", "reference_guild_id")
+EXPORT_SQL = f"SELECT {', '.join(COLUMNS)} FROM reminders WHERE handled = FALSE"  # noqa: S608 - Constant
+
+# Chunks of COPY data waiting to be decoded, to hold back the server when the output is slow
+EXPORT_QUEUE_SIZE = 256
+WRITE_BUFFER_SIZE = 64 * 1024
+
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_COPY_HEADER = struct.Struct(f"!{len(_COPY_SIGNATURE)}sii")
+_INT16 = struct.Struct("!h")
+_INT32 = struct.Struct("!i")
+_INT64 = struct.Struct("!q")
+_MSGPACK_FRAME = _INT32
+
+_PG_EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.UTC)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+class ExportedReminder(msgspec.Struct):
+    user_id: int
+    description: str
+    expire_at: datetime.datetime
+    reference_message_id: int | None = None
+    reference_channel_id: int | None = None
+    reference_guild_id: int | None = None
+
+
+class Format(enum.StrEnum):
+    # One JSON object per line
+    NDJSON = "ndjson"
+    # One msgpack map per frame, each prefixed by its length as a 32 bit big endian integer, as msgpack
+    # has no delimiter to split a stream on
+    MSGPACK = "msgpack"
+
+
+def _decode_int8(data: bytearray, offset: int, _: int) -> int:
+    return _INT64.unpack_from(data, offset)[0]
+
+
+def _decode_text(data: bytearray, offset: int, length: int) -> str:
+    return data[offset : offset + length].decode()
+
+
+def _decode_timestamptz(data: bytearray, offset: int, _: int) -> datetime.datetime:
+    return _PG_EPOCH + _INT64.unpack_from(data, offset)[0] * _MICROSECOND
+
+
+# In the order of `COLUMNS`
+_COLUMN_DECODERS = (_decode_int8, _decode_text, _decode_timestamptz, _decode_int8, _decode_int8, _decode_int8)
+
+
+class _BinaryCopyParser:
+    """Incremental parser for the binary COPY format, which arrives in chunks not aligned on rows."""
+
+    __slots__ = ("_buffer", "_decoders", "_header_read")
+
+    def __init__(
+        self, decoders: collections.abc.Sequence[collections.abc.Callable[[bytearray, int, int], object]]
+    ) -> None:
+        self._decoders = decoders
+        self._buffer = bytearray()
+        self._header_read = False
+
+    def _header_size(self) -> int | None:
+        if len(self._buffer) < _COPY_HEADER.size:
+            return None
+
+        signature, _, extension_length = _COPY_HEADER.unpack_from(self._buffer)
+        if signature != _COPY_SIGNATURE:
+            msg = "not binary COPY data"
+            raise ValueError(msg)
+
+        size = _COPY_HEADER.size + extension_length
+        return size if len(self._buffer) >= size else None
+
+    def feed(self, chunk: bytes) -> list[tuple[typing.Any, ...]]:
+        buffer = self._buffer
+        buffer += chunk
+        offset = 0
+
+        if not self._header_read:
+            if (header_size := self._header_size()) is None:
+                return []
+
+            offset = header_size
+            self._header_read = True
+
+        rows: list[tuple[typing.Any, ...]] = []
+        size = len(buffer)
+
+        while size - offset >= _INT16.size:
+            (field_count,) = _INT16.unpack_from(buffer, offset)
+            # Trailer
+            if field_count == -1:
+                offset = size
+                break
+
+            position = offset + _INT16.size
+            values: list[object] = []
+
+            for decode in self._decoders:
+                if size - position < _INT32.size:
+                    break
+
+                (length,) = _INT32.unpack_from(buffer, position)
+                position += _INT32.size
+
+                if length == -1:
+                    values.append(None)
+                    continue
+
+                if size - position < length:
+                    break
+
+                values.append(decode(buffer, position, length))
+                position += length
+            else:
+                rows.append(tuple(values))
+                offset = position
+                continue
+
+            # The rest of the row is in the next chunk
+            break
+
+        del buffer[:offset]
+        return rows
+
+
+async def export_reminders(conn: asyncpg.Connection[asyncpg.Record]) -> collections.abc.AsyncIterator[ExportedReminder]:
+    chunks: asyncio.Queue[bytes | Exception | None] = asyncio.Queue(maxsize=EXPORT_QUEUE_SIZE)
+
+    async def _copy() -> None:
+        try:
+            await conn.copy_from_query(EXPORT_SQL, output=chunks.put, format="binary")
+        except Exception as ex:  # noqa: BLE001 - Raised again by the reader
+            await chunks.put(ex)
+        else:
+            await chunks.put(None)
+
+    task = asyncio.create_task(_copy())
+    parser = _BinaryCopyParser(_COLUMN_DECODERS)
+
+    try:
+        while (chunk := await chunks.get()) is not None:
+            if isinstance(chunk, Exception):
+                raise chunk
+
+            for row in parser.feed(chunk):
+                yield ExportedReminder(*row)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def import_reminders(
+    conn: asyncpg.Connection[asyncpg.Record], reminders: collections.abc.Iterable[ExportedReminder]
+) -> int:
+    status = await conn.copy_records_to_table(
+        "reminders", records=(msgspec.structs.astuple(reminder) for reminder in reminders), columns=COLUMNS
+    )
+    # "COPY <count>"
+    return int(status.rpartition(" ")[2])
+
+
+async def write_reminders(
+    file: typing.BinaryIO, reminders: collections.abc.AsyncIterable[ExportedReminder], *, format_: Format
+) -> int:
+    buffer = bytearray()
+    count = 0
+
+    if format_ is Format.NDJSON:
+        encoder = msgspec.json.Encoder()
+        async for reminder in reminders:
+            encoder.encode_into(reminder, buffer, -1)
+            buffer.append(ord("\n"))
+            count += 1
+
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                file.write(buffer)
+                buffer.clear()
+    else:
+        encoder = msgspec.msgpack.Encoder()
+        async for reminder in reminders:
+            frame_start = len(buffer)
+            buffer.extend(bytes(_MSGPACK_FRAME.size))
+            encoder.encode_into(reminder, buffer, -1)
+            _MSGPACK_FRAME.pack_into(buffer, frame_start, len(buffer) - frame_start - _MSGPACK_FRAME.size)
+            count += 1
+
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                file.write(buffer)
+                buffer.clear()
+
+    file.write(buffer)
+    file.flush()
+    return count
+
+
+def read_reminders(file: typing.BinaryIO, *, format_: Format) -> collections.abc.Iterator[ExportedReminder]:
+    if format_ is Format.NDJSON:
+        json_decoder = msgspec.json.Decoder(ExportedReminder)
+        for line in file:
+            if line.strip():
+                yield json_decoder.decode(line)
+
+        return
+
+    msgpack_decoder = msgspec.msgpack.Decoder(ExportedReminder)
+    while header := file.read(_MSGPACK_FRAME.size):
+        if len(header) < _MSGPACK_FRAME.size:
+            msg = "truncated msgpack frame header"
+            raise ValueError(msg)
+
+        (length,) = _MSGPACK_FRAME.unpack(header)
+        if len(frame := file.read(length)) < length:
+            msg = "truncated msgpack frame"
+            raise ValueError(msg)
+
+        yield msgpack_decoder.decode(frame)
@@ -1,23 +1,43 @@
 from __future__ import annotations
 
+import datetime
 import typing
 
 import hikari
 
 from remindme.utils import keys
+from remindme.utils import pagination
 
 if typing.TYPE_CHECKING:
-    import datetime
+    import collections.abc
 
     import hikari.api.special_endpoints
 
     from remindme.db import models
 
 
+MAX_MESSAGE_COMPONENTS = 40
+MAX_CUSTOM_ID_LENGTH = 100
+# Header, then a container (4 components) and snooze select row (2 components) for each reminder
+MAX_REMINDERS_PER_MESSAGE = (MAX_MESSAGE_COMPONENTS - 1) // 6
+
+
 def wrap_text(text: str) -> hikari.impl.TextDisplayComponentBuilder:
     return hikari.impl.TextDisplayComponentBuilder(content=text)
 
 
+# Whatever never changes is only built once, when starting up
+NO_ACTIVE_REMINDERS = wrap_text("No currently active reminders")
+_SNOOZE_OPTIONS = (
+    hikari.impl.SelectOptionBuilder(label="10 minutes", value="10 minutes"),
+    hikari.impl.SelectOptionBuilder(label="30 minutes", value="30 minutes"),
+    hikari.impl.SelectOptionBuilder(label="1 hour", value="1 hour"),
+    hikari.impl.SelectOptionBuilder(label="6 hours", value="6 hours"),
+    hikari.impl.SelectOptionBuilder(label="1 day", value="1 day"),
+    hikari.impl.SelectOptionBuilder(label="Custom", value="custom"),
+)
+
+
 def _make_reminder_container(reminder: models.Reminder) -> hikari.impl.ContainerComponentBuilder:
     assert reminder.reference_message_id is not None
     assert reminder.reference_channel_id is not None
@@ -55,24 +75,80 @@ def make_reminder_component(
     ]
 
     if not snoozed_until:
-        components.append(
-            hikari.impl.MessageActionRowBuilder(
-                components=[
-                    hikari.impl.TextSelectMenuBuilder(
-                        placeholder="Snooze",
-                        custom_id=keys.make_key(keys.REMINDER_SNOOZE_SELECT, reminder.id),
-                        options=[
-                            hikari.impl.SelectOptionBuilder(label="10 minutes", value="10 minutes"),
-                            hikari.impl.SelectOptionBuilder(label="30 minutes", value="30 minutes"),
-                            hikari.impl.SelectOptionBuilder(label="1 hour", value="1 hour"),
-                            hikari.impl.SelectOptionBuilder(label="6 hours", value="6 hours"),
-                            hikari.impl.SelectOptionBuilder(label="1 day", value="1 day"),
-                            hikari.impl.SelectOptionBuilder(label="Custom", value="custom"),
-                        ],
-                    )
-                ]
+        components.append(_make_snooze_select(reminder.id, ()))
+
+    return components
+
+
+def _make_snooze_select(
+    reminder_id: int, group_ids: collections.abc.Sequence[int]
+) -> hikari.impl.MessageActionRowBuilder:
+    return hikari.impl.MessageActionRowBuilder(
+        components=[
+            hikari.impl.TextSelectMenuBuilder(
+                placeholder="Snooze",
+                # The whole group is needed to re-render the message once the reminder is snoozed
+                custom_id=keys.REMINDER_SNOOZE_SELECT.make(reminder_id, group_ids),
+                options=_SNOOZE_OPTIONS,
             )
-        )
+        ]
+    )
+
+
+def _snoozed_until(reminder: models.Reminder) -> datetime.datetime | None:
+    if reminder.handled or reminder.expire_at <= datetime.datetime.now(tz=datetime.UTC):
+        return None
+
+    return reminder.expire_at
+
+
+def group_reminders_for_message(
+    reminders: collections.abc.Iterable[models.Reminder],
+) -> collections.abc.Iterator[list[models.Reminder]]:
+    group: list[models.Reminder] = []
+
+    for reminder in reminders:
+        candidate = [*group, reminder]
+        ids = [r.id for r in candidate]
+
+        # The snooze modal key is the longest one carrying the group
+        if group and (
+            len(candidate) > MAX_REMINDERS_PER_MESSAGE
+            or len(keys.REMINDER_SNOOZE_CUSTOM_MODAL.make(max(ids), ids)) > MAX_CUSTOM_ID_LENGTH
+        ):
+            yield group
+            candidate = [reminder]
+
+        group = candidate
+
+    if group:
+        yield group
+
+
+def make_reminder_group_component(
+    reminders: collections.abc.Sequence[models.Reminder],
+) -> typing.Sequence[hikari.api.ComponentBuilder]:
+    if len(reminders) == 1:
+        return make_reminder_component(reminders[0], snoozed_until=_snoozed_until(reminders[0]))
+
+    group_ids = [reminder.id for reminder in reminders]
+    components: list[hikari.api.ComponentBuilder] = [
+        hikari.impl.TextDisplayComponentBuilder(content=f"{len(reminders)} reminders!")
+    ]
+
+    for reminder in reminders:
+        container = _make_reminder_container(reminder)
+        components.append(container)
+
+        if snoozed_until := _snoozed_until(reminder):
+            timestamp = int(snoozed_until.timestamp())
+            container.add_component(
+                hikari.impl.TextDisplayComponentBuilder(
+                    content=f"-# *Snoozed until <t:{timestamp}:F> (<t:{timestamp}:R>)*"
+                )
+            )
+        else:
+            components.append(_make_snooze_select(reminder.id, group_ids))
 
     return components
 
@@ -96,7 +172,7 @@ def make_create_reminder_component(
 
 
 def make_reminder_view_component(
-    reminder: models.Reminder, *, offset: int
+    reminder: models.Reminder, *, cursor: pagination.Cursor
 ) -> typing.Sequence[hikari.api.ComponentBuilder]:
     timestamp = int(reminder.expire_at.timestamp())
 
@@ -111,14 +187,12 @@ def make_reminder_view_component(
         hikari.impl.MessageActionRowBuilder(
             components=[
                 hikari.impl.InteractiveButtonBuilder(
-                    style=hikari.ButtonStyle.SECONDARY,
-                    label="Back",
-                    custom_id=keys.make_key(keys.REMINDER_LIST_MOVE, offset),
+                    style=hikari.ButtonStyle.SECONDARY, label="Back", custom_id=keys.REMINDER_LIST_MOVE.make(cursor)
                 ),
                 hikari.impl.InteractiveButtonBuilder(
                     style=hikari.ButtonStyle.DANGER,
                     label="Delete",
-                    custom_id=keys.make_key(keys.REMINDER_DELETE, reminder.id, offset),
+                    custom_id=keys.REMINDER_DELETE.make(reminder.id, cursor),
                 ),
             ]
         ),
@@ -132,9 +206,10 @@ def _trim_to_size(text: str, *, size: int) -> str:
     return text
 
 
-def make_reminder_list_component(
-    reminders: typing.Sequence[models.Reminder], *, offset: int, limit: int, total_count: int
-) -> typing.Sequence[hikari.api.ComponentBuilder]:
+def make_reminder_list_component(page: pagination.Page) -> typing.Sequence[hikari.api.ComponentBuilder]:
+    reminders = page.reminders
+    current = page.current
+
     container_components: list[hikari.api.special_endpoints.ContainerBuilderComponentsT] = []
     for reminder in reminders:
         timestamp = int(reminder.expire_at.timestamp())
@@ -145,7 +220,7 @@ def make_reminder_list_component(
                     accessory=hikari.impl.InteractiveButtonBuilder(
                         style=hikari.ButtonStyle.PRIMARY,
                         label="View",
-                        custom_id=keys.make_key(keys.REMINDER_VIEW, reminder.id, offset),
+                        custom_id=keys.REMINDER_VIEW.make(reminder.id, current),
                     ),
                     components=[
                         hikari.impl.TextDisplayComponentBuilder(content=_trim_to_size(reminder.description, size=500)),
@@ -164,17 +239,18 @@ def make_reminder_list_component(
         hikari.impl.ContainerComponentBuilder(components=container_components),
         hikari.impl.MessageActionRowBuilder(
             components=[
+                # Disabled buttons still need a custom id which is unique in the message
                 hikari.impl.InteractiveButtonBuilder(
-                    is_disabled=offset <= 0,
+                    is_disabled=page.previous is None,
                     style=hikari.ButtonStyle.SECONDARY,
                     emoji="\u2b05\ufe0f",  # Left Arrow Block
-                    custom_id=keys.make_key(keys.REMINDER_LIST_MOVE, offset - limit),
+                    custom_id=keys.REMINDER_LIST_MOVE.make(page.previous or pagination.FIRST_PAGE),
                 ),
                 hikari.impl.InteractiveButtonBuilder(
-                    is_disabled=(offset + limit >= total_count),
+                    is_disabled=page.next is None,
                     style=hikari.ButtonStyle.SECONDARY,
                     emoji="\u27a1\ufe0f",  # Right Arrow Block
-                    custom_id=keys.make_key(keys.REMINDER_LIST_MOVE, offset + limit),
+                    custom_id=keys.REMINDER_LIST_MOVE.make(page.next or page.current),
                 ),
             ]
         ),
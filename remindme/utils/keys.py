@@ -1,13 +1,215 @@
 from __future__ import annotations
 
-REMINDER_SNOOZE_SELECT = "remindme_snooze_select"
-REMINDER_CREATE_MODAL_CUSTOM_ID = "remindme_create_modal"
-REMINDER_CREATE_FROM_MESSAGE_MODAL_CUSTOM_ID = "remindme_create_from_message_modal"
-REMINDER_SNOOZE_CUSTOM_MODAL = "remindme_snooze_custom_modal"
-REMINDER_LIST_MOVE = "remindme_list_move"
-REMINDER_VIEW = "remindme_reminder_view"
-REMINDER_DELETE = "remindme_reminder_delete"
+import abc
+import collections.abc
+import typing
 
+from remindme.utils import pagination
 
-def make_key(master_key: str, *args: object) -> str:
-    return f"{master_key}:" + ":".join(str(arg) for arg in args)
+SEPARATOR = ":"
+# Base 36 is the largest one `int` reads back by itself
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+_BASE = len(_DIGITS)
+# Packing two digits at a time halves the work done in Python
+_DIGIT_PAIRS = [high + low for high in _DIGITS for low in _DIGITS]
+_PAIR_BASE = len(_DIGIT_PAIRS)
+
+
+def pack_int(value: int) -> str:
+    if value < _BASE:
+        if value < 0:
+            msg = f"cannot pack negative integer {value}"
+            raise ValueError(msg)
+
+        return _DIGITS[value]
+
+    pairs: list[str] = []
+    while value >= _PAIR_BASE:
+        value, pair = divmod(value, _PAIR_BASE)
+        pairs.append(_DIGIT_PAIRS[pair])
+
+    # Without a leading zero
+    pairs.append(_DIGIT_PAIRS[value] if value >= _BASE else _DIGITS[value] if value else "")
+    pairs.reverse()
+    return "".join(pairs)
+
+
+class Argument[T](abc.ABC):
+    """How a value is packed into the parts of a custom id, and read back."""
+
+    __slots__ = ()
+
+    # Parts the value takes up, with `None` being all of those left, which only the last argument can take
+    width: int | None = 1
+    # Same, but for how it was written in the custom ids of messages sent before keys had arguments
+    # declared, which were made of the `str` of each value
+    legacy_width: int | None = 1
+
+    # Into as many parts as needed, already joined together
+    @abc.abstractmethod
+    def pack(self, value: T) -> str: ...
+
+    @abc.abstractmethod
+    def unpack(self, parts: collections.abc.Sequence[str]) -> T: ...
+
+    @abc.abstractmethod
+    def unpack_legacy(self, parts: collections.abc.Sequence[str]) -> T: ...
+
+
+class Snowflake(Argument[int]):
+    """Any non-negative integer, such as a snowflake or a reminder id."""
+
+    __slots__ = ()
+
+    def pack(self, value: int) -> str:
+        return pack_int(value)
+
+    def unpack(self, parts: collections.abc.Sequence[str]) -> int:
+        return int(parts[0], _BASE)
+
+    def unpack_legacy(self, parts: collections.abc.Sequence[str]) -> int:
+        return int(parts[0])
+
+
+class Cursor(Argument[pagination.Cursor]):
+    """A `pagination.Cursor`, with its direction folded into the lowest bit of the expiry."""
+
+    __slots__ = ()
+
+    width = 2
+    # Lists opened before cursors existed only carry an offset
+    legacy_width = None
+
+    def pack(self, value: pagination.Cursor) -> str:
+        expire_at = (value.expire_at - pagination.EPOCH) // pagination.MICROSECOND
+        return f"{pack_int(expire_at << 1 | value.before)}{SEPARATOR}{pack_int(value.reminder_id)}"
+
+    def unpack(self, parts: collections.abc.Sequence[str]) -> pagination.Cursor:
+        expire_at = int(parts[0], _BASE)
+        return pagination.Cursor(
+            pagination.EPOCH + (expire_at >> 1) * pagination.MICROSECOND, int(parts[1], _BASE), bool(expire_at & 1)
+        )
+
+    def unpack_legacy(self, parts: collections.abc.Sequence[str]) -> pagination.Cursor:
+        return pagination.Cursor.from_arguments(parts)
+
+
+class Many[T](Argument[collections.abc.Sequence[T]]):
+    """Any number of values of an argument which always takes up the same parts."""
+
+    __slots__ = ("_argument",)
+
+    width = None
+    legacy_width = None
+
+    def __init__(self, argument: Argument[T]) -> None:
+        if argument.width is None or argument.width != argument.legacy_width:
+            msg = "arguments taken many times must always take up the same parts"
+            raise TypeError(msg)
+
+        self._argument = argument
+
+    def pack(self, value: collections.abc.Sequence[T]) -> str:
+        return SEPARATOR.join([self._argument.pack(item) for item in value])
+
+    def unpack(self, parts: collections.abc.Sequence[str]) -> collections.abc.Sequence[T]:
+        return self._unpack_all(self._argument.unpack, parts)
+
+    def unpack_legacy(self, parts: collections.abc.Sequence[str]) -> collections.abc.Sequence[T]:
+        return self._unpack_all(self._argument.unpack_legacy, parts)
+
+    def _unpack_all(
+        self, unpack: collections.abc.Callable[[collections.abc.Sequence[str]], T], parts: collections.abc.Sequence[str]
+    ) -> list[T]:
+        width = typing.cast("int", self._argument.width)
+        if len(parts) % width:
+            msg = f"expected a multiple of {width} parts, got {len(parts)}"
+            raise ValueError(msg)
+
+        return [unpack(parts[start : start + width]) for start in range(0, len(parts), width)]
+
+
+class _Layout(typing.NamedTuple):
+    """Where the parts of each argument are, worked out once for every key."""
+
+    # Unpack function, with the start and end of its parts
+    slices: tuple[tuple[collections.abc.Callable[[collections.abc.Sequence[str]], typing.Any], int, int | None], ...]
+    # Exact number of parts, or the least when the last argument takes all of those left
+    size: int
+    variadic: bool
+
+    @classmethod
+    def of(
+        cls,
+        arguments: collections.abc.Sequence[
+            tuple[collections.abc.Callable[[collections.abc.Sequence[str]], typing.Any], int | None]
+        ],
+    ) -> _Layout:
+        slices: list[tuple[collections.abc.Callable[[collections.abc.Sequence[str]], typing.Any], int, int | None]] = []
+        size = 0
+        for index, (unpack, width) in enumerate(arguments):
+            if width is None and index != len(arguments) - 1:
+                msg = "only the last argument can take up all the parts left"
+                raise TypeError(msg)
+
+            slices.append((unpack, size, None if width is None else size + width))
+            size += width or 0
+
+        return cls(tuple(slices), size, bool(arguments) and arguments[-1][1] is None)
+
+
+class Key:
+    """Custom id of a component or modal, and the arguments it carries.
+
+    Custom ids are made of a short `prefix` and the packed arguments. The ones of messages sent before
+    start with `name` instead, and are still read back the way they were written.
+    """
+
+    __slots__ = ("_layout", "_legacy_layout", "arguments", "name", "prefix")
+
+    def __init__(self, name: str, prefix: str, *arguments: Argument[typing.Any]) -> None:
+        self.name = name
+        self.prefix = prefix
+        self.arguments = arguments
+        self._layout = _Layout.of([(argument.unpack, argument.width) for argument in arguments])
+        self._legacy_layout = _Layout.of([(argument.unpack_legacy, argument.legacy_width) for argument in arguments])
+
+    def make(self, *values: object) -> str:
+        if len(values) != len(self.arguments):
+            msg = f"{self.name} takes {len(self.arguments)} argument(s), got {len(values)}"
+            raise TypeError(msg)
+
+        parts = [self.prefix]
+        for argument, value in zip(self.arguments, values, strict=True):
+            # `Many` packs nothing at all when empty
+            if packed := argument.pack(value):
+                parts.append(packed)
+
+        return SEPARATOR.join(parts)
+
+    # Both take the custom id without its prefix
+    def unpack(self, packed: str) -> tuple[typing.Any, ...]:
+        return self._unpack(self._layout, packed)
+
+    def unpack_legacy(self, packed: str) -> tuple[typing.Any, ...]:
+        return self._unpack(self._legacy_layout, packed)
+
+    def _unpack(self, layout: _Layout, packed: str) -> tuple[typing.Any, ...]:
+        parts = packed.split(SEPARATOR) if packed else []
+        if len(parts) < layout.size if layout.variadic else len(parts) != layout.size:
+            expected = f"at least {layout.size}" if layout.variadic else layout.size
+            msg = f"{self.name} custom id has {len(parts)} part(s), expected {expected}"
+            raise ValueError(msg)
+
+        return tuple([unpack(parts[start:end]) for unpack, start, end in layout.slices])
+
+
+REMINDER_SNOOZE_SELECT = Key("remindme_snooze_select", "ss", Snowflake(), Many(Snowflake()))
+REMINDER_CREATE_MODAL = Key("remindme_create_modal", "cm")
+REMINDER_CREATE_FROM_MESSAGE_MODAL = Key(
+    "remindme_create_from_message_modal", "cf", Snowflake(), Snowflake(), Snowflake()
+)
+REMINDER_SNOOZE_CUSTOM_MODAL = Key("remindme_snooze_custom_modal", "sm", Snowflake(), Many(Snowflake()))
+REMINDER_LIST_MOVE = Key("remindme_list_move", "lm", Cursor())
+REMINDER_VIEW = Key("remindme_reminder_view", "lv", Snowflake(), Cursor())
+REMINDER_DELETE = Key("remindme_reminder_delete", "ld", Snowflake(), Cursor())
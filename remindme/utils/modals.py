@@ -2,9 +2,6 @@ from __future__ import annotations
 
 import hikari.impl
 
-# TODO: Would be nice to have a way to specify these in the future and know what values it will have
-#       and grab them from the custom ID. Might require some tooling tho
-
 
 def make_reminder_from_message_modal(content: str) -> list[hikari.impl.ModalActionRowBuilder]:
     return [
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import datetime
+import typing
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+    from remindme.db import models
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+class Cursor(typing.NamedTuple):
+    """Position in a user's reminders, ordered by `(expire_at, id)`.
+
+    A cursor points at the first reminder of a page. When `before` is set, it points right after
+    the last one instead, which is what going back a page needs.
+    """
+
+    expire_at: datetime.datetime
+    reminder_id: int
+    before: bool = False
+
+    @classmethod
+    def at(cls, reminder: models.Reminder, *, before: bool = False) -> Cursor:
+        return cls(reminder.expire_at, reminder.id, before)
+
+    # From the custom ids of lists opened before arguments were packed, see `keys.Cursor`
+    @classmethod
+    def from_arguments(cls, arguments: collections.abc.Sequence[str]) -> Cursor:
+        # Lists opened before cursors existed only carry an offset, those start over
+        if len(arguments) != 3:  # noqa: PLR2004
+            return FIRST_PAGE
+
+        before, expire_at, reminder_id = arguments
+        return cls(EPOCH + int(expire_at) * MICROSECOND, int(reminder_id), before == "b")
+
+
+FIRST_PAGE = Cursor(EPOCH, 0)
+
+
+class Page(typing.NamedTuple):
+    reminders: list[models.Reminder]
+    previous: Cursor | None
+    next: Cursor | None
+
+    @property
+    def current(self) -> Cursor:
+        return Cursor.at(self.reminders[0]) if self.reminders else FIRST_PAGE
+
+
+# The page queries return the reminders of the page plus one on the far side of each end
+# (if there is one), which is only used to tell whether there are pages that way
+def make_page(rows: collections.abc.Iterable[models.Reminder], cursor: Cursor, *, limit: int) -> Page:
+    before: list[models.Reminder] = []
+    after: list[models.Reminder] = []
+
+    for row in rows:
+        (before if (row.expire_at, row.id) < (cursor.expire_at, cursor.reminder_id) else after).append(row)
+
+    before.sort(key=lambda r: (r.expire_at, r.id))
+    after.sort(key=lambda r: (r.expire_at, r.id))
+
+    if cursor.before:
+        reminders = before[-limit:]
+        has_previous = len(before) > limit
+        next_reminder = after[0] if after else None
+    else:
+        reminders = after[:limit]
+        has_previous = bool(before)
+        next_reminder = after[limit] if len(after) > limit else None
+
+    return Page(
+        reminders,
+        previous=Cursor.at(reminders[0], before=True) if has_previous and reminders else None,
+        next=Cursor.at(next_reminder) if next_reminder else None,
+    )
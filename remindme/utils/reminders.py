@@ -3,16 +3,21 @@ from __future__ import annotations
 import datetime
 import typing
 
-import dateparser
 import hikari
 
 from remindme.utils import components
+from remindme.utils import times
 
 if typing.TYPE_CHECKING:
+    import collections.abc
+
     import lightbulb
 
+    from remindme import cache
     from remindme import db
+    from remindme import dm_channels
     from remindme import interaction_handlers
+    from remindme import scheduling
     from remindme.db import models
 
     type ScheduleContextT = (
@@ -21,32 +26,33 @@ if typing.TYPE_CHECKING:
     type RescheduleContextT = interaction_handlers.ModalContext | interaction_handlers.ComponentContext
 
 
-def _dehumanize_time(when_str: str) -> datetime.datetime | None:
+async def _dehumanize_time(
+    ctx: ScheduleContextT | RescheduleContextT, time_parser: times.TimeParser, when_str: str
+) -> datetime.datetime | None:
     now = datetime.datetime.now(tz=datetime.UTC)
 
-    # noinspection PyTypeChecker
-    when = dateparser.parse(
-        when_str,
-        settings={
-            "RETURN_AS_TIMEZONE_AWARE": True,
-            "RELATIVE_BASE": now,
-            "PREFER_DATES_FROM": "future",
-            "PARSERS": ["relative-time", "absolute-time"],
-            "TIMEZONE": "CEST",
-        },
-    )
+    try:
+        when = await time_parser.parse(when_str, now=now)
+    except TimeoutError:
+        await ctx.respond("Couldn't parse that time, try a simpler one like `in 2 hours`", ephemeral=True)
+        return None
+
     if when is None or when < now:
+        await ctx.respond("Unknown time format", ephemeral=True)
         return None
 
     return when
 
 
-async def create_reminder(
+async def create_reminder(  # noqa: PLR0913 - Mostly dependencies passed through from the handlers
     *,
     ctx: ScheduleContextT,
     when_str: str,
     description: str | None,
     queries: db.Queries,
+    scheduler: scheduling.ReminderScheduler,
+    reminder_cache: cache.ReminderCache,
+    time_parser: times.TimeParser,
     public_ack: bool,
     reference_message_id: int | None = None,
     reference_channel_id: int | None = None,
@@ -56,9 +62,8 @@ async def create_reminder(
 
     description = description or "*No description provided*"
 
-    when = _dehumanize_time(when_str)
+    when = await _dehumanize_time(ctx, time_parser, when_str)
     if when is None:
-        await ctx.respond("Unknown time format", ephemeral=True)
         return
 
     reminder: models.Reminder | None
@@ -77,6 +82,8 @@ async def create_reminder(
         )
 
     assert reminder is not None
+    scheduler.schedule(reminder.id, reminder.expire_at)
+    reminder_cache.invalidate(reminder.user_id)
 
     flags = hikari.MessageFlag.NONE if public_ack else hikari.MessageFlag.EPHEMERAL
     callback_info = await ctx.interaction.create_initial_response(
@@ -99,47 +106,66 @@ async def create_reminder(
             reference_channel_id=ctx.interaction.channel_id,
             reference_guild_id=ctx.interaction.guild_id,
         )
+        reminder_cache.invalidate(reminder.user_id, (reminder.id,))
 
 
 async def reschedule_reminder(
-    ctx: RescheduleContextT, reminder: models.Reminder, when_str: str, original_message_id: int, queries: db.Queries
+    ctx: RescheduleContextT,
+    reminder: models.Reminder,
+    when_str: str,
+    original_message_id: int,
+    queries: db.Queries,
+    scheduler: scheduling.ReminderScheduler,
+    reminder_cache: cache.ReminderCache,
+    time_parser: times.TimeParser,
+    group_ids: collections.abc.Sequence[int] = (),
 ) -> None:
     await ctx.defer(ephemeral=True)
 
-    when = _dehumanize_time(when_str)
+    when = await _dehumanize_time(ctx, time_parser, when_str)
     if when is None:
-        await ctx.respond("Unknown time format", ephemeral=True)
         return
 
     updated_reminder = await queries.reschedule_reminder(id_=reminder.id, expire_at=when)
     assert updated_reminder is not None
+    scheduler.schedule(updated_reminder.id, updated_reminder.expire_at)
+    reminder_cache.invalidate(updated_reminder.user_id, (updated_reminder.id,))
 
     await ctx.respond(
         components=components.make_create_reminder_component(updated_reminder, snoozed=True), ephemeral=True
     )
-    await ctx.edit_response(
-        original_message_id, components=components.make_reminder_component(reminder, snoozed_until=when)
-    )
+
+    original_components: typing.Sequence[hikari.api.ComponentBuilder]
+    if group_ids:
+        # Re-render the whole message, the other reminders in it might have been snoozed too
+        group = [r for id_ in group_ids if (r := await reminder_cache.get_reminder(id_, fresh=True)) is not None]
+        original_components = components.make_reminder_group_component(group)
+    else:
+        original_components = components.make_reminder_component(reminder, snoozed_until=when)
+
+    await ctx.edit_response(original_message_id, components=original_components)
 
 
-async def send_reminder(reminder: models.Reminder, *, queries: db.Queries, rest: hikari.api.RESTClient) -> None:
-    dm_channel_id = await queries.get_dm_channel_for_user(user_id=reminder.user_id)
-    if not dm_channel_id:
-        try:
-            dm_channel = await rest.create_dm_channel(reminder.user_id)
-        except hikari.ForbiddenError:
-            # The user deauthorized the app, oh well :)
-            await queries.delete_reminder(id_=reminder.id)
-            return
+# Sends all the reminders (which must belong to the same user) in a single message, returning whether
+# it reached the user. Marking them as handled (or deleting them when it did not) is left to the caller,
+# so that it can be done in bulk
+async def send_reminders(
+    reminders: collections.abc.Sequence[models.Reminder],
+    *,
+    dm_channel_cache: dm_channels.DMChannelCache,
+    rest: hikari.api.RESTClient,
+) -> bool:
+    user_id = reminders[0].user_id
 
-        dm_channel_id = dm_channel.id
-        await queries.add_dm_channel(channel_id=dm_channel_id, user_id=reminder.user_id)
+    dm_channel_id = await dm_channel_cache.resolve(user_id)
+    if dm_channel_id is None:
+        return False
 
     try:
-        await rest.create_message(dm_channel_id, components=components.make_reminder_component(reminder))
+        await rest.create_message(dm_channel_id, components=components.make_reminder_group_component(reminders))
     except hikari.ForbiddenError:
         # The user deauthorized the app, oh well :)
-        await queries.delete_reminder(id_=reminder.id)
-        return
+        dm_channel_cache.forbid(user_id)
+        return False
 
-    await queries.mark_reminder_as_handled(id_=reminder.id)
+    return True
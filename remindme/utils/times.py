@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import concurrent.futures.process
+import datetime
+import functools
+import logging
+import re
+import typing
+
+from remindme import metrics
+
+logger = logging.getLogger("remindme.times")
+
+MAX_CACHED_PHRASES = 1024
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 1
+DEFAULT_MAX_PENDING = 16
+
+# What dateparser assumes for times without an offset, see `parse_with_dateparser`
+DEFAULT_TIMEZONE = datetime.timezone(datetime.timedelta(hours=2), "CEST")
+
+_DAY = datetime.timedelta(days=1)
+_UNITS = {
+    **dict.fromkeys(("s", "sec", "secs", "second", "seconds"), datetime.timedelta(seconds=1)),
+    **dict.fromkeys(("m", "min", "mins", "minute", "minutes"), datetime.timedelta(minutes=1)),
+    **dict.fromkeys(("h", "hr", "hrs", "hour", "hours"), datetime.timedelta(hours=1)),
+    **dict.fromkeys(("d", "day", "days"), _DAY),
+    **dict.fromkeys(("w", "week", "weeks"), datetime.timedelta(weeks=1)),
+}
+
+# The phrases are normalized first, see `_normalize`
+_AMOUNT = r"\d+(?:\.\d+)? ?[a-z]+"
+_RELATIVE_PATTERN = re.compile(rf"(?:in )?{_AMOUNT}(?:(?:,? and |, | )?{_AMOUNT})*")
+_AMOUNT_PATTERN = re.compile(r"(\d+(?:\.\d+)?) ?([a-z]+)")
+_TIME_OF_DAY_PATTERN = re.compile(
+    r"(?P<tomorrow>tomorrow (?:at )?)?(?P<hour>\d{1,2}):(?P<minute>\d{2})(?::(?P<second>\d{2}))?"
+)
+_ISO_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?:z|[+-]\d{2}:\d{2})?)?")
+
+
+class _Relative(typing.NamedTuple):
+    delta: datetime.timedelta
+
+    def resolve(self, now: datetime.datetime) -> datetime.datetime:
+        return now + self.delta
+
+
+class _TimeOfDay(typing.NamedTuple):
+    time: datetime.time
+    tomorrow: bool
+
+    def resolve(self, now: datetime.datetime) -> datetime.datetime:
+        # dateparser keeps "tomorrow at" in the timezone of `now`, while bare times are in the default one
+        if self.tomorrow:
+            return datetime.datetime.combine((now + _DAY).date(), self.time, tzinfo=now.tzinfo)
+
+        # Takes the date from `now` as it is, even if it is another day in the default timezone
+        when = datetime.datetime.combine(now.date(), self.time, tzinfo=DEFAULT_TIMEZONE)
+        return when + _DAY if when < now else when
+
+
+class _Absolute(typing.NamedTuple):
+    when: datetime.datetime
+
+    def resolve(self, _: datetime.datetime) -> datetime.datetime:
+        return self.when
+
+
+def _normalize(phrase: str) -> str:
+    return " ".join(phrase.lower().split())
+
+
+def _compile_relative(phrase: str) -> _Relative | None:
+    delta = datetime.timedelta()
+    seen: set[datetime.timedelta] = set()
+
+    for amount, unit_name in _AMOUNT_PATTERN.findall(phrase.removeprefix("in ")):
+        # dateparser only counts the first of repeated units
+        if (unit := _UNITS.get(unit_name)) is None or unit in seen:
+            return None
+
+        seen.add(unit)
+        try:
+            delta += float(amount) * unit
+        except OverflowError:
+            return None
+
+    return _Relative(delta)
+
+
+def _compile_time_of_day(match: re.Match[str]) -> _TimeOfDay | None:
+    try:
+        time = datetime.time(int(match["hour"]), int(match["minute"]), int(match["second"] or 0))
+    except ValueError:
+        return None
+
+    return _TimeOfDay(time, tomorrow=match["tomorrow"] is not None)
+
+
+# Only covers the phrases which are typed the most, and in a way which gives the same results as
+# dateparser. Anything else (including what is left out on purpose) returns None
+@functools.lru_cache(maxsize=MAX_CACHED_PHRASES)
+def _compile(phrase: str) -> _Relative | _TimeOfDay | _Absolute | None:
+    if _RELATIVE_PATTERN.fullmatch(phrase):
+        return _compile_relative(phrase)
+
+    if match := _TIME_OF_DAY_PATTERN.fullmatch(phrase):
+        return _compile_time_of_day(match)
+
+    if _ISO_PATTERN.fullmatch(phrase):
+        try:
+            when = datetime.datetime.fromisoformat(phrase.upper())
+        except ValueError:
+            return None
+
+        return _Absolute(when if when.tzinfo is not None else when.replace(tzinfo=DEFAULT_TIMEZONE))
+
+    return None
+
+
+# Whether `parse` can do without dateparser for the phrase
+def covers(phrase: str) -> bool:
+    return _compile(_normalize(phrase)) is not None
+
+
+def parse_with_dateparser(phrase: str, *, now: datetime.datetime) -> datetime.datetime | None:
+    # Takes a third of a second to import, and is otherwise only needed in the time parser workers
+    import dateparser  # noqa: PLC0415
+
+    return dateparser.parse(
+        phrase,
+        settings={
+            "RETURN_AS_TIMEZONE_AWARE": True,
+            "RELATIVE_BASE": now,
+            "PREFER_DATES_FROM": "future",
+            "PARSERS": ["relative-time", "absolute-time"],
+            "TIMEZONE": "CEST",
+        },
+    )
+
+
+# Runs in every worker as it starts. The first parse loads dateparser's locale data and compiles
+# its patterns, which takes far longer than any parse after it
+def _warm_up_worker() -> None:
+    parse_with_dateparser("in 1 hour", now=datetime.datetime.now(tz=datetime.UTC))
+
+
+def _do_nothing() -> None:
+    pass
+
+
+def _resolve(compiled: _Relative | _TimeOfDay | _Absolute, now: datetime.datetime) -> datetime.datetime | None:
+    try:
+        return compiled.resolve(now)
+    except OverflowError:
+        # Past the year 9999, which dateparser gives up on as well
+        return None
+
+
+def parse(phrase: str, *, now: datetime.datetime) -> datetime.datetime | None:
+    if (compiled := _compile(_normalize(phrase))) is not None:
+        return _resolve(compiled, now)
+
+    return parse_with_dateparser(phrase, now=now)
+
+
+class TimeParser:
+    """Parses reminder times without holding up the event loop.
+
+    Phrases the fast path does not cover are handed to dateparser in worker processes, since it is
+    pure Python and would still hold the GIL from a thread. A parse which timed out cannot be
+    stopped, so it keeps counting towards `max_pending` until its worker is done with it.
+    """
+
+    __slots__ = ("_executor", "_pending", "max_pending", "timeout", "workers")
+
+    def __init__(
+        self,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        self.workers = workers
+        self._executor = self._make_executor()
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self._pending = 0
+
+    def _make_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up_worker)
+
+    # Once a worker died the whole pool refuses any more work, so it is replaced by a new one
+    def _replace_executor(self, broken: concurrent.futures.ProcessPoolExecutor) -> None:
+        # Every parse it was running fails at once, only the first one has to replace it
+        if self._executor is not broken:
+            return
+
+        logger.error("a time parser worker died, starting new ones")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._make_executor()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # Workers are otherwise only started when a phrase needs one, and then have to warm up first
+    async def warm_up(self) -> None:
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _do_nothing) for _ in range(self.workers)))
+
+    def _release(self, _: concurrent.futures.Future[datetime.datetime | None]) -> None:
+        self._pending -= 1
+
+    # Raises `TimeoutError` when the phrase took too long, too many others are being parsed already,
+    # or the worker parsing it failed
+    async def parse(self, phrase: str, *, now: datetime.datetime) -> datetime.datetime | None:
+        if (compiled := _compile(_normalize(phrase))) is not None:
+            metrics.TIME_PARSES.inc("fast")
+            return _resolve(compiled, now)
+
+        if self._pending >= self.max_pending:
+            metrics.TIME_PARSES.inc("rejected")
+            msg = "too many times are being parsed already"
+            raise TimeoutError(msg)
+
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            future = executor.submit(parse_with_dateparser, phrase, now=now)
+        except concurrent.futures.process.BrokenProcessPool as ex:
+            # Broke after its last parse finished
+            self._replace_executor(executor)
+            metrics.TIME_PARSES.inc("failed")
+            msg = "the time parser workers are being restarted"
+            raise TimeoutError(msg) from ex
+
+        self._pending += 1
+        # Done callbacks run in the executor's own thread
+        future.add_done_callback(lambda done: loop.call_soon_threadsafe(self._release, done))
+
+        try:
+            # Cancelling the wrapped future only takes the parse out of the queue, if it did not start yet
+            when = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except TimeoutError:
+            metrics.TIME_PARSES.inc("timeout")
+            logger.warning("parsing %r took longer than %ss", phrase, self.timeout)
+            raise
+        except Exception as ex:
+            if isinstance(ex, concurrent.futures.process.BrokenProcessPool):
+                self._replace_executor(executor)
+
+            metrics.TIME_PARSES.inc("failed")
+            logger.exception("failed to parse %r", phrase)
+            msg = f"failed to parse {phrase!r}"
+            raise TimeoutError(msg) from ex
+
+        metrics.TIME_PARSES.inc("dateparser")
+        return when
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from remindme import delivery
+
+
+@pytest.mark.parametrize("attempts", range(1, delivery.MAX_DELIVERY_ATTEMPTS + 1))
+def test_retry_delay_keeps_at_least_half_of_the_backoff(monkeypatch: pytest.MonkeyPatch, attempts: int) -> None:
+    backoff = min(delivery.RETRY_BASE_DELAY * 2 ** (attempts - 1), delivery.RETRY_MAX_DELAY)
+
+    monkeypatch.setattr(random, "random", lambda: 0.0)
+    assert delivery.retry_delay(attempts) == backoff / 2
+
+    monkeypatch.setattr(random, "random", lambda: 0.999999)
+    assert backoff / 2 < delivery.retry_delay(attempts) <= backoff
+
+
+@pytest.mark.parametrize("attempts", [20, 31, 10_000])
+def test_retry_delay_stops_growing_at_the_maximum(attempts: int) -> None:
+    assert delivery.RETRY_MAX_DELAY / 2 <= delivery.retry_delay(attempts) <= delivery.RETRY_MAX_DELAY
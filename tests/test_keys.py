@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from remindme.utils import keys
+from remindme.utils import pagination
+
+SNOWFLAKE = 1_234_567_890_123_456_789
+CURSOR = pagination.Cursor(datetime.datetime(2025, 6, 15, 12, 30, 15, 123456, tzinfo=datetime.UTC), 42)
+
+
+# Including around where the number of digits changes, as an odd number of them starts with a single one
+def test_pack_int_is_read_back_by_int() -> None:
+    for value in [*range(36**2 + 2), 36**3 - 1, 36**3, 36**4 + 1, SNOWFLAKE, 2**64 - 1]:
+        packed = keys.pack_int(value)
+
+        assert int(packed, 36) == value, value
+        assert packed == "0" or not packed.startswith("0"), value
+
+
+def test_pack_int_rejects_negative_integers() -> None:
+    with pytest.raises(ValueError, match="negative"):
+        keys.pack_int(-1)
+
+
+@pytest.mark.parametrize("cursor", [CURSOR, CURSOR._replace(before=True), pagination.FIRST_PAGE])
+def test_key_round_trip(cursor: pagination.Cursor) -> None:
+    custom_id = keys.REMINDER_VIEW.make(SNOWFLAKE, cursor)
+    prefix, _, packed = custom_id.partition(keys.SEPARATOR)
+
+    assert prefix == keys.REMINDER_VIEW.prefix
+    assert keys.REMINDER_VIEW.unpack(packed) == (SNOWFLAKE, cursor)
+
+
+@pytest.mark.parametrize("group_ids", [[], [1], [SNOWFLAKE, 2, 3]])
+def test_key_round_trip_many(group_ids: list[int]) -> None:
+    custom_id = keys.REMINDER_SNOOZE_SELECT.make(SNOWFLAKE, group_ids)
+
+    assert keys.REMINDER_SNOOZE_SELECT.unpack(custom_id.partition(keys.SEPARATOR)[2]) == (SNOWFLAKE, group_ids)
+
+
+def test_key_make_checks_the_number_of_arguments() -> None:
+    with pytest.raises(TypeError, match="takes 2 argument"):
+        keys.REMINDER_VIEW.make(SNOWFLAKE)
+
+
+@pytest.mark.parametrize("packed", ["", "1", "1:2:3:4"])
+def test_key_unpack_checks_the_number_of_parts(packed: str) -> None:
+    with pytest.raises(ValueError, match="part"):
+        keys.REMINDER_VIEW.unpack(packed)
+
+
+# Custom ids of messages sent before keys had arguments, with the `str` of each argument after the name
+def test_key_unpack_legacy() -> None:
+    expire_at = (CURSOR.expire_at - pagination.EPOCH) // pagination.MICROSECOND
+
+    assert keys.REMINDER_VIEW.unpack_legacy(f"{SNOWFLAKE}:b:{expire_at}:42") == (
+        SNOWFLAKE,
+        CURSOR._replace(before=True),
+    )
+    assert keys.REMINDER_SNOOZE_SELECT.unpack_legacy(f"{SNOWFLAKE}:1:2") == (SNOWFLAKE, [1, 2])
+    assert keys.REMINDER_CREATE_FROM_MESSAGE_MODAL.unpack_legacy("1:2:3") == (1, 2, 3)
+
+
+# Lists opened before cursors existed only carry an offset, and start over
+@pytest.mark.parametrize("packed", ["", "5"])
+def test_key_unpack_legacy_offset(packed: str) -> None:
+    assert keys.REMINDER_LIST_MOVE.unpack_legacy(packed) == (pagination.FIRST_PAGE,)
+
+
+def test_many_takes_arguments_of_a_fixed_width_only() -> None:
+    with pytest.raises(TypeError, match="same parts"):
+        keys.Many(keys.Cursor())
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from remindme.db import models
+from remindme.utils import pagination
+
+LIMIT = 3
+NOW = datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC)
+
+
+def _reminder(id_: int, expire_at: datetime.datetime) -> models.Reminder:
+    return models.Reminder(
+        id=id_,
+        user_id=1,
+        description=f"reminder {id_}",
+        expire_at=expire_at,
+        reference_message_id=None,
+        reference_channel_id=None,
+        reference_guild_id=None,
+        handled=False,
+        leased_by=None,
+        lease_expires_at=None,
+        attempts=0,
+        next_attempt_at=None,
+    )
+
+
+# Some of them expire at the same time, which the id has to break the tie of
+def _reminders(count: int) -> list[models.Reminder]:
+    return [_reminder(id_, NOW + datetime.timedelta(minutes=id_ // 2)) for id_ in range(1, count + 1)]
+
+
+# What the page queries return: the page, plus one on the far side of each end
+def _rows(reminders: list[models.Reminder], cursor: pagination.Cursor) -> list[models.Reminder]:
+    key = (cursor.expire_at, cursor.reminder_id)
+    before = [reminder for reminder in reminders if (reminder.expire_at, reminder.id) < key]
+    after = [reminder for reminder in reminders if (reminder.expire_at, reminder.id) >= key]
+
+    if cursor.before:
+        return before[-LIMIT - 1 :] + after[:1]
+
+    return before[-1:] + after[: LIMIT + 1]
+
+
+@pytest.mark.parametrize("count", [0, 1, LIMIT - 1, LIMIT, LIMIT + 1, 3 * LIMIT, 3 * LIMIT + 1])
+def test_make_page_walks_forward_and_back_through_every_reminder(count: int) -> None:
+    reminders = _reminders(count)
+
+    pages = [pagination.make_page(_rows(reminders, pagination.FIRST_PAGE), pagination.FIRST_PAGE, limit=LIMIT)]
+    while (cursor := pages[-1].next) is not None:
+        pages.append(pagination.make_page(_rows(reminders, cursor), cursor, limit=LIMIT))
+
+    assert [reminder for page in pages for reminder in page.reminders] == reminders
+    assert all(len(page.reminders) == LIMIT for page in pages[:-1])
+    assert pages[0].previous is None
+
+    back = [pages[-1]]
+    while (cursor := back[-1].previous) is not None:
+        back.append(pagination.make_page(_rows(reminders, cursor), cursor, limit=LIMIT))
+
+    assert [page.reminders for page in reversed(back)] == [page.reminders for page in pages]
+
+
+def test_make_page_going_back_to_the_start_has_no_previous_page() -> None:
+    reminders = _reminders(2 * LIMIT)
+    # After the first reminder was deleted, going back from the second page only finds two
+    cursor = pagination.Cursor.at(reminders[LIMIT], before=True)
+    del reminders[0]
+
+    page = pagination.make_page(_rows(reminders, cursor), cursor, limit=LIMIT)
+
+    assert page.reminders == reminders[: LIMIT - 1]
+    assert page.previous is None
+    assert page.next == pagination.Cursor.at(reminders[LIMIT - 1])
+
+
+def test_make_page_past_the_end_is_empty() -> None:
+    reminders = _reminders(LIMIT)
+    cursor = pagination.Cursor(NOW + datetime.timedelta(days=1), 0)
+
+    page = pagination.make_page(_rows(reminders, cursor), cursor, limit=LIMIT)
+
+    assert page.reminders == []
+    assert page.previous is None
+    assert page.next is None
+    assert page.current == pagination.FIRST_PAGE
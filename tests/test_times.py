@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from remindme.utils import times
+
+NOWS = [
+    datetime.datetime(2025, 6, 15, 12, 30, 15, tzinfo=datetime.UTC),
+    # Already the next day in the default timezone
+    datetime.datetime(2025, 6, 15, 23, 0, tzinfo=datetime.UTC),
+    datetime.datetime(2025, 12, 30, 21, 45, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))),
+]
+COVERED = [
+    "in 5 minutes",
+    "5m",
+    "in 2 hours and 30 minutes",
+    "1 day, 3 hours",
+    "1.5 hours",
+    "In  10   Seconds",
+    "2 weeks",
+    "13:00",
+    "09:05:30",
+    "tomorrow at 8:00",
+    "tomorrow 23:59",
+    "2030-01-02",
+    "2030-01-02 10:00",
+    "2030-01-02T10:00:00+01:00",
+    "2030-01-02t10:00z",
+]
+NOT_COVERED = ["next friday", "in 5 fortnights", "5 minutes 3 minutes", "25:00", "2030-13-01", "tomorrow"]
+
+
+@pytest.mark.parametrize("now", NOWS)
+@pytest.mark.parametrize("phrase", COVERED)
+def test_parse_gives_the_same_as_dateparser(phrase: str, now: datetime.datetime) -> None:
+    assert times.covers(phrase)
+    assert times.parse(phrase, now=now) == times.parse_with_dateparser(phrase, now=now)
+
+
+@pytest.mark.parametrize("phrase", NOT_COVERED)
+def test_covers_leaves_the_rest_to_dateparser(phrase: str) -> None:
+    now = NOWS[0]
+
+    assert not times.covers(phrase)
+    assert times.parse(phrase, now=now) == times.parse_with_dateparser(phrase, now=now)
+
+
+# dateparser wraps around to the first day of the same month instead (of the next year in December)
+def test_parse_moves_times_of_day_on_to_the_next_month() -> None:
+    now = datetime.datetime(2025, 12, 31, 23, 45, tzinfo=datetime.UTC)
+
+    assert times.parse("13:00", now=now) == datetime.datetime(2026, 1, 1, 13, tzinfo=times.DEFAULT_TIMEZONE)
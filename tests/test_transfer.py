@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import datetime
+import struct
+
+import pytest
+
+from remindme import transfer
+
+EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.UTC)
+ROWS = [
+    (1, "first", datetime.datetime(2025, 1, 1, 12, tzinfo=datetime.UTC), None, None, None),
+    (2**40, "", EPOCH, 3, 4, 5),
+    (3, "ünïcode ⏰", datetime.datetime(1999, 12, 31, 23, 59, 59, 999999, tzinfo=datetime.UTC), None, 6, None),
+]
+
+
+def _field(value: object) -> bytes:
+    match value:
+        case None:
+            return struct.pack("!i", -1)
+        case int():
+            return struct.pack("!iq", 8, value)
+        case str():
+            data = value.encode()
+            return struct.pack("!i", len(data)) + data
+        case datetime.datetime():
+            return struct.pack("!iq", 8, (value - EPOCH) // datetime.timedelta(microseconds=1))
+        case _:
+            raise TypeError(value)
+
+
+def _copy_data(rows: list[tuple[object, ...]], *, extension: bytes = b"") -> bytes:
+    data = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, len(extension)) + extension
+    for row in rows:
+        data += struct.pack("!h", len(row)) + b"".join(_field(value) for value in row)
+
+    return data + struct.pack("!h", -1)
+
+
+def _parse(chunks: list[bytes]) -> list[tuple[object, ...]]:
+    parser = transfer._BinaryCopyParser(transfer._COLUMN_DECODERS)
+    return [row for chunk in chunks for row in parser.feed(chunk)]
+
+
+@pytest.mark.parametrize("extension", [b"", b"ext"])
+def test_binary_copy_parser_splits_anywhere(extension: bytes) -> None:
+    data = _copy_data(ROWS, extension=extension)
+
+    assert _parse([data]) == ROWS
+    for split in range(len(data) + 1):
+        assert _parse([data[:split], data[split:]]) == ROWS, split
+
+
+def test_binary_copy_parser_one_byte_at_a_time() -> None:
+    data = _copy_data(ROWS)
+
+    assert _parse([data[index : index + 1] for index in range(len(data))]) == ROWS
+
+
+def test_binary_copy_parser_rejects_other_data() -> None:
+    with pytest.raises(ValueError, match="not binary COPY data"):
+        _parse([b"user_id,description,expire_at\n"])